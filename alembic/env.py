@@ -2,6 +2,7 @@ from logging.config import fileConfig
 from alembic import context
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import AsyncConnection
+from app.config.schema import is_core_object
 from app.config.settings import settings
 from app.core.models.db_model import Base
 import asyncio
@@ -75,6 +76,8 @@ def do_run_migrations(connection: AsyncConnection) -> None:
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        # Objetos do serviço vêm de alembic/service; o autogenerate não deve removê-los.
+        include_name=lambda name, type_, parent_names: is_core_object(name, type_),
     )
 
     with context.begin_transaction():
@@ -0,0 +1,69 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.config.schema import SERVICE_VERSION_TABLE
+from app.config.settings import settings
+import asyncio
+
+# Objetos auxiliares deste serviço (gatilhos, rollups, contadores...), criados
+# sobre as tabelas do core. Rodar depois das migrações do core:
+#   alembic upgrade head && alembic -n service upgrade head
+
+config = context.config
+
+
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL if not settings.TEST_ENV else settings.DATABASE_URL_TEST)
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = None
+
+def run_migrations_offline() -> None:
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        version_table=SERVICE_VERSION_TABLE,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_async_migrations() -> None:
+    try:
+        connectable = create_async_engine(config.get_main_option("sqlalchemy.url"))
+
+        async with connectable.connect() as connection:
+            await connection.run_sync(do_run_migrations)
+        await connectable.dispose()
+    except ConnectionRefusedError as e:
+        print(f"Database connection refused: {e}")
+        print("Please check if the database server is running and the connection details are correct.")
+        raise
+    except Exception as e:
+        print(f"An error occurred while running migrations: {e}")
+        raise
+
+def do_run_migrations(connection: AsyncConnection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        version_table=SERVICE_VERSION_TABLE,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    asyncio.run(run_async_migrations())
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
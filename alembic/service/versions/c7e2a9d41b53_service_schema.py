@@ -0,0 +1,571 @@
+"""Objetos auxiliares do serviço
+
+Rollups, última medida, contadores, regras com estado, notificações do catálogo,
+refresh tokens e reprocessamento de alertas.
+
+Revision ID: c7e2a9d41b53
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9d41b53'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = ("measures_rollup_hourly", "measures_rollup_daily")
+CATALOG_TABLES = (
+    "weather_stations",
+    "parameters",
+    "parameter_types",
+    "type_alerts",
+    "alert_stateful_rules",
+)
+
+# Parciais por hora das medidas inseridas; o rollup diário é derivado delas.
+PENDING_COLUMNS = """
+    parameter_id, bucket, sample_count, min_value, max_value, sum_value, last_value, last_date
+"""
+
+PENDING_SELECT = """
+    SELECT
+        m.parameter_id,
+        (m.measure_date / 3600) * 3600,
+        COUNT(*),
+        MIN(m.value),
+        MAX(m.value),
+        SUM(m.value),
+        (ARRAY_AGG(m.value ORDER BY m.measure_date DESC, m.id DESC))[1],
+        MAX(m.measure_date)
+    FROM {source} m
+    {where}
+    GROUP BY m.parameter_id, (m.measure_date / 3600) * 3600
+"""
+
+# Medidas sem valor não entram nos rollups.
+ROLLUP_FILTER = "WHERE m.value IS NOT NULL"
+
+ROLLUP_DDL = [
+    *[
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            parameter_id BIGINT NOT NULL,
+            bucket BIGINT NOT NULL,
+            sample_count BIGINT NOT NULL,
+            min_value DOUBLE PRECISION NOT NULL,
+            max_value DOUBLE PRECISION NOT NULL,
+            sum_value DOUBLE PRECISION NOT NULL,
+            last_value DOUBLE PRECISION NOT NULL,
+            last_date BIGINT NOT NULL,
+            PRIMARY KEY (parameter_id, bucket)
+        )
+        """
+        for table in ROLLUP_TABLES
+    ],
+    # O gatilho grava as parciais na mesma transação da inserção, então elas só
+    # ficam visíveis para o rollup depois do commit, qualquer que seja a ordem
+    # dos ids (lotes com ids reservados podem confirmar fora de ordem).
+    """
+    CREATE TABLE IF NOT EXISTS measures_rollup_pending (
+        id BIGSERIAL PRIMARY KEY,
+        parameter_id BIGINT NOT NULL,
+        bucket BIGINT NOT NULL,
+        sample_count BIGINT NOT NULL,
+        min_value DOUBLE PRECISION NOT NULL,
+        max_value DOUBLE PRECISION NOT NULL,
+        sum_value DOUBLE PRECISION NOT NULL,
+        last_value DOUBLE PRECISION NOT NULL,
+        last_date BIGINT NOT NULL
+    )
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION measures_rollup_enqueue() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO measures_rollup_pending ({PENDING_COLUMNS})
+        {PENDING_SELECT.format(source="new_rows", where=ROLLUP_FILTER)};
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_measures_rollup_insert
+    AFTER INSERT ON measures
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION measures_rollup_enqueue()
+    """,
+    # Alterações e exclusões não cabem em parciais somáveis (mínimo e máximo não
+    # se desfazem): o gatilho marca as horas afetadas e o rollup as recalcula a
+    # partir de `measures`.
+    """
+    CREATE TABLE IF NOT EXISTS measures_rollup_stale (
+        id BIGSERIAL PRIMARY KEY,
+        parameter_id BIGINT NOT NULL,
+        bucket BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION measures_rollup_mark_stale() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            INSERT INTO measures_rollup_stale (parameter_id, bucket)
+            SELECT parameter_id, (measure_date / 3600) * 3600 FROM old_rows
+            UNION
+            SELECT parameter_id, (measure_date / 3600) * 3600 FROM new_rows;
+        ELSE
+            INSERT INTO measures_rollup_stale (parameter_id, bucket)
+            SELECT DISTINCT parameter_id, (measure_date / 3600) * 3600 FROM old_rows;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_measures_rollup_update
+    AFTER UPDATE ON measures
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION measures_rollup_mark_stale()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_measures_rollup_delete
+    AFTER DELETE ON measures
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION measures_rollup_mark_stale()
+    """,
+    # Carga inicial: as medidas já gravadas entram uma única vez na fila.
+    f"""
+    INSERT INTO measures_rollup_pending ({PENDING_COLUMNS})
+    {PENDING_SELECT.format(source="measures", where=ROLLUP_FILTER)}
+    """,
+]
+
+# Última medida de cada parâmetro, mantida por gatilhos de instrução em
+# `measures` (cobre também inserções feitas por outros serviços e por COPY).
+LATEST_MEASURES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS latest_measures (
+        parameter_id BIGINT PRIMARY KEY,
+        measure_id BIGINT NOT NULL,
+        -- Mesma nulidade de `measures.value`.
+        value DOUBLE PRECISION,
+        measure_date BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION latest_measures_after_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO latest_measures AS lm (parameter_id, measure_id, value, measure_date)
+        SELECT DISTINCT ON (n.parameter_id) n.parameter_id, n.id, n.value, n.measure_date
+        FROM new_rows n
+        ORDER BY n.parameter_id, n.measure_date DESC, n.id DESC
+        ON CONFLICT (parameter_id) DO UPDATE SET
+            measure_id = EXCLUDED.measure_id,
+            value = EXCLUDED.value,
+            measure_date = EXCLUDED.measure_date
+        WHERE (lm.measure_date, lm.measure_id) <= (EXCLUDED.measure_date, EXCLUDED.measure_id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    # Exclusões e alterações recalculam só os parâmetros afetados, buscando a
+    # última medida de cada um pelo índice (parameter_id, measure_date, id).
+    """
+    CREATE OR REPLACE FUNCTION latest_measures_refresh(parameter_ids BIGINT[])
+    RETURNS void AS $$
+    BEGIN
+        DELETE FROM latest_measures WHERE parameter_id = ANY(parameter_ids);
+
+        INSERT INTO latest_measures (parameter_id, measure_id, value, measure_date)
+        SELECT l.parameter_id, l.id, l.value, l.measure_date
+        FROM unnest(parameter_ids) AS a(parameter_id)
+        CROSS JOIN LATERAL (
+            SELECT m.parameter_id, m.id, m.value, m.measure_date
+            FROM measures m
+            WHERE m.parameter_id = a.parameter_id
+            ORDER BY m.measure_date DESC, m.id DESC
+            LIMIT 1
+        ) l
+        ON CONFLICT (parameter_id) DO NOTHING;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION latest_measures_recompute() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            PERFORM latest_measures_refresh(ARRAY(
+                SELECT parameter_id::BIGINT FROM old_rows
+                UNION
+                SELECT parameter_id::BIGINT FROM new_rows
+            ));
+        ELSE
+            PERFORM latest_measures_refresh(
+                ARRAY(SELECT DISTINCT parameter_id::BIGINT FROM old_rows)
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_latest_measures_insert
+    AFTER INSERT ON measures
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION latest_measures_after_insert()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_latest_measures_delete
+    AFTER DELETE ON measures
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION latest_measures_recompute()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_latest_measures_update
+    AFTER UPDATE ON measures
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION latest_measures_recompute()
+    """,
+    """
+    INSERT INTO latest_measures (parameter_id, measure_id, value, measure_date)
+    SELECT DISTINCT ON (m.parameter_id) m.parameter_id, m.id, m.value, m.measure_date
+    FROM measures m
+    ORDER BY m.parameter_id, m.measure_date DESC, m.id DESC
+    ON CONFLICT (parameter_id) DO NOTHING
+    """,
+]
+
+# Contadores incrementais dos widgets agregados. Alertas não lidos são contados
+# por tipo de alerta; status e estação vêm de `type_alerts`/`parameters`, que
+# são pequenas, então a leitura custa O(tipos de alerta) e não O(alertas).
+COUNTERS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS measure_counters (
+        parameter_type_id BIGINT PRIMARY KEY,
+        total BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS alert_counters (
+        type_alert_id BIGINT PRIMARY KEY,
+        unread BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION measure_counters_refresh() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO measure_counters AS c (parameter_type_id, total)
+            SELECT p.parameter_type_id, COUNT(*)
+            FROM new_rows n
+            JOIN parameters p ON p.id = n.parameter_id
+            GROUP BY p.parameter_type_id
+            ON CONFLICT (parameter_type_id) DO UPDATE SET total = c.total + EXCLUDED.total;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE measure_counters c SET total = c.total - d.total
+            FROM (
+                SELECT p.parameter_type_id, COUNT(*) AS total
+                FROM old_rows o
+                JOIN parameters p ON p.id = o.parameter_id
+                GROUP BY p.parameter_type_id
+            ) d
+            WHERE c.parameter_type_id = d.parameter_type_id;
+        ELSE
+            INSERT INTO measure_counters AS c (parameter_type_id, total)
+            SELECT p.parameter_type_id, SUM(d.delta)
+            FROM (
+                SELECT parameter_id, -1 AS delta FROM old_rows
+                UNION ALL
+                SELECT parameter_id, 1 AS delta FROM new_rows
+            ) d
+            JOIN parameters p ON p.id = d.parameter_id
+            GROUP BY p.parameter_type_id
+            HAVING SUM(d.delta) <> 0
+            ON CONFLICT (parameter_type_id) DO UPDATE SET total = c.total + EXCLUDED.total;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION alert_counters_refresh() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO alert_counters AS c (type_alert_id, unread)
+            SELECT type_alert_id, COUNT(*)
+            FROM new_rows
+            WHERE is_read = false
+            GROUP BY type_alert_id
+            ON CONFLICT (type_alert_id) DO UPDATE SET unread = c.unread + EXCLUDED.unread;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE alert_counters c SET unread = c.unread - d.unread
+            FROM (
+                SELECT type_alert_id, COUNT(*) AS unread
+                FROM old_rows
+                WHERE is_read = false
+                GROUP BY type_alert_id
+            ) d
+            WHERE c.type_alert_id = d.type_alert_id;
+        ELSE
+            INSERT INTO alert_counters AS c (type_alert_id, unread)
+            SELECT type_alert_id, SUM(delta)
+            FROM (
+                SELECT type_alert_id, -1 AS delta FROM old_rows WHERE is_read = false
+                UNION ALL
+                SELECT type_alert_id, 1 AS delta FROM new_rows WHERE is_read = false
+            ) d
+            GROUP BY type_alert_id
+            HAVING SUM(delta) <> 0
+            ON CONFLICT (type_alert_id) DO UPDATE SET unread = c.unread + EXCLUDED.unread;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_measure_counters_insert
+    AFTER INSERT ON measures
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION measure_counters_refresh()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_measure_counters_delete
+    AFTER DELETE ON measures
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION measure_counters_refresh()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_measure_counters_update
+    AFTER UPDATE ON measures
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION measure_counters_refresh()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_alert_counters_insert
+    AFTER INSERT ON alerts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION alert_counters_refresh()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_alert_counters_update
+    AFTER UPDATE ON alerts
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION alert_counters_refresh()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_alert_counters_delete
+    AFTER DELETE ON alerts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION alert_counters_refresh()
+    """,
+    """
+    INSERT INTO measure_counters (parameter_type_id, total)
+    SELECT p.parameter_type_id, COUNT(*)
+    FROM measures m
+    JOIN parameters p ON p.id = m.parameter_id
+    GROUP BY p.parameter_type_id
+    ON CONFLICT (parameter_type_id) DO NOTHING
+    """,
+    """
+    INSERT INTO alert_counters (type_alert_id, unread)
+    SELECT a.type_alert_id, COUNT(*)
+    FROM alerts a
+    WHERE a.is_read = false
+    GROUP BY a.type_alert_id
+    ON CONFLICT (type_alert_id) DO NOTHING
+    """,
+]
+
+STATEFUL_RULES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS alert_stateful_rules (
+        type_alert_id BIGINT PRIMARY KEY REFERENCES type_alerts (id) ON DELETE CASCADE,
+        kind TEXT NOT NULL,
+        window_seconds BIGINT NOT NULL DEFAULT 0,
+        -- Limite fracionário (ex.: 2.5 desvios no zscore); `type_alerts.value` é inteiro.
+        threshold DOUBLE PRECISION
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS alert_rule_state (
+        type_alert_id BIGINT PRIMARY KEY REFERENCES type_alerts (id) ON DELETE CASCADE,
+        version BIGINT NOT NULL DEFAULT 0,
+        last_date BIGINT,
+        last_value DOUBLE PRECISION,
+        since BIGINT,
+        fired BOOLEAN NOT NULL DEFAULT false,
+        sample_count BIGINT NOT NULL DEFAULT 0,
+        mean DOUBLE PRECISION NOT NULL DEFAULT 0,
+        m2 DOUBLE PRECISION NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+# Avisa os workers (LISTEN reference_catalog) para recarregar o catálogo.
+CATALOG_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION notify_reference_catalog() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('reference_catalog', TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    *[
+        f"""
+        CREATE OR REPLACE TRIGGER trg_catalog_{table}
+        AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_catalog()
+        """
+        for table in CATALOG_TABLES
+    ],
+]
+
+REFRESH_TOKENS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS refresh_tokens (
+        id BIGSERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        family_id UUID NOT NULL,
+        token_hash TEXT NOT NULL UNIQUE,
+        expires_at BIGINT NOT NULL,
+        revoked_at BIGINT,
+        create_date BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_refresh_tokens_family
+    ON refresh_tokens (family_id) WHERE revoked_at IS NULL
+    """,
+]
+
+# Usuários são alterados e removidos fora deste serviço: o gatilho avisa todos os
+# workers (LISTEN principal_cache) para descartar o usuário em cache.
+PRINCIPAL_CACHE_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION notify_principal_cache() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('principal_cache', OLD.id::TEXT);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_principal_cache_users
+    AFTER UPDATE OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_principal_cache()
+    """,
+]
+
+ALERT_BACKFILL_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS alert_backfill_jobs (
+        id BIGSERIAL PRIMARY KEY,
+        type_alert_id BIGINT NOT NULL,
+        window_start BIGINT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        total BIGINT NOT NULL DEFAULT 0,
+        processed BIGINT NOT NULL DEFAULT 0,
+        created BIGINT NOT NULL DEFAULT 0,
+        removed BIGINT NOT NULL DEFAULT 0,
+        last_measure_date BIGINT,
+        last_measure_id BIGINT,
+        error TEXT,
+        create_date BIGINT NOT NULL,
+        last_update BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_alert_backfill_jobs_active
+    ON alert_backfill_jobs (id) WHERE status IN ('pending', 'running')
+    """,
+]
+
+TRIGGERS = {
+    "measures": (
+        "trg_measures_rollup_insert",
+        "trg_measures_rollup_update",
+        "trg_measures_rollup_delete",
+        "trg_latest_measures_insert",
+        "trg_latest_measures_delete",
+        "trg_latest_measures_update",
+        "trg_measure_counters_insert",
+        "trg_measure_counters_delete",
+        "trg_measure_counters_update",
+    ),
+    "alerts": (
+        "trg_alert_counters_insert",
+        "trg_alert_counters_update",
+        "trg_alert_counters_delete",
+    ),
+    "users": ("trg_principal_cache_users",),
+    **{table: (f"trg_catalog_{table}",) for table in CATALOG_TABLES if table != "alert_stateful_rules"},
+}
+
+FUNCTIONS = (
+    "measures_rollup_enqueue()",
+    "measures_rollup_mark_stale()",
+    "latest_measures_after_insert()",
+    "latest_measures_recompute()",
+    "latest_measures_refresh(BIGINT[])",
+    "measure_counters_refresh()",
+    "alert_counters_refresh()",
+    "notify_reference_catalog()",
+    "notify_principal_cache()",
+)
+
+TABLES = (
+    "alert_backfill_jobs",
+    "refresh_tokens",
+    "alert_rule_state",
+    "alert_stateful_rules",
+    "alert_counters",
+    "measure_counters",
+    "latest_measures",
+    "measures_rollup_pending",
+    "measures_rollup_stale",
+    *ROLLUP_TABLES,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # `measures` é grande e recebe escrita contínua: o índice é criado sem travar
+    # as inserções (CONCURRENTLY não roda dentro de transação).
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_measures_parameter_date_id
+            ON measures (parameter_id, measure_date DESC, id DESC)
+        """)
+
+    # Gatilhos e cargas iniciais na mesma transação: as medidas gravadas durante a
+    # migração entram pelos gatilhos ou pela carga, nunca pelos dois.
+    op.execute("LOCK TABLE measures, alerts IN SHARE ROW EXCLUSIVE MODE")
+    for ddl in [
+        *ROLLUP_DDL,
+        *LATEST_MEASURES_DDL,
+        *COUNTERS_DDL,
+        # Antes do catálogo, que cria o gatilho de notificação em alert_stateful_rules.
+        *STATEFUL_RULES_DDL,
+        *CATALOG_DDL,
+        *REFRESH_TOKENS_DDL,
+        *PRINCIPAL_CACHE_DDL,
+        *ALERT_BACKFILL_DDL,
+    ]:
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, triggers in TRIGGERS.items():
+        for trigger in triggers:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    for table in TABLES:
+        op.execute(f"DROP TABLE IF EXISTS {table}")
+    for function in FUNCTIONS:
+        op.execute(f"DROP FUNCTION IF EXISTS {function}")
+    op.execute("DROP INDEX IF EXISTS ix_measures_parameter_date_id")
@@ -4,13 +4,40 @@ from typing import Any, AsyncGenerator
 
 from fastapi import FastAPI
 
+from app.config.settings import settings
 from app.dependency.database import Database
+from app.modules.cache import query_cache
+from app.modules.periodic import PeriodicTask
+from app.modules.security import password_executor
+from app.modules.slow_queries import slow_query_recorder
+from app.service.alert_backfill import run_alert_backfills
+from app.service.catalog import ReferenceCatalog
+from app.service.measure_rollup import refresh_measure_rollups
+from app.service.stateful_rules import StatefulRuleEngine
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
+    rollup_task = PeriodicTask(refresh_measure_rollups, settings.ROLLUP_INTERVAL_SECONDS)
+    backfill_task = PeriodicTask(run_alert_backfills, settings.ALERT_BACKFILL_INTERVAL_SECONDS)
+    replica_task = PeriodicTask(
+        Database().check_replicas, settings.REPLICA_CHECK_INTERVAL_SECONDS
+    )
     try:
         await Database().ping()
+        await ReferenceCatalog().start()
+        await StatefulRuleEngine().load()
+        slow_query_recorder.start(lambda: Database().read_session)
+        rollup_task.start()
+        backfill_task.start()
+        replica_task.start()
         yield
     finally:
+        await replica_task.stop()
+        await backfill_task.stop()
+        await rollup_task.stop()
+        await ReferenceCatalog().stop()
+        await slow_query_recorder.stop()
+        await query_cache.close()
+        password_executor.shutdown()
         await Database().close()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+# Tabelas e índices auxiliares mantidos por este serviço (as tabelas de domínio
+# vêm do submódulo app/core e de suas migrações). São criados pelas migrações de
+# `alembic/service`, com tabela de versão própria, depois das migrações do core:
+#
+#     alembic upgrade head && alembic -n service upgrade head
+SERVICE_VERSION_TABLE = "alembic_version_service"
+
+SERVICE_TABLES = frozenset({
+    SERVICE_VERSION_TABLE,
+    "measures_rollup_hourly",
+    "measures_rollup_daily",
+    "measures_rollup_pending",
+    "measures_rollup_stale",
+    "latest_measures",
+    "measure_counters",
+    "alert_counters",
+    "alert_stateful_rules",
+    "alert_rule_state",
+    "refresh_tokens",
+    "alert_backfill_jobs",
+})
+
+# Índices do serviço criados em tabelas do core.
+SERVICE_INDEXES = frozenset({"ix_measures_parameter_date_id"})
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def is_core_object(name: str | None, type_: str) -> bool:
+    """Filtro `include_name` do autogenerate do core: ignora os objetos do serviço."""
+    if type_ == "table":
+        return name not in SERVICE_TABLES
+    if type_ == "index":
+        return name not in SERVICE_INDEXES
+    return True
+
+
+def upgrade_service_schema() -> None:
+    """Aplica as migrações do serviço (usado pelos testes; em produção, pela CLI)."""
+    command.upgrade(Config(str(ALEMBIC_INI), ini_section="service"), "head")
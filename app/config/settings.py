@@ -12,8 +12,45 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     TEST_ENV: bool = False
     DATABASE_URL_TEST: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 5
+    QUERY_BUDGET_MODE: str = "log"
+    QUERY_BUDGET_DEFAULT: int = 25
+    QUERY_REPEAT_LIMIT: int = 5
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    SLOW_QUERY_CAPACITY: int = 50
+    SLOW_QUERY_COOLDOWN_SECONDS: float = 300
+    INGEST_BATCH_SIZE: int = 20000
+    INGEST_MAX_LINE_BYTES: int = 64 * 1024
+    ROLLUP_INTERVAL_SECONDS: int = 60
+    ALERT_BACKFILL_WINDOW_DAYS: int = 30
+    ALERT_BACKFILL_CHUNK_SIZE: int = 5000
+    ALERT_BACKFILL_INTERVAL_SECONDS: int = 10
+    ALERT_BACKFILL_LOCK_TIMEOUT_MS: int = 2000
+    ALERT_ZSCORE_MIN_SAMPLES: int = 30
+    ALERT_SIMULATION_CHUNK_SIZE: int = 100000
+    ALERT_SIMULATION_SAMPLE_SIZE: int = 20
+    ALERT_SIMULATION_TIMEOUT_SECONDS: int = 20
+    ROLLUP_BATCH_SIZE: int = 50000
+    HISTORY_PAGE_SIZE: int = 1000
+    CATALOG_RECONNECT_MAX_SECONDS: float = 30
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1024
+    REDIS_URL: str | None = None
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
 
 
 settings = Settings()  # type: ignore[call-arg]
@@ -1,32 +1,91 @@
 # -*- coding: utf-8 -*-
+import time
+from collections import OrderedDict
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import decode
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.settings import Settings
-from app.dependency.database import SessionConnection
+from app.config.settings import settings
+from app.dependency.database import Database
 from app.schemas.user import UserResponse
 from app.service.user import UserService
 
 oauth_schema = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Usuários são alterados e removidos fora deste serviço: o gatilho em `users`
+# (migração em alembic/service) avisa todos os workers, pela conexão LISTEN do
+# catálogo, para descartar o usuário em cache.
+PRINCIPAL_CHANNEL = "principal_cache"
+
+
+class PrincipalCache:
+    """Usuários já resolvidos, por `sub` do token.
+
+    Uma entrada vale até a expiração do token que a criou (limitada a
+    `PRINCIPAL_CACHE_TTL_SECONDS`), então a maioria das requisições autenticadas
+    não abre sessão com o banco.
+    """
+
+    def __init__(self, max_entries: int, ttl: int) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, UserResponse]] = OrderedDict()
+
+    def get(self, user_id: int) -> UserResponse | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= time.time():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return user
+
+    def set(self, user_id: int, user: UserResponse, token_exp: float | None) -> None:
+        expires_at = time.time() + self._ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        self._entries[user_id] = (expires_at, user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            self.clear()
+
+
+principal_cache = PrincipalCache(
+    settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
 
 class AuthManager:
     @staticmethod
     async def has_authorization(
-        session: AsyncSession = Depends(SessionConnection.session),
         token: str = Depends(oauth_schema),
     ) -> UserResponse:
-        setting = Settings()  # type: ignore[call-arg]
         try:
-            payoad = decode(token, setting.SECRET_KEY, algorithms=[setting.ALGORITHM])
+            payoad = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
 
-            user = (
-                await UserService(session).get_user_by_id(int(payoad.get("sub")))
-                if payoad.get("sub")
-                else None
-            )
+            user_id = int(payoad["sub"]) if payoad.get("sub") else None
+            user = principal_cache.get(user_id) if user_id is not None else None
+            if user is None and user_id is not None:
+                async with Database().session as session:
+                    user = await UserService(session).get_user_by_id(user_id)
+                if user:
+                    principal_cache.set(user_id, user, payoad.get("exp"))
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+from functools import wraps
+from typing import Any, AsyncGenerator, Awaitable, Callable, Coroutine
 
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -12,12 +18,61 @@ from sqlalchemy.ext.asyncio.engine import AsyncEngine
 
 from app.config.settings import settings
 from app.modules.common import Singleton
+from app.modules.pool_metrics import InstrumentedQueuePool, PoolMetrics
+from app.modules.query_budget import instrument_engine
+
+PRIMARY_READS_COOKIE = "wds_primary_reads"
+
+# Em uma réplica sem WAL pendente o último replay pode ser antigo sem haver
+# atraso real; no primário (ou em um Postgres avulso) as funções retornam NULL.
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.engine = create_async_engine(
+            url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        instrument_engine(self.engine.sync_engine)
+        self.session_maker = async_sessionmaker(
+            bind=self.engine,
+            expire_on_commit=False,
+            autoflush=False,
+            autocommit=False,
+        )
+        self.lag: float | None = None
+        self.healthy = False
+
+    async def check(self) -> None:
+        try:
+            async with self.session_maker() as session:
+                result = await session.execute(text(REPLICA_LAG_QUERY))
+                lag = result.scalar()
+            self.lag = float(lag or 0)
+            self.healthy = self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+        except Exception as e:
+            print(f"Erro ao verificar réplica: {e}")
+            self.lag = None
+            self.healthy = False
 
 
 class Database(metaclass=Singleton):
     def __init__(self) -> None:
+        self._pool_metrics = PoolMetrics()
         self._engine: AsyncEngine = self._create_engine()
         self._session_maker: async_sessionmaker[AsyncSession] = self._create_session_factory()
+        self._replicas = [Replica(url) for url in settings.DATABASE_REPLICA_URLS]
+        self._next_replica = itertools.count()
 
     async def ping(self) -> None:
         async with self.session as session:
@@ -27,11 +82,37 @@ class Database(metaclass=Singleton):
     def session(self) -> AsyncSession:
         return self._session_maker()
 
-    @staticmethod
-    def _create_engine() -> AsyncEngine:
-        return create_async_engine(
+    @property
+    def read_session(self) -> AsyncSession:
+        """Sessão somente leitura em uma réplica saudável, ou no primário se não houver."""
+        healthy = [replica for replica in self._replicas if replica.healthy]
+        if not healthy:
+            return self.session
+        return healthy[next(self._next_replica) % len(healthy)].session_maker()
+
+    async def check_replicas(self) -> None:
+        for replica in self._replicas:
+            await replica.check()
+
+    def pool_stats(self) -> dict[str, Any]:
+        return self._pool_metrics.snapshot(self._engine.pool)
+
+    def _create_engine(self) -> AsyncEngine:
+        engine = create_async_engine(
             settings.DATABASE_URL,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
         )
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.metrics = self._pool_metrics
+        self._pool_metrics.attach(pool)
+        instrument_engine(engine.sync_engine)
+        return engine
 
     def _create_session_factory(self) -> async_sessionmaker[AsyncSession]:
         return async_sessionmaker(
@@ -43,10 +124,95 @@ class Database(metaclass=Singleton):
 
     async def close(self) -> None:
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
+            replica.healthy = False
 
 
 class SessionConnection:
+    """Sessões por requisição.
+
+    O `AsyncSession` só retira uma conexão do pool na primeira consulta, então
+    requisições respondidas pelo cache ou recusadas na validação não ocupam o
+    pool. Em rotas `SessionReleasingRoute` a conexão volta ao pool assim que o
+    endpoint retorna, antes da serialização da resposta.
+    """
+
     @staticmethod
     async def session() -> AsyncGenerator[AsyncSession, None]:
         async with Database().session as session:
             yield session
+
+    @staticmethod
+    async def read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+        """Sessão para rotas GET; logo após uma escrita do cliente, lê do primário."""
+        async with SessionConnection.streaming_read_session(request) as session:
+            yield session
+
+    @staticmethod
+    def streaming_read_session(request: Request) -> AsyncSession:
+        """Mesma escolha de `read_session`, mas sem fechar a sessão ao fim da rota.
+
+        Para corpos em streaming: as dependências com `yield` terminam antes do
+        corpo ser enviado, então quem consome a sessão deve fechá-la.
+        """
+        primary_until = request.cookies.get(PRIMARY_READS_COOKIE, "")
+        if primary_until.isdigit() and int(primary_until) > time.time():
+            return Database().session
+        return Database().read_session
+
+
+class SessionReleasingRoute(APIRoute):
+    """Fecha as sessões da requisição logo que o endpoint termina.
+
+    Sem isso a dependência com `yield` só fecha a sessão depois que o FastAPI
+    valida e serializa a resposta, e a conexão fica presa durante esse tempo.
+    Fechar a sessão devolve a conexão ao pool; a dependência ainda a fecha de
+    novo no final, o que é inofensivo.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        endpoint = self.dependant.call
+        if asyncio.iscoroutinefunction(endpoint) and not getattr(
+            endpoint, "_releases_sessions", False
+        ):
+            self.dependant.call = _release_sessions_after(endpoint)
+        return super().get_route_handler()
+
+
+def _release_sessions_after(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(endpoint)
+    async def wrapper(**values: Any) -> Any:
+        try:
+            return await endpoint(**values)
+        finally:
+            for value in values.values():
+                if isinstance(value, AsyncSession):
+                    await value.close()
+
+    wrapper._releases_sessions = True  # type: ignore[attr-defined]  # noqa: SLF001
+    return wrapper
+
+
+async def read_your_writes(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Após uma escrita bem-sucedida, fixa as leituras do cliente no primário.
+
+    A janela é o atraso máximo aceito para uma réplica saudável, então a
+    escrita já estará visível quando as leituras voltarem para as réplicas.
+    """
+    response = await call_next(request)
+    if (
+        request.method not in {"GET", "HEAD", "OPTIONS"}
+        and response.status_code < status.HTTP_400_BAD_REQUEST
+    ):
+        window = int(settings.REPLICA_MAX_LAG_SECONDS) + 1
+        response.set_cookie(
+            PRIMARY_READS_COOKIE,
+            str(int(time.time()) + window),
+            max_age=window,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
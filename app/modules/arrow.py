@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Sequence
+
+import pyarrow as pa
+from asyncpg import Record
+from fastapi import Request, Response
+from sqlalchemy.engine import Row
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+STATION_HISTORY_SCHEMA = pa.schema([
+    pa.field("measure_date", pa.int64()),
+    pa.field("title", pa.string()),
+    pa.field("value", pa.float64()),
+    pa.field("min_value", pa.float64()),
+    pa.field("max_value", pa.float64()),
+    pa.field("measure_unit", pa.string()),
+    pa.field("type", pa.string()),
+])
+
+
+def accepts_arrow(request: Request) -> bool:
+    return ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def rows_to_record_batch(
+    rows: Sequence[Row[Any] | Record], schema: pa.Schema
+) -> pa.RecordBatch:
+    # Transpõe as linhas em colunas de uma vez (zip em C) e deixa o Arrow
+    # converter cada coluna, sem instanciar um modelo Pydantic por linha.
+    columns = dict(zip(_column_names(rows[0]), zip(*rows))) if rows else {}
+    arrays = [
+        _to_array(columns.get(field.name, [None] * len(rows)), field.type) for field in schema
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _column_names(row: Any) -> Sequence[str]:
+    # `Row` do SQLAlchemy expõe `_fields`; `Record` do asyncpg, `keys()`.
+    return row._fields if hasattr(row, "_fields") else tuple(row.keys())
+
+
+def _to_array(values: Sequence[Any], type_: pa.DataType) -> pa.Array:
+    try:
+        return pa.array(values, type=type_)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Colunas NUMERIC chegam como Decimal e precisam de conversão explícita.
+        return pa.array(values).cast(type_)
+
+
+def arrow_response(
+    rows: Sequence[Row[Any] | Record], schema: pa.Schema, headers: dict[str, str] | None = None
+) -> Response:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(rows_to_record_batch(rows, schema))
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers=headers,
+    )
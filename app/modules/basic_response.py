@@ -11,3 +11,7 @@ class BasicResponse(BaseModel, Generic[T]):
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class CursorResponse(BasicResponse[T], Generic[T]):
+    next_cursor: str | None = None
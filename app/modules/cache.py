@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Protocol, Sequence, TypeVar, get_type_hints
+
+from pydantic import BaseModel, TypeAdapter
+from redis import asyncio as aioredis
+
+from app.config.settings import settings
+
+T = TypeVar("T")
+
+
+class CacheBackend(Protocol):
+    """Guarda os resultados já serializados em JSON: cada leitura devolve uma cópia
+    nova, nunca um objeto compartilhado entre requisições."""
+
+    async def get(self, key: str, tags: Sequence[str]) -> tuple[bytes | None, list[int]]: ...
+
+    async def set(
+        self, key: str, value: bytes, tags: Sequence[str], versions: list[int], ttl: int
+    ) -> None: ...
+
+    async def invalidate(self, tags: Sequence[str]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """Cache local ao processo com TTL e descarte LRU.
+
+    Cada tag tem uma versão; uma entrada guarda as versões das suas tags no
+    momento em que a consulta começou e deixa de valer quando alguma delas muda.
+
+    As tags são as tabelas do catálogo de referência, e as escritas feitas por
+    outros workers chegam pela conexão LISTEN do `ReferenceCatalog`
+    (`QueryCache.on_notify`). Enquanto essa conexão não está ativa o cache não
+    é usado, porque as invalidações dos outros workers se perderiam.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, list[int], bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        # Muda a cada queda ou volta do LISTEN: descarta também as consultas que
+        # estavam em andamento e gravariam com as versões antigas.
+        self._generation = 0
+        self._listening = False
+
+    async def get(self, key: str, tags: Sequence[str]) -> tuple[bytes | None, list[int]]:
+        versions = [self._generation, *[self._versions.get(tag, 0) for tag in tags]]
+        entry = self._entries.get(key)
+        if entry is None or not self._listening:
+            return None, versions
+        expires_at, entry_versions, value = entry
+        if expires_at < time.monotonic() or entry_versions != versions:
+            del self._entries[key]
+            return None, versions
+        self._entries.move_to_end(key)
+        return value, versions
+
+    async def set(
+        self, key: str, value: bytes, tags: Sequence[str], versions: list[int], ttl: int
+    ) -> None:
+        if not self._listening or versions[0] != self._generation:
+            return
+        self._entries[key] = (time.monotonic() + ttl, versions, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, tags: Sequence[str]) -> None:
+        self.bump(tags)
+
+    def bump(self, tags: Sequence[str]) -> None:
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def set_listening(self, listening: bool) -> None:
+        self._listening = listening
+        self._generation += 1
+        self._entries.clear()
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Cache compartilhado entre workers; versões de tag ficam no próprio Redis.
+
+    Cada entrada é a lista de versões em JSON, uma quebra de linha e o valor.
+    """
+
+    def __init__(self, client: Any, prefix: str = "wds:cache") -> None:
+        self._redis = client
+        self._prefix = prefix
+
+    async def get(self, key: str, tags: Sequence[str]) -> tuple[bytes | None, list[int]]:
+        raw, *tag_versions = await self._redis.mget([
+            self._entry_key(key),
+            *[self._tag_key(tag) for tag in tags],
+        ])
+        versions = [int(version or 0) for version in tag_versions]
+        if raw is None:
+            return None, versions
+        entry_versions, _, value = raw.partition(b"\n")
+        if json.loads(entry_versions) != versions:
+            return None, versions
+        return value, versions
+
+    async def set(
+        self, key: str, value: bytes, tags: Sequence[str], versions: list[int], ttl: int
+    ) -> None:
+        entry = json.dumps(versions).encode() + b"\n" + value
+        await self._redis.set(self._entry_key(key), entry, ex=ttl)
+
+    async def invalidate(self, tags: Sequence[str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._tag_key(tag))
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self._prefix}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}:tag:{tag}"
+
+
+class QueryCache:
+    def __init__(self) -> None:
+        self._backend: CacheBackend | None = None
+        self._configured = False
+
+    def configure(self, backend: CacheBackend | None) -> None:
+        self._backend = backend
+        self._configured = True
+
+    @property
+    def backend(self) -> CacheBackend | None:
+        if not self._configured:
+            self.configure(self._backend_from_settings())
+        return self._backend
+
+    async def invalidate(self, *tags: str) -> None:
+        backend = self.backend
+        if backend is None:
+            return
+        try:
+            await backend.invalidate(tags)
+        except Exception as e:
+            print(f"Erro ao invalidar cache {tags}: {e}")
+
+    def on_notify(self, tag: str) -> None:
+        """Escrita avisada pelo canal do catálogo, feita por qualquer worker.
+
+        Só o cache em memória precisa disso: no Redis as versões já são
+        compartilhadas.
+        """
+        backend = self.backend
+        if isinstance(backend, MemoryCacheBackend):
+            backend.bump([tag])
+
+    def set_listening(self, listening: bool) -> None:
+        """Avisado pelo catálogo quando a conexão LISTEN sobe ou cai."""
+        backend = self.backend
+        if isinstance(backend, MemoryCacheBackend):
+            backend.set_listening(listening)
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+        self._backend = None
+        self._configured = False
+
+    @staticmethod
+    def make_key(name: str, args: Sequence[Any], kwargs: dict[str, Any]) -> str:
+        parts = [_key_part(arg) for arg in args]
+        parts.extend(f"{k}={_key_part(v)}" for k, v in sorted(kwargs.items()))
+        digest = hashlib.sha1("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f"{name}:{digest}"
+
+    @staticmethod
+    def _backend_from_settings() -> CacheBackend | None:
+        if settings.CACHE_BACKEND == "redis" and settings.REDIS_URL:
+            # `redis.asyncio.from_url` não tem anotações de tipo.
+            client = aioredis.from_url(settings.REDIS_URL)  # type: ignore[no-untyped-call]
+            return RedisCacheBackend(client)
+        if settings.CACHE_BACKEND == "memory":
+            return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+        return None
+
+
+query_cache = QueryCache()
+
+
+def cached(
+    *tags: str, ttl: int | None = None
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Guarda o resultado de um método de serviço, identificado pelos argumentos.
+
+    `tags` são as tabelas de que o resultado depende; escritas nessas tabelas
+    devem chamar `query_cache.invalidate(...)` com as mesmas tags. O resultado é
+    guardado em JSON e validado de novo, pelo tipo de retorno anotado, a cada
+    leitura.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        adapter: TypeAdapter[T] = TypeAdapter(get_type_hints(func)["return"])
+
+        @wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            backend = query_cache.backend
+            if backend is None:
+                return await func(self, *args, **kwargs)
+
+            key = QueryCache.make_key(func.__qualname__, args, kwargs)
+            try:
+                raw, versions = await backend.get(key, tags)
+                if raw is not None:
+                    return adapter.validate_json(raw)
+            except Exception as e:
+                print(f"Erro ao ler cache {key}: {e}")
+                return await func(self, *args, **kwargs)
+
+            value = await func(self, *args, **kwargs)
+            try:
+                await backend.set(
+                    key,
+                    adapter.dump_json(value),
+                    tags,
+                    versions,
+                    ttl or settings.CACHE_TTL_SECONDS,
+                )
+            except Exception as e:
+                print(f"Erro ao gravar cache {key}: {e}")
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _key_part(value: Any) -> str:
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    return repr(value)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import Any, Sequence
+
+from sqlalchemy.engine import Row
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def csv_header(columns: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
+
+
+def rows_to_csv(rows: Sequence[Row[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(tuple(row) for row in rows)
+    return buffer.getvalue()
+
+
+def rows_to_ndjson(rows: Sequence[Row[Any]], columns: Sequence[str]) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default) + "\n"
+        for row in rows
+    )
+
+
+def export_error(export_format: str, message: str) -> str:
+    """Última linha de uma exportação que falhou depois de começar a ser enviada."""
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(["#error", message])
+        return buffer.getvalue()
+    return json.dumps({"error": message}, ensure_ascii=False) + "\n"
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import re
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Mapping, Sequence, TypeVar
+
+import asyncpg
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.query_budget import record_query
+
+if TYPE_CHECKING:
+    from app.modules.statements import Statement
+
+M = TypeVar("M", bound=BaseModel)
+
+# `:nome` vira `$n`; `::tipo` (cast do Postgres) não é parâmetro.
+_NAMED_PARAM = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+@lru_cache(maxsize=256)
+def to_positional(sql: str) -> tuple[str, tuple[str, ...]]:
+    """Converte os parâmetros nomeados do `text()` para o formato do asyncpg."""
+    names: list[str] = []
+
+    def replace(match: re.Match[str]) -> str:
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _NAMED_PARAM.sub(replace, sql), tuple(names)
+
+
+async def fetch_records(
+    session: AsyncSession, sql: "str | Statement", params: Mapping[str, Any] | None = None
+) -> list[asyncpg.Record]:
+    """Executa a consulta direto na conexão asyncpg da sessão.
+
+    Não passa pelo `Result`/`Row` do SQLAlchemy; o asyncpg prepara a instrução
+    uma vez por conexão do pool e reaproveita nas chamadas seguintes.
+    """
+    if isinstance(sql, str):
+        positional, names = to_positional(sql)
+    else:
+        positional, names = sql.positional, sql.params
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    args = [(params or {})[name] for name in names]
+    started = time.perf_counter()
+    records = await raw.driver_connection.fetch(positional, *args)  # type: ignore[union-attr]
+    record_query(positional, time.perf_counter() - started, args)
+    return records  # type: ignore[no-any-return]
+
+
+@lru_cache(maxsize=64)
+def _list_adapter(model: type[M]) -> TypeAdapter[list[M]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def records_to_models(model: type[M], records: Sequence[Mapping[str, Any]]) -> list[M]:
+    """Valida todas as linhas em uma única chamada do pydantic-core."""
+    return _list_adapter(model).validate_python([dict(record) for record in records])
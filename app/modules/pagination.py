@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+import base64
+
+
+def encode_cursor(*keys: int) -> str:
+    raw = ":".join(str(int(key)) for key in keys)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> tuple[int, ...]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
+    keys = tuple(int(key) for key in raw.split(":"))
+    if len(keys) != size:
+        raise ValueError("Cursor inválido")
+    return keys
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import Awaitable, Callable
+
+
+class PeriodicTask:
+    def __init__(self, func: Callable[[], Awaitable[None]], interval: float) -> None:
+        self._func = func
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._func()
+            except Exception as e:
+                print(f"Erro na tarefa periódica {self._func.__name__}: {e}")
+            await asyncio.sleep(self._interval)
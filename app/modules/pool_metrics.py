@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolMetrics:
+    """Contadores do pool de conexões alimentados pelos eventos do SQLAlchemy."""
+
+    def __init__(self) -> None:
+        self.checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.connect_errors = 0
+
+    def attach(self, pool: Pool) -> None:
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def record_wait(
+        self, seconds: float, timed_out: bool = False, connect_error: bool = False
+    ) -> None:
+        self.wait_count += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        if timed_out:
+            self.timeouts += 1
+        if connect_error:
+            self.connect_errors += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        size = pool.size() if isinstance(pool, AsyncAdaptedQueuePool) else 0
+        overflow = pool.overflow() if isinstance(pool, AsyncAdaptedQueuePool) else 0
+        idle = pool.checkedin() if isinstance(pool, AsyncAdaptedQueuePool) else 0
+        return {
+            "pool_size": size,
+            "checked_out": self.checked_out,
+            "idle": idle,
+            "overflow": max(overflow, 0),
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "connect_errors": self.connect_errors,
+            "wait_count": self.wait_count,
+            "wait_avg_ms": self.wait_total / self.wait_count * 1000
+            if self.wait_count
+            else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+        }
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.connects += 1
+
+    def _on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        self.checked_out += 1
+        self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.checked_out = max(self.checked_out - 1, 0)
+
+    def _on_invalidate(
+        self, dbapi_connection: Any, connection_record: Any, exception: Any
+    ) -> None:
+        self.invalidations += 1
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Pool padrão do engine assíncrono que mede a espera por uma conexão livre.
+
+    O SQLAlchemy não tem evento para o início do checkout, então a espera é
+    medida em volta de `_do_get`, onde o pool bloqueia quando está cheio. Só o
+    `TimeoutError` do pool conta como timeout; falhas ao abrir uma conexão nova
+    (banco fora, autenticação) vão para `connect_errors`.
+    """
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - started, connect_error=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool: InstrumentedQueuePool = super().recreate()  # type: ignore[assignment]
+        pool.metrics = self.metrics
+        return pool
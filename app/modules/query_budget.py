@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Mapping, Sequence, TypeVar
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import settings
+from app.modules.slow_queries import slow_query_recorder
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def problems(self, budget: int, repeat_limit: int) -> list[str]:
+        problems = []
+        if self.count > budget:
+            problems.append(f"{self.count} consultas, orçamento de {budget}")
+        statement, repeats = (self.statements.most_common(1) or [("", 0)])[0]
+        if repeats > repeat_limit:
+            summary = " ".join(statement.split())[:200]
+            problems.append(f"mesma consulta repetida {repeats} vezes (N+1?): {summary}")
+        return problems
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def record_query(statement: str, duration: float, params: Sequence[Any] = ()) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    slow_query_recorder.observe(statement, params, duration)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Conta as instruções e o tempo de banco da requisição corrente."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Any, *args: Any) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        # args: (parameters, context, executemany)
+        started = conn.info["query_started"].pop()
+        record_query(
+            statement, time.perf_counter() - started, _statement_params(args[0], args[2])
+        )
+
+
+def _statement_params(parameters: Any, executemany: bool) -> Sequence[Any]:
+    # Parâmetros já no formato do driver; no executemany basta o primeiro conjunto
+    # para o EXPLAIN das consultas lentas.
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, Mapping):
+        return tuple(parameters.values())
+    return tuple(parameters or ())
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Declara quantas consultas um endpoint pode fazer por requisição."""
+
+    def decorator(endpoint: F) -> F:
+        endpoint._query_budget = max_queries  # type: ignore[attr-defined]  # noqa: SLF001
+        return endpoint
+
+    return decorator
+
+
+async def query_budget_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    if settings.QUERY_BUDGET_MODE == "off":
+        return await call_next(request)
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    timing = response.headers.get("Server-Timing")
+    response.headers["Server-Timing"] = (
+        f"{timing}, {stats.server_timing()}" if timing else stats.server_timing()
+    )
+
+    route = request.scope.get("route")
+    endpoint = getattr(route, "endpoint", None)
+    budget = getattr(endpoint, "_query_budget", settings.QUERY_BUDGET_DEFAULT)
+    problems = stats.problems(budget, settings.QUERY_REPEAT_LIMIT)
+    if problems:
+        message = f"{request.method} {request.url.path}: {'; '.join(problems)}"
+        if settings.QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceeded(message)
+        print(f"Orçamento de consultas excedido em {message}")
+    return response
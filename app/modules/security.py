@@ -1,11 +1,78 @@
+import asyncio
+import hashlib
+import hmac
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Callable, TypeVar
 
 import jwt
+from fastapi import HTTPException, status
 from pwdlib import PasswordHash
 
-from app.config.settings import Settings
+from app.config.settings import settings
 from app.schemas.user import UserResponse
 
+T = TypeVar("T")
+
+
+class PasswordHashExecutor:
+    """Pool de threads dedicado ao argon2, fora do event loop.
+
+    O argon2 libera o GIL, então as threads rodam em paralelo sem travar as
+    demais requisições. Acima de `max_workers + max_pending` chamadas em curso
+    novas chamadas são recusadas com 503 em vez de formar uma fila sem limite.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._in_flight >= self._max_workers + self._max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes",
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="password-hash"
+            )
+
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_workers": self._max_workers,
+            "max_pending": self._max_pending,
+            "running": min(self._in_flight, self._max_workers),
+            "queued": max(self._in_flight - self._max_workers, 0),
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_executor = PasswordHashExecutor(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
+
 
 class PasswordManager:
     def __init__(self) -> None:
@@ -17,13 +84,18 @@ class PasswordManager:
     def verify_password(self, password: str, hashed: str) -> bool:
         return self.__pwd_context.verify(password, hashed)  # type: ignore[no-any-return]
 
+    async def password_hash_async(self, password: str) -> str:
+        return await password_executor.run(self.password_hash, password)
+
+    async def verify_password_async(self, password: str, hashed: str) -> bool:
+        return await password_executor.run(self.verify_password, password, hashed)
+
 
 class TokenManager:
     def __init__(self) -> None:
-        self.__settings = Settings()  # type: ignore[call-arg]
-        self.__algorithm = self.__settings.ALGORITHM
-        self.__secret_key = self.__settings.SECRET_KEY
-        self.__access_token_expire_minutes = self.__settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        self.__algorithm = settings.ALGORITHM
+        self.__secret_key = settings.SECRET_KEY
+        self.__access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
     def create_access_token(self, data: UserResponse) -> str:
         expire = datetime.now().astimezone() + timedelta(
@@ -31,3 +103,10 @@ class TokenManager:
         )
         to_encode = {"sub": str(data.id), "exp": expire}
         return jwt.encode(to_encode, self.__secret_key, algorithm=self.__algorithm)  # type: ignore[no-any-return]
+
+    @staticmethod
+    def create_refresh_token() -> str:
+        return secrets.token_urlsafe(32)
+
+    def hash_refresh_token(self, token: str) -> str:
+        return hmac.new(self.__secret_key.encode(), token.encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+
+EXPLAINABLE = ("SELECT", "WITH")
+
+
+class SlowQueryRecorder:
+    """Guarda as consultas lentas recentes com o plano de execução.
+
+    O `EXPLAIN (ANALYZE, BUFFERS)` roda em segundo plano, em uma transação
+    somente leitura de outra sessão, e só para SELECT/WITH: o ANALYZE executa a
+    consulta de novo. Cada instrução é explicada no máximo uma vez por
+    `cooldown` segundos e apenas um EXPLAIN roda por vez.
+    """
+
+    def __init__(self, threshold_ms: float, capacity: int, cooldown: float) -> None:
+        self._threshold = threshold_ms / 1000
+        self._cooldown = cooldown
+        self._entries: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._last_explained: dict[str, float] = {}
+        self._session_factory: Callable[[], AsyncSession] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._lock: asyncio.Lock | None = None
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        self._session_factory = session_factory
+        self._lock = asyncio.Lock()
+
+    async def stop(self) -> None:
+        self._session_factory = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def observe(self, statement: str, params: Sequence[Any], duration: float) -> None:
+        if duration < self._threshold:
+            return
+        entry: dict[str, Any] = {
+            "statement": " ".join(statement.split()),
+            "params": [repr(param)[:200] for param in params],
+            "duration_ms": round(duration * 1000, 1),
+            "captured_at": int(time.time()),
+            "plan": None,
+            "error": None,
+        }
+        self._entries.append(entry)
+        if self._should_explain(statement):
+            task = asyncio.get_running_loop().create_task(
+                self._explain(entry, statement, tuple(params))
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def entries(self) -> list[dict[str, Any]]:
+        return list(reversed(self._entries))
+
+    def _should_explain(self, statement: str) -> bool:
+        if self._session_factory is None:
+            return False
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return False
+        now = time.monotonic()
+        if now - self._last_explained.get(statement, -self._cooldown) < self._cooldown:
+            return False
+        self._last_explained[statement] = now
+        return True
+
+    async def _explain(
+        self, entry: dict[str, Any], statement: str, params: tuple[Any, ...]
+    ) -> None:
+        if self._session_factory is None or self._lock is None:
+            return
+        async with self._lock:
+            try:
+                async with self._session_factory() as session:
+                    connection = await session.connection()
+                    raw = await connection.get_raw_connection()
+                    driver = raw.driver_connection
+                    async with driver.transaction(readonly=True):  # type: ignore[union-attr]
+                        await driver.execute(  # type: ignore[union-attr]
+                            f"SET LOCAL statement_timeout = {int(self._threshold * 1000) * 10}"
+                        )
+                        rows = await driver.fetch(  # type: ignore[union-attr]
+                            f"EXPLAIN (ANALYZE, BUFFERS) {statement}", *params
+                        )
+                entry["plan"] = "\n".join(row[0] for row in rows)
+            except Exception as e:
+                entry["error"] = str(e)
+
+
+slow_query_recorder = SlowQueryRecorder(
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    settings.SLOW_QUERY_CAPACITY,
+    settings.SLOW_QUERY_COOLDOWN_SECONDS,
+)
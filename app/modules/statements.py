@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from typing import Iterator
+
+from sqlalchemy.sql import text
+from sqlalchemy.sql.elements import TextClause
+
+from app.modules.fast_query import to_positional
+
+
+class Statement:
+    """SQL nomeado, montado uma única vez por processo.
+
+    Guarda o `text()` para o SQLAlchemy e a forma posicional (`$n`) para o
+    asyncpg. Filtros opcionais entram como parâmetros
+    (`CAST(:x AS TEXT) IS NULL OR ...`), nunca como variações do texto, então
+    cada consulta tem uma única instrução preparada por conexão.
+    """
+
+    def __init__(self, name: str, sql: str) -> None:
+        self.name = name
+        self.sql = sql
+        self.clause: TextClause = text(sql)
+        self.positional, self.params = to_positional(sql)
+
+
+class StatementRegistry:
+    def __init__(self) -> None:
+        self._statements: dict[str, Statement] = {}
+
+    def register(self, name: str, sql: str) -> Statement:
+        if name in self._statements:
+            raise ValueError(f"Instrução {name} já registrada")
+        statement = Statement(name, sql)
+        self._statements[name] = statement
+        return statement
+
+    def __getitem__(self, name: str) -> Statement:
+        return self._statements[name]
+
+    def __iter__(self) -> Iterator[Statement]:
+        return iter(self._statements.values())
+
+
+statements = StatementRegistry()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependency.database import Database
+from app.modules.basic_response import BasicResponse
+from app.modules.security import password_executor
+from app.modules.slow_queries import slow_query_recorder
+from app.schemas.admin import (
+    AlertBackfillJob,
+    PasswordHashStats,
+    PoolStats,
+    ServiceMetrics,
+    SlowQuery,
+)
+from app.service.alert_backfill import AlertBackfillService
+
+
+class AdminController:
+    @staticmethod
+    async def get_metrics() -> BasicResponse[ServiceMetrics]:
+        try:
+            metrics = ServiceMetrics(
+                database=PoolStats(**Database().pool_stats()),
+                password_hash=PasswordHashStats(**password_executor.stats()),
+            )
+            return BasicResponse[ServiceMetrics](data=metrics)
+        except Exception as e:
+            raise e
+
+    @staticmethod
+    async def get_slow_queries() -> BasicResponse[list[SlowQuery]]:
+        try:
+            entries = [SlowQuery(**entry) for entry in slow_query_recorder.entries()]
+            return BasicResponse[list[SlowQuery]](data=entries)
+        except Exception as e:
+            raise e
+
+    @staticmethod
+    async def get_alert_backfills(
+        session: AsyncSession, limit: int
+    ) -> BasicResponse[list[AlertBackfillJob]]:
+        try:
+            jobs = await AlertBackfillService(session).list_jobs(limit)
+            return BasicResponse[list[AlertBackfillJob]](
+                data=[AlertBackfillJob(**job) for job in jobs]
+            )
+        except Exception as e:
+            raise e
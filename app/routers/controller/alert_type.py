@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.basic_response import BasicResponse
 from app.schemas.alert_type_schema import (
+    AlertSimulationResponse,
     AlertTypeCreate,
     AlertTypeResponse,
+    AlertTypeSimulation,
     AlertTypeUpdate,
 )
 from app.service.alert_type import AlertTypeService
@@ -75,6 +77,21 @@ class AlertTypeController:
                 detail="Erro interno no servidor, tente novamente mais tarde.",
             )
 
+    async def simulate_alert_type(
+        self, simulation: AlertTypeSimulation
+    ) -> BasicResponse[AlertSimulationResponse]:
+        try:
+            result = await self._service.simulate_alert_type(simulation)
+            return BasicResponse[AlertSimulationResponse](data=result)
+        except HTTPException as http_ex:
+            raise http_ex
+        except Exception as e:
+            print(f"Erro ao simular tipo de alerta: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno no servidor, tente novamente mais tarde.",
+            )
+
     async def delete_alert_type(self, alert_type_id: int) -> BasicResponse[None]:
         try:
             await self._service.delete_alert_type(alert_type_id)
@@ -2,7 +2,8 @@
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.auth import Token
+from app.modules.basic_response import BasicResponse
+from app.schemas.auth import RefreshTokenRequest, Token
 from app.service.auth import AuthService
 
 
@@ -19,3 +20,16 @@ class AuthController:
             return await self._service_auth.login(form_data)
         except Exception as e:
             raise e
+
+    async def refresh(self, data: RefreshTokenRequest) -> Token:
+        try:
+            return await self._service_auth.refresh(data.refresh_token)
+        except Exception as e:
+            raise e
+
+    async def logout(self, data: RefreshTokenRequest) -> BasicResponse[None]:
+        try:
+            await self._service_auth.logout(data.refresh_token)
+            return BasicResponse[None](data=None)
+        except Exception as e:
+            raise e
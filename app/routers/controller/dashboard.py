@@ -1,11 +1,20 @@
-from fastapi import HTTPException, status
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.basic_response import BasicResponse
+from app.modules.arrow import STATION_HISTORY_SCHEMA, arrow_response
+from app.modules.basic_response import BasicResponse, CursorResponse
+from app.modules.export import csv_header, export_error, rows_to_csv, rows_to_ndjson
+from app.modules.fast_query import records_to_models
 from app.schemas.dashboard import (
     AlertCounts,
     AlertTypeDistributionItem,
+    DashboardSummary,
     MeasuresStatusItem,
+    StationExportFilter,
+    StationHistoryFilter,
     StationHistoryItem,
     StationStatus,
 )
@@ -17,11 +26,19 @@ class DashboardController:
         self._service = DashboardService(session)
 
     async def get_station_history(
-        self, station_id: int, start_date: str | None = None, end_date: str | None = None
-    ) -> BasicResponse[list[StationHistoryItem]]:
+        self, station_id: int, filters: StationHistoryFilter, as_arrow: bool = False
+    ) -> CursorResponse[list[StationHistoryItem]] | Response:
         try:
-            data = await self._service.get_station_history(station_id, start_date, end_date)
-            return BasicResponse(data=[StationHistoryItem(**row._asdict()) for row in data])
+            data, next_cursor = await self._service.get_station_history(station_id, filters)
+            if as_arrow:
+                headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+                return arrow_response(data, STATION_HISTORY_SCHEMA, headers)
+            return CursorResponse(
+                data=records_to_models(StationHistoryItem, data),
+                next_cursor=next_cursor,
+            )
+        except HTTPException as e:
+            raise e
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -65,6 +82,18 @@ class DashboardController:
                 detail=f"Erro ao buscar status das estações: {str(e)}",
             )
 
+    async def get_summary(
+        self, station_id: int | None = None
+    ) -> BasicResponse[DashboardSummary]:
+        try:
+            data = await self._service.get_summary(station_id)
+            return BasicResponse(data=DashboardSummary(**data))
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erro ao buscar resumo do dashboard: {str(e)}",
+            )
+
     async def get_measures_status(self) -> BasicResponse[list[MeasuresStatusItem]]:
         try:
             data = await self._service.get_measures_status()
@@ -78,13 +107,66 @@ class DashboardController:
             )
 
     async def get_last_measures(
-        self, station_id: int
-    ) -> BasicResponse[list[StationHistoryItem]]:
+        self, station_id: int, as_arrow: bool = False
+    ) -> BasicResponse[list[StationHistoryItem]] | Response:
         try:
             data = await self._service.get_last_measures(station_id)
+            if as_arrow:
+                return arrow_response(data, STATION_HISTORY_SCHEMA)
             return BasicResponse(data=[StationHistoryItem(**row._asdict()) for row in data])
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erro ao buscar últimas medidas dashboard: {str(e)}",
             )
+
+
+class DashboardExportController:
+    COLUMNS = (
+        "measure_date",
+        "title",
+        "value",
+        "min_value",
+        "max_value",
+        "measure_unit",
+        "type",
+    )
+    MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    def export_station_history(
+        self, station_id: int, filters: StationExportFilter
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            self._stream(station_id, filters),
+            media_type=self.MEDIA_TYPES[filters.format],
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="station-{station_id}.{filters.format}"'
+                )
+            },
+        )
+
+    async def _stream(
+        self, station_id: int, filters: StationExportFilter
+    ) -> AsyncIterator[str]:
+        # A sessão vem de `streaming_read_session` e é fechada aqui: as
+        # dependências com `yield` do FastAPI terminam antes do corpo ser enviado.
+        if filters.format == "csv":
+            yield csv_header(self.COLUMNS)
+        async with self._session as session:
+            try:
+                service = DashboardService(session)
+                async for rows in service.stream_station_history(station_id, filters):
+                    if filters.format == "csv":
+                        yield rows_to_csv(rows)
+                    else:
+                        yield rows_to_ndjson(rows, self.COLUMNS)
+            except Exception as e:
+                # O status 200 já foi enviado: marca o arquivo como incompleto e
+                # relança para abortar a conexão sem o fim normal do corpo.
+                print(f"Erro ao exportar histórico da estação {station_id}: {e}")
+                yield export_error(filters.format, "Exportação interrompida")
+                raise
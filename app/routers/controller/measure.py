@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.basic_response import BasicResponse
+from app.schemas.measure import IngestReport
+from app.service.measure_ingest import MeasureIngestService
+
+
+class MeasureController:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._service = MeasureIngestService(session)
+
+    async def ingest(self, body: AsyncIterator[bytes]) -> BasicResponse[IngestReport]:
+        try:
+            report = await self._service.ingest(body)
+            return BasicResponse[IngestReport](data=report)
+        except HTTPException as http_ex:
+            await self._session.rollback()
+            raise http_ex
+        except Exception as e:
+            await self._session.rollback()
+            print(f"Erro ao importar medidas: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno no servidor, tente novamente mais tarde.",
+            )
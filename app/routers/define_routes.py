@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 from fastapi import FastAPI
 
+from app.routers.router.admin import router as router_admin
 from app.routers.router.alert import router_alert
 from app.routers.router.alert_type import router as router_alert_type
 from app.routers.router.auth import router as router_auth
 from app.routers.router.dashboard import router as router_dashboard
+from app.routers.router.measure import router as router_measure
 from app.routers.router.parameter_type import router as router_parameter_type
 from app.routers.router.user import router as router_user
 from app.routers.router.weather_station import router as router_weather_station
@@ -18,3 +20,5 @@ def define_routes(app: FastAPI) -> None:
     app.include_router(router_auth)
     app.include_router(router_alert)
     app.include_router(router_dashboard)
+    app.include_router(router_admin)
+    app.include_router(router_measure)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependency.auth import AuthManager
+from app.dependency.database import SessionConnection, SessionReleasingRoute
+from app.modules.basic_response import BasicResponse
+from app.routers.controller.admin import AdminController
+from app.schemas.admin import AlertBackfillJob, ServiceMetrics, SlowQuery
+from app.schemas.user import UserResponse
+
+router = APIRouter(tags=["Administração"], prefix="/admin", route_class=SessionReleasingRoute)
+
+
+@router.get("/metrics")
+async def get_metrics(
+    user: UserResponse = Depends(AuthManager.has_authorization),
+) -> BasicResponse[ServiceMetrics]:
+    return await AdminController.get_metrics()
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    user: UserResponse = Depends(AuthManager.has_authorization),
+) -> BasicResponse[list[SlowQuery]]:
+    return await AdminController.get_slow_queries()
+
+
+@router.get("/alert-backfills")
+async def get_alert_backfills(
+    limit: int = Query(20, ge=1, le=200),
+    session: AsyncSession = Depends(SessionConnection.session),
+    user: UserResponse = Depends(AuthManager.has_authorization),
+) -> BasicResponse[list[AlertBackfillJob]]:
+    return await AdminController.get_alert_backfills(session, limit)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependency.auth import AuthManager
-from app.dependency.database import SessionConnection
+from app.dependency.database import SessionConnection, SessionReleasingRoute
 from app.modules.basic_response import BasicResponse
 from app.routers.controller.alert import AlertController
 from app.schemas.alert import (
@@ -11,13 +11,13 @@ from app.schemas.alert import (
     AlertResponse,
 )
 
-router_alert = APIRouter(tags=["Alertas"], prefix="/alert")
+router_alert = APIRouter(tags=["Alertas"], prefix="/alert", route_class=SessionReleasingRoute)
 
 
 @router_alert.get("/all")
 async def get_filtered_alerts(
     filters: AlertFilterSchema = Query(),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[AlertResponse]]:
     return await AlertController(session).get_filtered_alerts(filters)
 
@@ -33,6 +33,6 @@ async def read_alert(
 @router_alert.get("/{alert_id}")
 async def get_alert_by_id(
     alert_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[AlertResponse]:
     return await AlertController(session).get_alert_by_id(alert_id)
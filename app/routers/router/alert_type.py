@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependency.auth import AuthManager
-from app.dependency.database import SessionConnection
+from app.dependency.database import SessionConnection, SessionReleasingRoute
 from app.modules.basic_response import BasicResponse
 from app.routers.controller.alert_type import AlertTypeController
 from app.schemas.alert_type_schema import (
+    AlertSimulationResponse,
     AlertTypeCreate,
     AlertTypeResponse,
+    AlertTypeSimulation,
     AlertTypeUpdate,
 )
 
@@ -16,6 +18,7 @@ router = APIRouter(
     tags=["Tipos de alerta"],
     prefix="/alert_type",
     dependencies=[Depends(AuthManager.has_authorization)],
+    route_class=SessionReleasingRoute,
 )
 
 
@@ -30,14 +33,22 @@ async def create_alert_type(
 @router.get("/")
 async def list_alert_types(
     filters: bool = True,
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[AlertTypeResponse]]:
     return await AlertTypeController(session).list_alert_types(filters)
 
 
+@router.get("/simulate")
+async def simulate_alert_type(
+    simulation: AlertTypeSimulation = Query(),
+    session: AsyncSession = Depends(SessionConnection.read_session),
+) -> BasicResponse[AlertSimulationResponse]:
+    return await AlertTypeController(session).simulate_alert_type(simulation)
+
+
 @router.get("/{alert_type_id}")
 async def get_alert_type(
-    alert_type_id: int, session: AsyncSession = Depends(SessionConnection.session)
+    alert_type_id: int, session: AsyncSession = Depends(SessionConnection.read_session)
 ) -> BasicResponse[AlertTypeResponse]:
     return await AlertTypeController(session).get_alert_type(alert_type_id)
 
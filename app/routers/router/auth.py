@@ -3,11 +3,12 @@ from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependency.database import SessionConnection
+from app.dependency.database import SessionConnection, SessionReleasingRoute
+from app.modules.basic_response import BasicResponse
 from app.routers.controller.auth import AuthController
-from app.schemas.auth import Token
+from app.schemas.auth import RefreshTokenRequest, Token
 
-router = APIRouter(tags=["auth"], prefix="/auth")
+router = APIRouter(tags=["auth"], prefix="/auth", route_class=SessionReleasingRoute)
 
 
 @router.post("/login")
@@ -16,3 +17,19 @@ async def login(
     session: AsyncSession = Depends(SessionConnection.session),
 ) -> Token:
     return await AuthController(session).login(form_data)
+
+
+@router.post("/refresh")
+async def refresh(
+    data: RefreshTokenRequest,
+    session: AsyncSession = Depends(SessionConnection.session),
+) -> Token:
+    return await AuthController(session).refresh(data)
+
+
+@router.post("/logout")
+async def logout(
+    data: RefreshTokenRequest,
+    session: AsyncSession = Depends(SessionConnection.session),
+) -> BasicResponse[None]:
+    return await AuthController(session).logout(data)
@@ -1,60 +1,87 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependency.database import SessionConnection
-from app.modules.basic_response import BasicResponse
-from app.routers.controller.dashboard import DashboardController
+from app.dependency.database import SessionConnection, SessionReleasingRoute
+from app.modules.arrow import accepts_arrow
+from app.modules.basic_response import BasicResponse, CursorResponse
+from app.modules.query_budget import query_budget
+from app.routers.controller.dashboard import DashboardController, DashboardExportController
 from app.schemas.dashboard import (
     AlertCounts,
     AlertTypeDistributionItem,
+    DashboardSummary,
     MeasuresStatusItem,
+    StationExportFilter,
+    StationHistoryFilter,
     StationHistoryItem,
     StationStatus,
 )
 
-router = APIRouter(tags=["Dashboard"], prefix="/dashboard")
+router = APIRouter(tags=["Dashboard"], prefix="/dashboard", route_class=SessionReleasingRoute)
 
 
 @router.get(
-    "/station-history/{station_id}", response_model=BasicResponse[list[StationHistoryItem]]
+    "/station-history/{station_id}", response_model=CursorResponse[list[StationHistoryItem]]
 )
 async def get_station_history(
+    request: Request,
     station_id: int,
-    startDate: str | None = Query(default=None, description="Data de início da filtragem"),
-    endDate: str | None = Query(default=None, description="Data de fim da filtragem"),
-    session: AsyncSession = Depends(SessionConnection.session),
-) -> BasicResponse[list[StationHistoryItem]]:
+    filters: StationHistoryFilter = Query(),
+    session: AsyncSession = Depends(SessionConnection.read_session),
+) -> CursorResponse[list[StationHistoryItem]] | Response:
     return await DashboardController(session).get_station_history(
-        station_id, startDate, endDate
+        station_id, filters, accepts_arrow(request)
     )
 
 
+@router.get("/station-history/{station_id}/export")
+async def export_station_history(
+    station_id: int,
+    filters: StationExportFilter = Query(),
+    session: AsyncSession = Depends(SessionConnection.streaming_read_session),
+) -> StreamingResponse:
+    return DashboardExportController(session).export_station_history(station_id, filters)
+
+
 @router.get("/alert-types", response_model=BasicResponse[list[AlertTypeDistributionItem]])
 async def get_alert_type_distribution(
     station_id: int | None = Query(default=None, description="ID da estação"),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[AlertTypeDistributionItem]]:
     return await DashboardController(session).get_alert_type_distribution(station_id)
 
 
 @router.get("/alert-counts", response_model=BasicResponse[AlertCounts])
+@query_budget(2)
 async def get_alert_counts(
     station_id: int | None = Query(default=None, description="ID da estação"),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[AlertCounts]:
     return await DashboardController(session).get_alert_counts(station_id)
 
 
 @router.get("/station-status", response_model=BasicResponse[StationStatus])
+@query_budget(2)
 async def get_station_status(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[StationStatus]:
     return await DashboardController(session).get_station_status()
 
 
+@router.get("/summary", response_model=BasicResponse[DashboardSummary])
+@query_budget(2)
+async def get_summary(
+    station_id: int | None = Query(default=None, description="ID da estação"),
+    session: AsyncSession = Depends(SessionConnection.read_session),
+) -> BasicResponse[DashboardSummary]:
+    return await DashboardController(session).get_summary(station_id)
+
+
 @router.get("/measures-status", response_model=BasicResponse[list[MeasuresStatusItem]])
+@query_budget(2)
 async def get_measures_status(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[MeasuresStatusItem]]:
     return await DashboardController(session).get_measures_status()
 
@@ -63,7 +90,10 @@ async def get_measures_status(
     "/last-measures/{station_id}", response_model=BasicResponse[list[StationHistoryItem]]
 )
 async def get_last_measures(
+    request: Request,
     station_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
-) -> BasicResponse[list[StationHistoryItem]]:
-    return await DashboardController(session).get_last_measures(station_id)
+    session: AsyncSession = Depends(SessionConnection.read_session),
+) -> BasicResponse[list[StationHistoryItem]] | Response:
+    return await DashboardController(session).get_last_measures(
+        station_id, accepts_arrow(request)
+    )
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependency.auth import AuthManager
+from app.dependency.database import SessionConnection, SessionReleasingRoute
+from app.modules.basic_response import BasicResponse
+from app.routers.controller.measure import MeasureController
+from app.schemas.measure import IngestReport
+
+router = APIRouter(
+    tags=["Medidas"],
+    prefix="/measures",
+    dependencies=[Depends(AuthManager.has_authorization)],
+    route_class=SessionReleasingRoute,
+)
+
+
+@router.post(
+    "/ingest",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+            "required": True,
+        }
+    },
+)
+async def ingest_measures(
+    request: Request,
+    session: AsyncSession = Depends(SessionConnection.session),
+) -> BasicResponse[IngestReport]:
+    return await MeasureController(session).ingest(request.stream())
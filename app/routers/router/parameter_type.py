@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependency.database import SessionConnection
+from app.dependency.database import SessionConnection, SessionReleasingRoute
 from app.modules.basic_response import BasicResponse
 from app.routers.controller.parameter_type import ParameterTypeController
 from app.schemas.parameter_type import (
@@ -11,7 +11,9 @@ from app.schemas.parameter_type import (
     UpdateParameterType,
 )
 
-router = APIRouter(tags=["Parameter Types"], prefix="/parameter_types")
+router = APIRouter(
+    tags=["Parameter Types"], prefix="/parameter_types", route_class=SessionReleasingRoute
+)
 
 
 @router.post("/")
@@ -25,7 +27,7 @@ async def create_parameter_type(
 @router.get("/")
 async def list_parameter_types(
     filters: FilterParameterType = Query(),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[ParameterTypeResponse]]:
     return await ParameterTypeController(session).list_parameter_types(filters)
 
@@ -41,7 +43,7 @@ async def delete_parameter_type(
 @router.get("/{parameter_type_id}")
 async def get_parameter_type(
     parameter_type_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[ParameterTypeResponse]:
     return await ParameterTypeController(session).get_parameter_type(parameter_type_id)
 
@@ -2,12 +2,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependency.auth import AuthManager
-from app.dependency.database import SessionConnection
+from app.dependency.database import SessionConnection, SessionReleasingRoute
 from app.modules.basic_response import BasicResponse
 from app.routers.controller.user import UserController
 from app.schemas.user import UserResponse
 
-router = APIRouter(tags=["Usuários"], prefix="/user")
+router = APIRouter(tags=["Usuários"], prefix="/user", route_class=SessionReleasingRoute)
 
 
 @router.get("/")
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Body, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependency.auth import AuthManager
-from app.dependency.database import SessionConnection
+from app.dependency.database import SessionConnection, SessionReleasingRoute
 from app.modules.basic_response import BasicResponse
 from app.routers.controller.weather_station import WeatherStationController
 from app.schemas.user import UserResponse
@@ -19,6 +19,7 @@ from app.schemas.weather_station import (
 router = APIRouter(
     tags=["Weather Stations"],
     prefix="/stations",
+    route_class=SessionReleasingRoute,
 )
 
 
@@ -34,7 +35,7 @@ async def create_station(
 @router.get("/filters")
 async def get_filtered_stations(
     filters: FilterWeatherStation = Query(),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[WeatherStationResponse]]:
     return await WeatherStationController(session).get_stations_by_filters(filters)
 
@@ -42,7 +43,7 @@ async def get_filtered_stations(
 @router.get("/parameters/{type_parameter_id}")
 async def get_parameters_by_station(
     type_paramter_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[PameterByStation]]:
     return await WeatherStationController(session).get_parameter_by_station(type_paramter_id)
 
@@ -50,7 +51,7 @@ async def get_parameters_by_station(
 @router.get("/{station_id}")
 async def get_station_by_id(
     station_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[WeatherStationResponseList]:
     return await WeatherStationController(session).get_stations_by_id(station_id)
 
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    connect_errors: int
+    wait_count: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
+class PasswordHashStats(BaseModel):
+    max_workers: int
+    max_pending: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+
+
+class ServiceMetrics(BaseModel):
+    database: PoolStats
+    password_hash: PasswordHashStats
+
+
+class SlowQuery(BaseModel):
+    statement: str
+    params: list[str]
+    duration_ms: float
+    captured_at: int
+    plan: str | None = None
+    error: str | None = None
+
+
+class AlertBackfillJob(BaseModel):
+    id: int
+    type_alert_id: int
+    status: str
+    window_start: int
+    total: int
+    processed: int
+    created: int
+    removed: int
+    error: str | None = None
+    create_date: int
+    last_update: int
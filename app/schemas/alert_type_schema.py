@@ -1,21 +1,54 @@
 # -*- coding: utf-8 -*-
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
+RuleKind = Literal["threshold", "rate_of_change", "sustained", "zscore"]
 
-class AlertTypeCreate(BaseModel):
+
+class StatefulRuleFields(BaseModel):
+    kind: RuleKind | None = Field(
+        default=None,
+        description=(
+            "threshold: valor comparado ao limite; rate_of_change: variação em relação"
+            " à leitura de window_seconds atrás;"
+            " sustained: condição mantida pela janela; zscore: desvio padronizado"
+        ),
+    )
+    window_seconds: int | None = Field(
+        default=None, ge=1, description="Janela das regras rate_of_change e sustained"
+    )
+
+    value: float | None = Field(
+        default=None, description="Limite; fracionário só em regras com estado"
+    )
+
+    @model_validator(mode="after")
+    def check_window(self) -> "StatefulRuleFields":
+        if self.kind in {"rate_of_change", "sustained"} and self.window_seconds is None:
+            raise ValueError(f"window_seconds é obrigatório para regras {self.kind}")
+        if (
+            self.kind == "threshold"
+            and self.value is not None
+            and not float(self.value).is_integer()
+        ):
+            raise ValueError("value deve ser inteiro em regras threshold")
+        return self
+
+
+class AlertTypeCreate(StatefulRuleFields):
     parameter_id: int | None = None
     name: str
-    value: int
+    value: float
     math_signal: str
     status: str | None = None
+    kind: RuleKind | None = "threshold"
 
 
-class AlertTypeUpdate(BaseModel):
+class AlertTypeUpdate(StatefulRuleFields):
     parameter_id: int | None = None
     name: str | None = None
-    value: int | None = None
     math_signal: str | None = None
     status: str | None = None
     is_active: bool | None = None
@@ -26,13 +59,36 @@ class AlertTypeResponse(BaseModel):
     id: int
     parameter_id: int | None = None
     name: str
-    value: int
+    value: float
     math_signal: str
     status: str | None | None
     is_active: bool
     create_date: int
     last_update: datetime
+    kind: RuleKind = "threshold"
+    window_seconds: int | None = None
 
     model_config = {
         "from_attributes": True,
     }
+
+
+class AlertTypeSimulation(BaseModel):
+    parameter_id: int
+    value: int
+    math_signal: Literal[">", ">=", "<", "<=", "=", "==", "!=", "<>"]
+    months: int = Field(
+        default=3, ge=1, le=24, description="Meses de histórico avaliados (30 dias cada)"
+    )
+
+
+class AlertSimulationDay(BaseModel):
+    day: date
+    alerts: int
+
+
+class AlertSimulationResponse(BaseModel):
+    readings: int
+    alerts: int
+    days: list[AlertSimulationDay]
+    samples: list[datetime]
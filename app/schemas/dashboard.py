@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class StationHistoryItem(BaseModel):
@@ -7,6 +9,8 @@ class StationHistoryItem(BaseModel):
     measure_unit: str
     measure_date: int
     type: str
+    min_value: float | None = None
+    max_value: float | None = None
 
 
 class AlertTypeDistributionItem(BaseModel):
@@ -28,3 +32,62 @@ class StationStatus(BaseModel):
 class MeasuresStatusItem(BaseModel):
     label: str
     number: int
+
+
+class DashboardSummary(BaseModel):
+    alert_counts: AlertCounts
+    alert_types: list[AlertTypeDistributionItem]
+    station_status: StationStatus
+    measures_status: list[MeasuresStatusItem]
+
+
+class StationHistoryRange(BaseModel):
+    model_config = {"populate_by_name": True}
+
+    start_date: str | None = Field(
+        default=None, alias="startDate", description="Data de início da filtragem"
+    )
+    end_date: str | None = Field(
+        default=None, alias="endDate", description="Data de fim da filtragem"
+    )
+    resolution: Literal["auto", "raw", "hour", "day"] = Field(
+        default="auto",
+        description="Fonte dos dados: brutos, rollup horário, diário ou automática",
+    )
+
+
+class StationHistoryFilter(StationHistoryRange):
+    max_points: int | None = Field(
+        default=None,
+        alias="maxPoints",
+        ge=1,
+        le=10000,
+        description="Número máximo de pontos por tipo de parâmetro (agrega por intervalo)",
+    )
+    limit: int | None = Field(
+        default=None,
+        ge=1,
+        le=5000,
+        description=(
+            "Quantidade de registros por página (padrão HISTORY_PAGE_SIZE). Mesmo sem"
+            " `limit` a resposta é paginada: siga `next_cursor` até ele vir nulo, ou"
+            " use /export para o intervalo inteiro"
+        ),
+    )
+    cursor: str | None = Field(
+        default=None,
+        description=(
+            "Cursor `next_cursor` retornado pela página anterior; mantém a resolução"
+            " escolhida na primeira página"
+        ),
+    )
+
+
+class StationExportFilter(StationHistoryRange):
+    resolution: Literal["auto", "raw", "hour", "day"] = Field(
+        default="raw",
+        description="Fonte dos dados: brutos, rollup horário, diário ou automática",
+    )
+    format: Literal["ndjson", "csv"] = Field(
+        default="ndjson", description="Formato do arquivo exportado"
+    )
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from pydantic import BaseModel
+
+
+class IngestError(BaseModel):
+    line: int
+    error: str
+
+
+class IngestBatchReport(BaseModel):
+    batch: int
+    accepted: int
+    rejected: int
+    alerts: int = 0
+    errors: list[IngestError] = []
+
+
+class IngestReport(BaseModel):
+    accepted: int
+    rejected: int
+    alerts: int = 0
+    batches: list[IngestBatchReport]
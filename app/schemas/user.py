@@ -10,6 +10,7 @@ class UserResponse(BaseModel):
     password: str
     email: str
     last_update: datetime
+    is_active: bool = True
 
 
 class UserViewResponse(BaseModel):
@@ -5,11 +5,38 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 
 from app.core.models.db_model import Alert
+from app.modules.fast_query import fetch_records, records_to_models
+from app.modules.statements import statements
 from app.schemas.alert import (
     AlertFilterSchema,
     AlertResponse,
 )
 
+LIST_UNREAD_ALERTS = statements.register(
+    "alert.list_unread",
+    """
+    SELECT
+        a.id,
+        m.value AS measure_value,
+        ws."name" AS station_name,
+        ta."name" AS type_alert_name,
+        to_timestamp(a.create_date) AS create_date
+    FROM alerts a
+    JOIN measures m
+        ON m.id = a.measure_id
+    JOIN type_alerts ta
+        ON ta.id = a.type_alert_id
+    JOIN parameters p
+        ON ta.parameter_id = p.id
+    JOIN weather_stations ws
+        ON ws.id = p.station_id
+    WHERE ta.is_active = true
+    AND a.is_read = false
+    AND (CAST(:type_alert_name AS TEXT) IS NULL OR ta.name ILIKE :type_alert_name)
+    AND (CAST(:station_name AS TEXT) IS NULL OR ws.name ILIKE :station_name)
+    """,
+)
+
 
 class AlertService:
     def __init__(self, session: AsyncSession) -> None:
@@ -27,42 +54,16 @@ class AlertService:
     async def _buscar_alertas_com_filtros(
         self, filters: AlertFilterSchema | None = None
     ) -> list[AlertResponse]:
-        query_sql = text(
-            f"""
-            SELECT
-                a.id,
-                m.value AS measure_value,
-                ws."name" AS station_name,
-                ta."name" AS type_alert_name,
-                to_timestamp(a.create_date) AS create_date
-            FROM alerts a
-            JOIN measures m
-                ON m.id = a.measure_id
-            JOIN type_alerts ta
-                ON ta.id = a.type_alert_id
-            JOIN parameters p
-                ON ta.parameter_id = p.id
-            JOIN weather_stations ws
-                ON ws.id = p.station_id
-            WHERE 1=1
-            AND ta.is_active = true
-            AND a.is_read = false
-            {
-                "AND ta.name ILIKE :type_alert_name"
-                if filters and filters.type_alert_name
-                else ""
-            }
-            {"AND ws.name ILIKE :station_name" if filters and filters.station_name else ""}
-            """
-        )
-        if filters and filters.type_alert_name:
-            query_sql = query_sql.bindparams(type_alert_name=f"%{filters.type_alert_name}%")
-        if filters and filters.station_name:
-            query_sql = query_sql.bindparams(station_name=f"%{filters.station_name}%")
-
-        result = await self._session.execute(query_sql)
-        alerts = result.fetchall()
-        return [AlertResponse(**alert._asdict()) for alert in alerts]
+        params = {
+            "type_alert_name": (
+                f"%{filters.type_alert_name}%" if filters and filters.type_alert_name else None
+            ),
+            "station_name": (
+                f"%{filters.station_name}%" if filters and filters.station_name else None
+            ),
+        }
+        alerts = await fetch_records(self._session, LIST_UNREAD_ALERTS, params)
+        return records_to_models(AlertResponse, alerts)
 
     async def get_alert_by_id(
         self, alert_id: int
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from app.config.settings import settings
+from app.dependency.database import Database
+
+# SQLSTATE `lock_not_available`, levantado quando `lock_timeout` estoura.
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Mesma condição de disparo de `alert_engine.OPERATORS`, avaliada no banco.
+VIOLATES = """
+    CASE ta.math_signal
+        WHEN '>' THEN c.value > ta.value
+        WHEN '>=' THEN c.value >= ta.value
+        WHEN '<' THEN c.value < ta.value
+        WHEN '<=' THEN c.value <= ta.value
+        WHEN '=' THEN c.value = ta.value
+        WHEN '==' THEN c.value = ta.value
+        WHEN '!=' THEN c.value <> ta.value
+        WHEN '<>' THEN c.value <> ta.value
+        ELSE false
+    END
+"""
+
+
+class AlertBackfillService:
+    """Reavalia o histórico de um tipo de alerta depois que a regra muda.
+
+    O trabalho anda em blocos pela chave (measure_date, id) das medidas do
+    parâmetro, dentro da janela configurada. Cada bloco é uma transação curta que
+    cria os alertas que passaram a disparar, remove os alertas não lidos que
+    deixaram de disparar e grava o checkpoint; depois de um reinício o job
+    continua do último bloco confirmado.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self.job_id: int | None = None
+
+    async def enqueue(self, type_alert_id: int) -> None:
+        """Agenda a reavaliação; um job ainda ativo do mesmo tipo é substituído.
+
+        Não confirma a transação: quem chama grava junto com a mudança da regra.
+        """
+        now = int(time.time())
+        window_start = now - settings.ALERT_BACKFILL_WINDOW_DAYS * 24 * 60 * 60
+        await self._session.execute(
+            text("""
+                UPDATE alert_backfill_jobs
+                SET status = 'superseded', last_update = :now
+                WHERE type_alert_id = :type_alert_id AND status IN ('pending', 'running')
+            """),
+            {"type_alert_id": type_alert_id, "now": now},
+        )
+        # Os blocos só andam pelo parâmetro atual da regra: os alertas não lidos
+        # de medidas de um parâmetro anterior são removidos aqui, na mesma janela.
+        await self._session.execute(
+            text("""
+                WITH removed AS (
+                    DELETE FROM alerts a
+                    USING measures m, type_alerts ta
+                    WHERE a.type_alert_id = :type_alert_id
+                    AND a.is_read = false
+                    AND m.id = a.measure_id
+                    AND ta.id = a.type_alert_id
+                    AND m.parameter_id <> ta.parameter_id
+                    AND m.measure_date >= :window_start
+                    RETURNING 1
+                )
+                INSERT INTO alert_backfill_jobs (
+                    type_alert_id, window_start, total, removed, create_date, last_update
+                )
+                SELECT
+                    :type_alert_id, :window_start, COUNT(m.id),
+                    (SELECT COUNT(*) FROM removed), :now, :now
+                FROM type_alerts ta
+                LEFT JOIN measures m
+                    ON m.parameter_id = ta.parameter_id AND m.measure_date >= :window_start
+                WHERE ta.id = :type_alert_id
+            """),
+            {"type_alert_id": type_alert_id, "window_start": window_start, "now": now},
+        )
+
+    async def run_chunk(self, chunk_size: int) -> bool:
+        """Processa um bloco do job ativo mais antigo; retorna False se não há trabalho."""
+        # Uma falha antes de escolher o job não pode ser atribuída ao job anterior.
+        self.job_id = None
+        await self._session.execute(
+            text("SELECT set_config('lock_timeout', :timeout, true)"),
+            {"timeout": f"{settings.ALERT_BACKFILL_LOCK_TIMEOUT_MS}ms"},
+        )
+        result = await self._session.execute(
+            text("""
+                SELECT j.id, j.type_alert_id, j.window_start,
+                    j.last_measure_date, j.last_measure_id,
+                    ta.parameter_id, ta.is_active, sr.kind
+                FROM alert_backfill_jobs j
+                LEFT JOIN type_alerts ta ON ta.id = j.type_alert_id
+                LEFT JOIN alert_stateful_rules sr ON sr.type_alert_id = j.type_alert_id
+                WHERE j.status IN ('pending', 'running')
+                ORDER BY j.id
+                LIMIT 1
+                FOR UPDATE OF j SKIP LOCKED
+            """)
+        )
+        job = result.fetchone()
+        if job is None:
+            await self._session.rollback()
+            return False
+        self.job_id = job.id
+
+        # Regras com estado dependem da ordem das leituras e não são reavaliadas.
+        if job.parameter_id is None or not job.is_active or job.kind is not None:
+            await self._finish(job.id, "done")
+            return True
+
+        result = await self._session.execute(
+            text(f"""
+                WITH chunk AS (
+                    SELECT m.id, m.measure_date, m.value
+                    FROM measures m
+                    WHERE m.parameter_id = :parameter_id
+                    AND m.measure_date >= :window_start
+                    AND (
+                        CAST(:last_date AS BIGINT) IS NULL
+                        OR (m.measure_date, m.id) > (:last_date, CAST(:last_id AS BIGINT))
+                    )
+                    ORDER BY m.measure_date, m.id
+                    LIMIT :chunk_size
+                ),
+                evaluated AS (
+                    SELECT c.id, {VIOLATES} AS fires
+                    FROM chunk c
+                    JOIN type_alerts ta ON ta.id = :type_alert_id
+                ),
+                removed AS (
+                    DELETE FROM alerts a
+                    USING evaluated e
+                    WHERE a.measure_id = e.id
+                    AND a.type_alert_id = :type_alert_id
+                    AND a.is_read = false
+                    AND NOT e.fires
+                    RETURNING 1
+                ),
+                created AS (
+                    INSERT INTO alerts (type_alert_id, measure_id, create_date, is_read)
+                    SELECT :type_alert_id, e.id, :now, false
+                    FROM evaluated e
+                    WHERE e.fires
+                    AND NOT EXISTS (
+                        SELECT 1 FROM alerts a
+                        WHERE a.measure_id = e.id AND a.type_alert_id = :type_alert_id
+                    )
+                    RETURNING 1
+                ),
+                last_row AS (
+                    SELECT measure_date, id FROM chunk
+                    ORDER BY measure_date DESC, id DESC
+                    LIMIT 1
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM chunk) AS processed,
+                    (SELECT COUNT(*) FROM created) AS created,
+                    (SELECT COUNT(*) FROM removed) AS removed,
+                    (SELECT measure_date FROM last_row) AS last_date,
+                    (SELECT id FROM last_row) AS last_id
+            """),
+            {
+                "parameter_id": job.parameter_id,
+                "type_alert_id": job.type_alert_id,
+                "window_start": job.window_start,
+                "last_date": job.last_measure_date,
+                "last_id": job.last_measure_id,
+                "chunk_size": chunk_size,
+                "now": int(time.time()),
+            },
+        )
+        progress = result.one()
+        if not progress.processed:
+            await self._finish(job.id, "done")
+            return True
+
+        await self._session.execute(
+            text("""
+                UPDATE alert_backfill_jobs SET
+                    status = 'running',
+                    processed = processed + :processed,
+                    created = created + :created,
+                    removed = removed + :removed,
+                    last_measure_date = :last_date,
+                    last_measure_id = :last_id,
+                    last_update = :now
+                WHERE id = :id
+            """),
+            {**progress._asdict(), "id": job.id, "now": int(time.time())},
+        )
+        await self._session.commit()
+        return True
+
+    async def fail(self, job_id: int, error: str) -> None:
+        await self._session.rollback()
+        await self._session.execute(
+            text("""
+                UPDATE alert_backfill_jobs
+                SET status = 'failed', error = :error, last_update = :now
+                WHERE id = :id
+            """),
+            {"id": job_id, "error": error, "now": int(time.time())},
+        )
+        await self._session.commit()
+
+    async def list_jobs(self, limit: int) -> list[dict[str, Any]]:
+        result = await self._session.execute(
+            text("""
+                SELECT id, type_alert_id, status, window_start, total, processed,
+                    created, removed, error, create_date, last_update
+                FROM alert_backfill_jobs
+                ORDER BY id DESC
+                LIMIT :limit
+            """),
+            {"limit": limit},
+        )
+        return [row._asdict() for row in result.fetchall()]
+
+    async def _finish(self, job_id: int, status: str) -> None:
+        await self._session.execute(
+            text("""
+                UPDATE alert_backfill_jobs SET status = :status, last_update = :now
+                WHERE id = :id
+            """),
+            {"status": status, "id": job_id, "now": int(time.time())},
+        )
+        await self._session.commit()
+
+
+async def run_alert_backfills() -> None:
+    async with Database().session as session:
+        service = AlertBackfillService(session)
+        deadline = time.monotonic() + settings.ALERT_BACKFILL_INTERVAL_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                if not await service.run_chunk(settings.ALERT_BACKFILL_CHUNK_SIZE):
+                    return
+            except Exception as e:
+                # Esperar demais por um lock só adia o bloco; outros erros encerram o job.
+                if is_lock_timeout(e) or service.job_id is None:
+                    print(f"Erro ao reavaliar alertas: {e}")
+                    await session.rollback()
+                    return
+                print(f"Erro ao reavaliar alertas do job {service.job_id}: {e}")
+                await service.fail(service.job_id, str(e))
+
+
+def is_lock_timeout(error: Exception) -> bool:
+    # O SQLAlchemy embrulha o erro do asyncpg e repassa o SQLSTATE em `orig`.
+    return getattr(getattr(error, "orig", None), "sqlstate", None) == LOCK_NOT_AVAILABLE
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import Any, Container, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from app.service.catalog import ReferenceCatalog
+
+# Códigos dos operadores aceitos em `type_alerts.math_signal`.
+OPERATORS = {">": 0, ">=": 1, "<": 2, "<=": 3, "=": 4, "==": 4, "!=": 5, "<>": 5}
+
+ALERT_COLUMNS = ("type_alert_id", "measure_id", "create_date", "is_read")
+
+# (id do tipo de alerta, id do parâmetro, limite, operador)
+Rule = tuple[int, int, float, str]
+
+_COMPARISONS = {
+    OPERATORS[">"]: np.greater,
+    OPERATORS[">="]: np.greater_equal,
+    OPERATORS["<"]: np.less,
+    OPERATORS["<="]: np.less_equal,
+    OPERATORS["="]: np.equal,
+    OPERATORS["!="]: np.not_equal,
+}
+
+
+# Um sinal por código (`OPERATORS` tem sinônimos como "==" e "<>").
+_SIGNALS = {code: signal for signal, code in OPERATORS.items()}
+
+
+def threshold_mask(
+    values: np.ndarray, threshold: float | np.ndarray, math_signal: str
+) -> np.ndarray:
+    """Marca as leituras que violam o limite (um valor ou um por leitura)."""
+    return _COMPARISONS[OPERATORS[math_signal]](values, threshold)  # type: ignore[no-any-return]
+
+
+class ThresholdIndex:
+    """Regras de limite ordenadas por parâmetro, avaliadas em lote com NumPy.
+
+    As leituras são ordenadas por parâmetro e cada regra enxerga a fatia
+    contígua das leituras do seu parâmetro (`searchsorted`). Os pares
+    (leitura, regra) são comparados de uma vez, sem laço em Python, então o
+    custo é proporcional a leituras x regras do mesmo parâmetro.
+    """
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        valid = [rule for rule in rules if rule[3] in OPERATORS]
+        parameter_ids = np.array([rule[1] for rule in valid], dtype=np.int64)
+        order = np.argsort(parameter_ids, kind="stable")
+        self.parameter_ids = parameter_ids[order]
+        self.type_alert_ids = np.array([rule[0] for rule in valid], dtype=np.int64)[order]
+        self.thresholds = np.array([rule[2] for rule in valid], dtype=np.float64)[order]
+        self.operators = np.array([OPERATORS[rule[3]] for rule in valid], dtype=np.int8)[order]
+
+    def __len__(self) -> int:
+        return len(self.parameter_ids)
+
+    def evaluate(
+        self, parameter_ids: np.ndarray, values: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Retorna (índice da leitura, id do tipo de alerta) de cada limite violado."""
+        empty = np.empty(0, dtype=np.int64)
+        if not len(self) or not len(parameter_ids):
+            return empty, empty
+
+        reading_order = np.argsort(parameter_ids, kind="stable")
+        sorted_parameters = parameter_ids[reading_order]
+        starts = np.searchsorted(sorted_parameters, self.parameter_ids, side="left")
+        ends = np.searchsorted(sorted_parameters, self.parameter_ids, side="right")
+        counts = ends - starts
+        total = int(counts.sum())
+        if not total:
+            return empty, empty
+
+        rule_index = np.repeat(np.arange(len(self)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        reading_index = reading_order[np.repeat(starts, counts) + offsets]
+
+        value = values[reading_index]
+        threshold = self.thresholds[rule_index]
+        operator = self.operators[rule_index]
+        hit = np.zeros(total, dtype=bool)
+        for code in np.unique(operator):
+            selected = operator == code
+            hit[selected] = threshold_mask(
+                value[selected], threshold[selected], _SIGNALS[int(code)]
+            )
+        return reading_index[hit], self.type_alert_ids[rule_index[hit]]
+
+
+class AlertEngine:
+    """Gera as linhas de `alerts` para um lote de medidas recém-gravadas."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def load_index(self) -> ThresholdIndex:
+        catalog = ReferenceCatalog().snapshot
+        if catalog is not None:
+            return _index_for_catalog(
+                catalog.version, catalog.alert_types, catalog.stateful_rule_ids
+            )
+
+        result = await self._session.execute(
+            text("""
+                SELECT id, parameter_id, value, math_signal
+                FROM type_alerts
+                WHERE is_active = true AND parameter_id IS NOT NULL
+                AND id NOT IN (SELECT type_alert_id FROM alert_stateful_rules)
+            """)
+        )
+        rules = [tuple(row) for row in result.fetchall()]
+        await self._session.commit()
+        return ThresholdIndex(rules)  # type: ignore[arg-type]
+
+    @staticmethod
+    def evaluate(
+        index: ThresholdIndex, measures: Sequence[tuple[int, int, int, float]]
+    ) -> list[tuple[int, int, int, bool]]:
+        """`measures` são (id, parameter_id, measure_date, value), como no COPY."""
+        if not measures or not len(index):
+            return []
+        count = len(measures)
+        measure_ids = np.fromiter((m[0] for m in measures), dtype=np.int64, count=count)
+        parameter_ids = np.fromiter((m[1] for m in measures), dtype=np.int64, count=count)
+        values = np.fromiter((m[3] for m in measures), dtype=np.float64, count=count)
+        reading_index, type_alert_ids = index.evaluate(parameter_ids, values)
+        now = int(time.time())
+        return [
+            (int(type_alert_id), int(measure_id), now, False)
+            for type_alert_id, measure_id in zip(
+                type_alert_ids.tolist(), measure_ids[reading_index].tolist()
+            )
+        ]
+
+
+_catalog_index: tuple[int, ThresholdIndex] | None = None
+
+
+def _index_for_catalog(
+    version: int, alert_types: Sequence[Any], stateful_rule_ids: Container[int] = ()
+) -> ThresholdIndex:
+    # O índice só é reconstruído quando o catálogo muda de versão.
+    global _catalog_index  # noqa: PLW0603
+    if _catalog_index is None or _catalog_index[0] != version:
+        rules = [
+            (alert.id, alert.parameter_id, float(alert.value), alert.math_signal)
+            for alert in alert_types
+            if alert.is_active
+            and alert.parameter_id is not None
+            and alert.id not in stateful_rule_ids
+        ]
+        _catalog_index = (version, ThresholdIndex(rules))
+    return _catalog_index[1]
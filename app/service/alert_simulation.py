@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import time
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Any, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.modules.query_budget import record_query
+from app.schemas.alert_type_schema import (
+    AlertSimulationDay,
+    AlertSimulationResponse,
+    AlertTypeSimulation,
+)
+from app.service.alert_engine import threshold_mask
+
+DAY = 24 * 60 * 60
+
+SIMULATION_HISTORY = """
+    SELECT measure_date, value
+    FROM measures
+    WHERE parameter_id = $1 AND measure_date >= $2 AND measure_date < $3
+"""
+
+
+class SimulationAccumulator:
+    """Soma, bloco a bloco, os disparos de uma regra por dia (UTC).
+
+    Guarda só o vetor de contagens diárias e as `sample_size` datas de disparo
+    mais recentes, então a memória não cresce com o tamanho do histórico.
+    """
+
+    def __init__(
+        self, start: int, end: int, threshold: float, math_signal: str, sample_size: int
+    ) -> None:
+        self.first_day = start // DAY
+        self.counts = np.zeros((end - 1) // DAY - self.first_day + 1, dtype=np.int64)
+        self.readings = 0
+        self._threshold = threshold
+        self._math_signal = math_signal
+        self._sample_size = sample_size
+        self._samples = np.empty(0, dtype=np.int64)
+
+    def add(self, rows: Sequence[Sequence[Any]]) -> None:
+        """`rows` são pares (measure_date, value), como vêm do cursor."""
+        if not rows:
+            return
+        pairs = np.fromiter(
+            chain.from_iterable(rows), dtype=np.float64, count=2 * len(rows)
+        ).reshape(-1, 2)
+        self.readings += len(pairs)
+        fired = pairs[threshold_mask(pairs[:, 1], self._threshold, self._math_signal), 0]
+        if not len(fired):
+            return
+        dates = fired.astype(np.int64)
+        self.counts += np.bincount(dates // DAY - self.first_day, minlength=len(self.counts))
+        self._samples = np.concatenate([self._samples, dates])
+        if len(self._samples) > self._sample_size:
+            self._samples = np.sort(self._samples)[-self._sample_size :]
+
+    def result(self) -> AlertSimulationResponse:
+        days = np.flatnonzero(self.counts)
+        return AlertSimulationResponse(
+            readings=self.readings,
+            alerts=int(self.counts.sum()),
+            days=[
+                AlertSimulationDay(
+                    day=datetime.fromtimestamp(
+                        (self.first_day + day) * DAY, timezone.utc
+                    ).date(),
+                    alerts=int(self.counts[day]),
+                )
+                for day in days.tolist()
+            ],
+            samples=[
+                datetime.fromtimestamp(sample, timezone.utc)
+                for sample in np.sort(self._samples)[::-1].tolist()
+            ],
+        )
+
+
+class AlertSimulationService:
+    """Avalia uma regra proposta sobre o histórico sem gravar nada."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def simulate(self, simulation: AlertTypeSimulation) -> AlertSimulationResponse:
+        end = (int(time.time()) // DAY + 1) * DAY
+        start = end - simulation.months * 30 * DAY
+        accumulator = SimulationAccumulator(
+            start,
+            end,
+            float(simulation.value),
+            simulation.math_signal,
+            settings.ALERT_SIMULATION_SAMPLE_SIZE,
+        )
+
+        # A validação do parâmetro já abriu a transação da sessão, e dentro dela o
+        # `transaction(readonly=True)` viraria um SAVEPOINT (sem READ ONLY, e o
+        # SET LOCAL valeria até o fim da transação externa). Encerrada a da
+        # sessão, a do driver é a transação de nível superior da conexão.
+        await self._session.commit()
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        driver: Any = raw.driver_connection
+        if driver.is_in_transaction():
+            raise RuntimeError("A simulação precisa de uma transação própria, só de leitura")
+        args = [simulation.parameter_id, start, end]
+        started = time.perf_counter()
+        # O cursor traz o histórico em blocos; cada bloco vira um vetor NumPy e é
+        # descartado depois de contado.
+        async with driver.transaction(readonly=True):
+            timeout_ms = settings.ALERT_SIMULATION_TIMEOUT_SECONDS * 1000
+            await driver.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+            cursor = await driver.cursor(SIMULATION_HISTORY, *args)
+            while rows := await cursor.fetch(settings.ALERT_SIMULATION_CHUNK_SIZE):
+                accumulator.add(rows)
+        record_query(SIMULATION_HISTORY, time.perf_counter() - started, args)
+        return accumulator.result()
@@ -4,14 +4,20 @@
 from fastapi import HTTPException, status
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 from app.core.models.db_model import Parameter, TypeAlert
+from app.modules.cache import cached, query_cache
 from app.schemas.alert_type_schema import (
+    AlertSimulationResponse,
     AlertTypeCreate,
     AlertTypeResponse,
+    AlertTypeSimulation,
     AlertTypeUpdate,
 )
+from app.service.alert_backfill import AlertBackfillService
+from app.service.alert_simulation import AlertSimulationService
+from app.service.catalog import CATALOG_QUERIES, ReferenceCatalog
 
 
 class AlertTypeService:
@@ -22,36 +28,82 @@ class AlertTypeService:
         if alert_type_date.parameter_id is not None:
             await self._search_parameter_id(alert_type_date.parameter_id)
 
-        new_alert_type = TypeAlert(**alert_type_date.model_dump())
+        kind = alert_type_date.kind or "threshold"
+        self._check_threshold(kind, alert_type_date.value)
+        new_alert_type = TypeAlert(
+            **alert_type_date.model_dump(exclude={"kind", "window_seconds", "value"}),
+            value=int(alert_type_date.value),
+        )
 
         await self._search_alert_type(new_alert_type)
 
         self._session.add(new_alert_type)
+        if kind != "threshold":
+            await self._session.flush()
+            await self._save_rule_kind(
+                new_alert_type.id,
+                kind,
+                alert_type_date.window_seconds,
+                alert_type_date.value,
+            )
         await self._session.commit()
+        await query_cache.invalidate("type_alerts")
+        ReferenceCatalog().invalidate()
 
     async def list_alert_types(self, filtros: bool) -> list[AlertTypeResponse]:
-        query = select(TypeAlert).where(TypeAlert.is_active == filtros)
-        query_result = await self._session.execute(query)
-        alert_types = query_result.scalars().all()
-        return [
-            AlertTypeResponse.model_validate(alert_type, from_attributes=True)
-            for alert_type in alert_types
-        ]
+        catalog = ReferenceCatalog().snapshot
+        if catalog is not None:
+            return catalog.get_alert_types(filtros)
+        return await self._query_alert_types(filtros)
 
+    # Mesma consulta do catálogo: traz o tipo da regra e o limite fracionário.
+    @cached("type_alerts")
+    async def _query_alert_types(self, filtros: bool) -> list[AlertTypeResponse]:
+        query_result = await self._session.execute(
+            text(f"{CATALOG_QUERIES['type_alerts']} WHERE ta.is_active = :is_active"),
+            {"is_active": filtros},
+        )
+        return [AlertTypeResponse(**row._asdict()) for row in query_result.fetchall()]
+
+    @cached("type_alerts")
     async def get_alert_type(self, alert_type_id: int) -> AlertTypeResponse:
-        alert_type = await self._session.get(TypeAlert, alert_type_id)
+        query_result = await self._session.execute(
+            text(f"{CATALOG_QUERIES['type_alerts']} WHERE ta.id = :id"),
+            {"id": alert_type_id},
+        )
+        alert_type = query_result.fetchone()
         if alert_type is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Tipo de alerta com a ID {alert_type_id} não encontrado.",
             )
-        return AlertTypeResponse.model_validate(alert_type, from_attributes=True)
+        return AlertTypeResponse(**alert_type._asdict())
 
     async def update_alert_type(
         self, alert_type_id: int, alert_type_data: AlertTypeUpdate
     ) -> None:
         alert_type = await self._search_alert_type_id(alert_type_id)
         data = alert_type_data.model_dump(exclude_unset=True)
+        kind = data.pop("kind", None)
+        window_seconds = data.pop("window_seconds", None)
+        stored_kind, stored_threshold = await self._stored_rule(alert_type_id)
+        if window_seconds is not None and kind is None:
+            kind = stored_kind
+            if kind == "threshold":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="window_seconds só se aplica a regras com estado.",
+                )
+        rule_kind = kind or stored_kind
+        current_threshold = (
+            stored_threshold if stored_threshold is not None else alert_type.value
+        )
+        threshold = data.get("value")
+        self._check_threshold(
+            rule_kind, threshold if threshold is not None else current_threshold
+        )
+        if threshold is not None:
+            data["value"] = int(threshold)
 
         if "name" in data:
             conditions = []
@@ -73,11 +125,42 @@ class AlertTypeService:
             parameter_id = int(data["parameter_id"])
             await self._search_parameter_id(parameter_id)
 
+        rule_changed = (threshold is not None and threshold != current_threshold) or any(
+            key in data and data[key] != getattr(alert_type, key)
+            for key in ("math_signal", "parameter_id")
+        )
+
         await self._session.execute(
             update(TypeAlert).where(TypeAlert.id == alert_type_id).values(**data)
         )
+        if kind is not None:
+            await self._save_rule_kind(alert_type_id, kind, window_seconds, threshold)
+        elif threshold is not None and rule_kind != "threshold":
+            await self._session.execute(
+                text("""
+                    UPDATE alert_stateful_rules SET threshold = :threshold
+                    WHERE type_alert_id = :id
+                """),
+                {"id": alert_type_id, "threshold": threshold},
+            )
+        if rule_changed or kind is not None:
+            # O estado acumulado pela regra antiga não vale para a nova.
+            await self._session.execute(
+                text("DELETE FROM alert_rule_state WHERE type_alert_id = :id"),
+                {"id": alert_type_id},
+            )
+        if rule_changed and rule_kind == "threshold":
+            await AlertBackfillService(self._session).enqueue(alert_type_id)
 
         await self._session.commit()
+        await query_cache.invalidate("type_alerts")
+        ReferenceCatalog().invalidate()
+
+    async def simulate_alert_type(
+        self, simulation: AlertTypeSimulation
+    ) -> AlertSimulationResponse:
+        await self._search_parameter_id(simulation.parameter_id)
+        return await AlertSimulationService(self._session).simulate(simulation)
 
     async def delete_alert_type(self, alert_type_id: int) -> None:
         await self._search_alert_type_id(alert_type_id)
@@ -87,6 +170,60 @@ class AlertTypeService:
             .values(is_active=False, last_update=func.now())
         )
         await self._session.commit()
+        await query_cache.invalidate("type_alerts")
+        ReferenceCatalog().invalidate()
+
+    async def _stored_rule(self, alert_type_id: int) -> tuple[str, float | None]:
+        result = await self._session.execute(
+            text("""
+                SELECT kind, threshold FROM alert_stateful_rules WHERE type_alert_id = :id
+            """),
+            {"id": alert_type_id},
+        )
+        row = result.fetchone()
+        return (row.kind, row.threshold) if row else ("threshold", None)
+
+    @staticmethod
+    def _check_threshold(kind: str, value: float) -> None:
+        # `type_alerts.value` é inteiro; só as regras com estado guardam o limite
+        # fracionário em `alert_stateful_rules.threshold`.
+        if kind == "threshold" and not float(value).is_integer():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="O limite de regras threshold deve ser inteiro.",
+            )
+
+    async def _save_rule_kind(
+        self,
+        alert_type_id: int,
+        kind: str | None,
+        window_seconds: int | None,
+        threshold: float | None = None,
+    ) -> None:
+        if kind in {None, "threshold"}:
+            await self._session.execute(
+                text("DELETE FROM alert_stateful_rules WHERE type_alert_id = :id"),
+                {"id": alert_type_id},
+            )
+            return
+        await self._session.execute(
+            text("""
+                INSERT INTO alert_stateful_rules (
+                    type_alert_id, kind, window_seconds, threshold
+                )
+                VALUES (:id, :kind, :window_seconds, :threshold)
+                ON CONFLICT (type_alert_id) DO UPDATE SET
+                    kind = EXCLUDED.kind,
+                    window_seconds = EXCLUDED.window_seconds,
+                    threshold = COALESCE(EXCLUDED.threshold, alert_stateful_rules.threshold)
+            """),
+            {
+                "id": alert_type_id,
+                "kind": kind,
+                "window_seconds": window_seconds or 0,
+                "threshold": threshold,
+            },
+        )
 
     async def _search_alert_type(self, new_alert_type: TypeAlert) -> None:
         query = select(TypeAlert).where(
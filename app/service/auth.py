@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.security import PasswordManager, TokenManager
 from app.schemas.auth import Token
 from app.schemas.user import UserResponse
+from app.service.refresh_token import RefreshTokenService
 from app.service.user import UserService
 
 
@@ -15,14 +16,33 @@ class AuthService:
         self.__pwd_manager = PasswordManager()
         self.__token_manager = TokenManager()
         self._service_user = UserService(session)
+        self._service_refresh_token = RefreshTokenService(session)
 
     async def login(self, form_data: OAuth2PasswordRequestForm) -> Token:
         user: UserResponse | None = await self._service_user.get_user_by_email(
             form_data.username
         )
-        if not user or not self.__pwd_manager.verify_password(
+        if not user or not await self.__pwd_manager.verify_password_async(
             form_data.password, user.password
         ):
             raise HTTPException(status_code=400, detail="Nome de usuário ou senha incorretos")
         access_token = self.__token_manager.create_access_token(user)
-        return Token(access_token=access_token, token_type="bearer")
+        refresh_token = await self._service_refresh_token.issue(user.id)
+        return Token(
+            access_token=access_token, token_type="bearer", refresh_token=refresh_token
+        )
+
+    async def refresh(self, refresh_token: str) -> Token:
+        user_id, new_refresh_token = await self._service_refresh_token.rotate(refresh_token)
+        user = await self._service_user.get_user_by_id(user_id)
+        if not user or not user.is_active:
+            # Usuário removido ou desativado: a sessão inteira deixa de valer.
+            await self._service_refresh_token.revoke(new_refresh_token)
+            raise HTTPException(status_code=401, detail="Refresh token inválido ou expirado")
+        access_token = self.__token_manager.create_access_token(user)
+        return Token(
+            access_token=access_token, token_type="bearer", refresh_token=new_refresh_token
+        )
+
+    async def logout(self, refresh_token: str) -> None:
+        await self._service_refresh_token.revoke(refresh_token)
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import Any
+
+import asyncpg
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql import text
+
+from app.config.settings import settings
+from app.dependency.auth import PRINCIPAL_CHANNEL, principal_cache
+from app.dependency.database import Database
+from app.modules.cache import query_cache
+from app.modules.common import Singleton
+from app.schemas.alert_type_schema import AlertTypeResponse
+from app.schemas.parameter_type import FilterParameterType, ParameterTypeResponse
+from app.schemas.weather_station import (
+    FilterWeatherStation,
+    WeatherStationResponse,
+    WeatherStationResponseList,
+)
+
+# Os gatilhos das tabelas do catálogo (migração em alembic/service) notificam este
+# canal com o nome da tabela alterada.
+CATALOG_CHANNEL = "reference_catalog"
+
+# Tag do `query_cache` invalidada pelo aviso de cada tabela, quando não é o
+# próprio nome da tabela.
+CACHE_TAGS = {"alert_stateful_rules": "type_alerts"}
+
+CATALOG_QUERIES = {
+    "weather_stations": """
+        SELECT id, "name", uid, address, latitude, longitude, create_date, is_active
+        FROM weather_stations
+    """,
+    "parameters": """
+        SELECT id, parameter_type_id, station_id, is_active
+        FROM parameters
+    """,
+    "parameter_types": """
+        SELECT id, "name", detect_type, measure_unit, qnt_decimals, factor, "offset", is_active
+        FROM parameter_types
+    """,
+    "type_alerts": """
+        SELECT
+            ta.id, ta.parameter_id, ta."name", COALESCE(sr.threshold, ta.value) AS value,
+            ta.math_signal, ta.status, ta.is_active, ta.create_date, ta.last_update,
+            COALESCE(sr.kind, 'threshold') AS kind,
+            NULLIF(sr.window_seconds, 0) AS window_seconds
+        FROM type_alerts ta
+        LEFT JOIN alert_stateful_rules sr ON sr.type_alert_id = ta.id
+    """,
+}
+
+
+class CatalogSnapshot:
+    """Cópia imutável das tabelas de referência, indexada para as consultas da API."""
+
+    def __init__(
+        self,
+        version: int,
+        stations: list[dict[str, Any]],
+        parameters: list[dict[str, Any]],
+        parameter_types: list[dict[str, Any]],
+        alert_types: list[dict[str, Any]],
+    ) -> None:
+        self.version = version
+        self.parameter_types = [ParameterTypeResponse(**row) for row in parameter_types]
+        self.alert_types = [AlertTypeResponse(**row) for row in alert_types]
+        # Regras com estado são avaliadas por `StatefulRuleEngine`, não por limite.
+        self.stateful_rule_ids = {
+            row["id"] for row in alert_types if row.get("kind", "threshold") != "threshold"
+        }
+
+        type_names = {row["id"]: row["name"] for row in parameter_types}
+        station_parameters: dict[int, list[dict[str, Any]]] = {}
+        for row in parameters:
+            if not row["is_active"] or row["parameter_type_id"] not in type_names:
+                continue
+            station_parameters.setdefault(row["station_id"], []).append({
+                "parameter_id": row["id"],
+                "parameter_type_id": row["parameter_type_id"],
+                "name_parameter": type_names[row["parameter_type_id"]],
+            })
+
+        self.stations = {
+            row["id"]: {**row, "parameters": station_parameters.get(row["id"], [])}
+            for row in stations
+        }
+
+    def get_stations(self, filters: FilterWeatherStation) -> list[WeatherStationResponse]:
+        return [
+            WeatherStationResponse(**{**station, "name_station": station["name"]})
+            for station in self.stations.values()
+            if (filters.uid is None or station["uid"] == filters.uid)
+            and (filters.is_active is None or station["is_active"] == filters.is_active)
+            and (filters.name is None or filters.name in station["name"])
+        ]
+
+    def get_station(self, station_id: int) -> WeatherStationResponseList | None:
+        station = self.stations.get(station_id)
+        return WeatherStationResponseList(**station) if station else None
+
+    def get_parameter_types(
+        self, filters: FilterParameterType | None
+    ) -> list[ParameterTypeResponse]:
+        return [
+            parameter_type
+            for parameter_type in self.parameter_types
+            if not filters
+            or (
+                (not filters.name or filters.name in parameter_type.name)
+                and (
+                    filters.is_active is None or parameter_type.is_active == filters.is_active
+                )
+            )
+        ]
+
+    def get_alert_types(self, is_active: bool) -> list[AlertTypeResponse]:
+        return [alert for alert in self.alert_types if alert.is_active == is_active]
+
+
+class ReferenceCatalog(metaclass=Singleton):
+    """Catálogo em memória das tabelas de referência.
+
+    Carregado no `lifespan` e recarregado quando o Postgres avisa (LISTEN/NOTIFY)
+    que alguma das tabelas mudou, inclusive por outro worker ou serviço. Enquanto
+    uma recarga está pendente o catálogo não é usado e as leituras vão ao banco.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: CatalogSnapshot | None = None
+        self._version = 0
+        self._stale = True
+        self._dirty = asyncio.Event()
+        self._listener: asyncpg.Connection | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def snapshot(self) -> CatalogSnapshot | None:
+        if self._stale:
+            return None
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._stale = True
+        self._dirty.set()
+
+    async def start(self) -> None:
+        self._dirty = asyncio.Event()
+        await self._listen()
+        await self._reload()
+        self._task = asyncio.create_task(self._reload_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            await listener.close()
+        query_cache.set_listening(False)
+        self._snapshot = None
+        self._stale = True
+
+    async def _listen(self) -> None:
+        url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+        listener = await asyncpg.connect(url.render_as_string(hide_password=False))
+        listener.add_termination_listener(self._on_terminate)
+        await listener.add_listener(CATALOG_CHANNEL, self._on_notify)
+        # A mesma conexão invalida os usuários autenticados em cache; avisos
+        # perdidos enquanto ela estava fora descartam o cache inteiro.
+        await listener.add_listener(PRINCIPAL_CHANNEL, principal_cache.on_notify)
+        principal_cache.clear()
+        query_cache.set_listening(True)
+        self._listener = listener
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.invalidate()
+        # O mesmo aviso leva aos caches em memória dos outros workers as escritas
+        # nas tabelas do catálogo.
+        query_cache.on_notify(CACHE_TAGS.get(payload, payload))
+
+    def _on_terminate(self, connection: Any) -> None:
+        # Sem a conexão do LISTEN as notificações se perdem: o catálogo deixa de
+        # ser usado até o laço reconectar, assinar o canal de novo e recarregar.
+        if connection is not self._listener:
+            return
+        print("Conexão LISTEN do catálogo de referência encerrada; reconectando.")
+        self._listener = None
+        self.invalidate()
+        principal_cache.clear()
+        query_cache.set_listening(False)
+
+    async def _reload_loop(self) -> None:
+        delay = 1.0
+        while True:
+            await self._dirty.wait()
+            try:
+                if self._listener is None:
+                    await self._listen()
+                await self._reload()
+                delay = 1.0
+            except Exception as e:
+                print(f"Erro ao recarregar o catálogo de referência: {e}")
+                self._dirty.set()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.CATALOG_RECONNECT_MAX_SECONDS)
+
+    async def _reload(self) -> None:
+        self._dirty.clear()
+        async with Database().session as session:
+            rows = {}
+            for table, query in CATALOG_QUERIES.items():
+                result = await session.execute(text(query))
+                rows[table] = [row._asdict() for row in result.fetchall()]
+
+        self._version += 1
+        self._snapshot = CatalogSnapshot(
+            self._version,
+            rows["weather_stations"],
+            rows["parameters"],
+            rows["parameter_types"],
+            rows["type_alerts"],
+        )
+        # Uma notificação recebida durante a carga deixa o catálogo obsoleto
+        # até a próxima volta do laço.
+        self._stale = self._dirty.is_set()
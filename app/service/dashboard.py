@@ -1,63 +1,298 @@
 from datetime import datetime, timezone
-from typing import Any, Sequence
+from typing import Any, AsyncIterator, Literal, Sequence
 
+from asyncpg import Record
+from fastapi import HTTPException, status
 from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 
+from app.config.settings import settings
+from app.modules.fast_query import fetch_records
+from app.modules.pagination import decode_cursor, encode_cursor
+from app.schemas.dashboard import StationHistoryFilter, StationHistoryRange
+
+# `latest_measures` (última medida de cada parâmetro), `measure_counters` e
+# `alert_counters` são mantidas por gatilhos de instrução em `measures` e `alerts`,
+# criados pela migração em alembic/service; cobrem também gravações feitas por
+# outros serviços e por COPY.
+HistoryResolution = Literal["raw", "hour", "day"]
+
+# Posição de cada resolução no cursor do histórico.
+HISTORY_RESOLUTIONS: tuple[HistoryResolution, ...] = ("raw", "hour", "day")
+
+HISTORY_SOURCES = {
+    "raw": """
+        SELECT
+            p.station_id,
+            pt.name AS title,
+            pt.measure_unit,
+            pt.detect_type AS type,
+            m.measure_date,
+            m.value,
+            NULL::DOUBLE PRECISION AS min_value,
+            NULL::DOUBLE PRECISION AS max_value,
+            m.value AS sum_value,
+            1 AS sample_count,
+            m.id AS row_key,
+            m.parameter_id
+        FROM measures m
+        JOIN parameters p ON m.parameter_id = p.id
+        JOIN parameter_types pt ON p.parameter_type_id = pt.id
+    """,
+    "hour": """
+        SELECT
+            p.station_id,
+            pt.name AS title,
+            pt.measure_unit,
+            pt.detect_type AS type,
+            r.bucket AS measure_date,
+            r.sum_value / r.sample_count AS value,
+            r.min_value,
+            r.max_value,
+            r.sum_value,
+            r.sample_count,
+            r.parameter_id AS row_key,
+            r.parameter_id
+        FROM measures_rollup_hourly r
+        JOIN parameters p ON r.parameter_id = p.id
+        JOIN parameter_types pt ON p.parameter_type_id = pt.id
+    """,
+    "day": """
+        SELECT
+            p.station_id,
+            pt.name AS title,
+            pt.measure_unit,
+            pt.detect_type AS type,
+            r.bucket AS measure_date,
+            r.sum_value / r.sample_count AS value,
+            r.min_value,
+            r.max_value,
+            r.sum_value,
+            r.sample_count,
+            r.parameter_id AS row_key,
+            r.parameter_id
+        FROM measures_rollup_daily r
+        JOIN parameters p ON r.parameter_id = p.id
+        JOIN parameter_types pt ON p.parameter_type_id = pt.id
+    """,
+}
+
 
 class DashboardService:
+    HOURLY_MIN_RANGE = 2 * 24 * 60 * 60
+    DAILY_MIN_RANGE = 60 * 24 * 60 * 60
+
     def __init__(self, session: AsyncSession):
         self._session = session
 
     async def get_station_history(
-        self, station_id: int, start_date: str | None = None, end_date: str | None = None
-    ) -> Sequence[Row[Any]]:
-        base_query = [
-            """
+        self, station_id: int, filters: StationHistoryFilter | None = None
+    ) -> tuple[Sequence[Record], str | None]:
+        filters = filters or StationHistoryFilter()
+
+        if filters.max_points is not None:
+            resolution, where_conditions, final_params = self._history_query(
+                station_id, filters
+            )
+            rows = await self._get_downsampled_history(
+                HISTORY_SOURCES[resolution],
+                " AND ".join(where_conditions),
+                final_params,
+                filters.max_points,
+            )
+            return rows, None
+
+        cursor_resolution = None
+        if filters.cursor is not None:
+            try:
+                cursor_date, cursor_key, resolution_code = decode_cursor(filters.cursor, 3)
+            except ValueError:
+                resolution_code = -1
+            if not 0 <= resolution_code < len(HISTORY_RESOLUTIONS):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+                )
+            cursor_resolution = HISTORY_RESOLUTIONS[resolution_code]
+            if filters.resolution not in {"auto", cursor_resolution}:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="O cursor foi gerado com outra resolução.",
+                )
+
+        # Com `auto`, a resolução é escolhida na primeira página e segue no cursor:
+        # `row_key` é o id da medida nos dados brutos e o parâmetro nos rollups,
+        # então trocar de fonte no meio da paginação repetiria ou pularia linhas.
+        resolution, where_conditions, final_params = self._history_query(
+            station_id, filters, cursor_resolution
+        )
+        if filters.cursor is not None:
+            where_conditions.append(
+                "(h.measure_date, h.row_key) < (:cursor_date, :cursor_key)"
+            )
+            final_params["cursor_date"] = cursor_date
+            final_params["cursor_key"] = cursor_key
+
+        # Sem `limit` explícito aplica a página padrão: nunca carrega o intervalo
+        # inteiro em memória. Cada parâmetro da estação é lido pelo índice
+        # (parameter_id, measure_date, id) já na ordem da página, com LIMIT, e
+        # só os primeiros `limit` de cada um entram na ordenação final.
+        limit = filters.limit or settings.HISTORY_PAGE_SIZE
+        final_params["limit"] = limit + 1
+        query = f"""
             SELECT
-                m.value,
-                m.measure_date,
-                pt.name AS title,
-                pt.measure_unit,
-                pt.detect_type AS type
-            FROM measures m
-            JOIN parameters p ON m.parameter_id = p.id
-            JOIN parameter_types pt ON p.parameter_type_id = pt.id
+                h.value,
+                h.min_value,
+                h.max_value,
+                h.measure_date,
+                h.title,
+                h.measure_unit,
+                h.type,
+                h.row_key
+            FROM parameters sp
+            CROSS JOIN LATERAL (
+                SELECT h.*
+                FROM ({HISTORY_SOURCES[resolution]}) h
+                WHERE h.parameter_id = sp.id AND {" AND ".join(where_conditions)}
+                ORDER BY h.measure_date DESC, h.row_key DESC
+                LIMIT :limit
+            ) h
+            WHERE sp.station_id = :station_id
+            ORDER BY h.measure_date DESC, h.row_key DESC
+            LIMIT :limit
         """
-        ]
+        rows = await fetch_records(self._session, query, final_params)
 
-        where_conditions = []
-        final_params = {"station_id": station_id}
-        where_conditions.append("p.station_id = :station_id")
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(
+            rows[-1]["measure_date"],
+            rows[-1]["row_key"],
+            HISTORY_RESOLUTIONS.index(resolution),
+        )
 
-        start_epoch = self._parse_date_to_epoch(start_date)
-        if start_epoch is not None:
-            where_conditions.append("m.measure_date >= :start_date_epoch")
-            final_params["start_date_epoch"] = start_epoch
+    async def stream_station_history(
+        self, station_id: int, filters: StationHistoryRange, chunk_size: int = 5000
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        # Cursor do lado do servidor: o banco entrega `chunk_size` linhas por vez
+        # e nada além do bloco corrente fica em memória.
+        resolution, where_conditions, params = self._history_query(station_id, filters)
+        query = text(f"""
+            SELECT
+                h.measure_date,
+                h.title,
+                h.value,
+                h.min_value,
+                h.max_value,
+                h.measure_unit,
+                h.type
+            FROM ({HISTORY_SOURCES[resolution]}) h
+            WHERE {" AND ".join(where_conditions)}
+            ORDER BY h.measure_date, h.row_key
+        """).execution_options(yield_per=chunk_size)
+        result = await self._session.stream(query, params)
+        async for rows in result.partitions():
+            yield rows
 
-        end_epoch = self._parse_date_to_epoch(end_date)
+    def _history_query(
+        self,
+        station_id: int,
+        filters: StationHistoryRange,
+        resolution: HistoryResolution | None = None,
+    ) -> tuple[HistoryResolution, list[str], dict[str, Any]]:
+        start_epoch, end_epoch = self._parse_history_range(
+            filters.start_date, filters.end_date
+        )
+        if resolution is None:
+            resolution = (
+                self._pick_resolution(start_epoch, end_epoch)
+                if filters.resolution == "auto"
+                else filters.resolution
+            )
+
+        where_conditions = ["h.station_id = :station_id"]
+        params: dict[str, Any] = {"station_id": station_id}
+        if start_epoch is not None:
+            where_conditions.append("h.measure_date >= :start_date_epoch")
+            params["start_date_epoch"] = start_epoch
         if end_epoch is not None:
-            if end_date and len(end_date) == 10:  # noqa PLR2004
-                try:
-                    datetime.strptime(end_date, "%Y-%m-%d")
-                    end_epoch += (24 * 60 * 60) - 1
-                except ValueError:
-                    pass
+            where_conditions.append("h.measure_date <= :end_date_epoch")
+            params["end_date_epoch"] = end_epoch
 
-            where_conditions.append("m.measure_date <= :end_date_epoch")
-            final_params["end_date_epoch"] = end_epoch
+        return resolution, where_conditions, params
 
-        if where_conditions:
-            base_query.append("WHERE " + " AND ".join(where_conditions))
+    async def _get_downsampled_history(
+        self, source: str, where_clause: str, params: dict[str, Any], max_points: int
+    ) -> list[Record]:
+        # Divide a janela em no máximo `max_points` baldes de tempo por tipo de
+        # parâmetro e agrega cada balde no banco (média, mínimo e máximo).
+        query = f"""
+            WITH filtered AS (
+                SELECT h.*
+                FROM ({source}) h
+                WHERE {where_clause}
+            ),
+            bounds AS (
+                SELECT
+                    MIN(measure_date) AS lower_bound,
+                    GREATEST(
+                        CEIL((MAX(measure_date) - MIN(measure_date) + 1)::NUMERIC
+                            / :max_points)::BIGINT,
+                        1
+                    ) AS bucket_width
+                FROM filtered
+            )
+            SELECT
+                f.title,
+                SUM(f.sum_value) / SUM(f.sample_count) AS value,
+                MIN(COALESCE(f.min_value, f.value)) AS min_value,
+                MAX(COALESCE(f.max_value, f.value)) AS max_value,
+                f.measure_unit,
+                f.type,
+                b.lower_bound
+                    + ((f.measure_date - b.lower_bound) / b.bucket_width) * b.bucket_width
+                    AS measure_date
+            FROM filtered f
+            CROSS JOIN bounds b
+            GROUP BY
+                f.title,
+                f.measure_unit,
+                f.type,
+                b.lower_bound,
+                b.bucket_width,
+                (f.measure_date - b.lower_bound) / b.bucket_width
+            ORDER BY measure_date DESC
+        """
+        return await fetch_records(self._session, query, {**params, "max_points": max_points})
 
-        base_query.append("ORDER BY m.measure_date DESC")
+    def _parse_history_range(
+        self, start_date: str | None, end_date: str | None
+    ) -> tuple[int | None, int | None]:
+        start_epoch = self._parse_date_to_epoch(start_date)
+        end_epoch = self._parse_date_to_epoch(end_date)
+        if end_epoch is not None and end_date and len(end_date) == 10:  # noqa PLR2004
+            try:
+                datetime.strptime(end_date, "%Y-%m-%d")
+                end_epoch += (24 * 60 * 60) - 1
+            except ValueError:
+                pass
+        return start_epoch, end_epoch
 
-        final_sql_string = " ".join(base_query)
+    def _pick_resolution(
+        self, start_epoch: int | None, end_epoch: int | None
+    ) -> HistoryResolution:
+        if start_epoch is None:
+            return "raw"
+        if end_epoch is None:
+            end_epoch = int(datetime.now(timezone.utc).timestamp())
 
-        query = text(final_sql_string)
-        result = await self._session.execute(query, final_params)
-        return result.fetchall()
+        window = end_epoch - start_epoch
+        if window >= self.DAILY_MIN_RANGE:
+            return "day"
+        if window >= self.HOURLY_MIN_RANGE:
+            return "hour"
+        return "raw"
 
     async def get_alert_type_distribution(
         self, station_id: int | None = None
@@ -66,13 +301,13 @@ class DashboardService:
         sql_query = """
             SELECT
                 ta.name AS name,
-                COALESCE(COUNT(a.id), 0) AS total
+                COALESCE(SUM(c.unread), 0)::BIGINT AS total
             FROM
                 type_alerts ta
             JOIN
                 parameters p ON ta.parameter_id = p.id
             LEFT JOIN
-                alerts a ON a.type_alert_id = ta.id AND a.is_read = false
+                alert_counters c ON c.type_alert_id = ta.id
         """
 
         where_clauses = ["ta.is_active = true"]
@@ -105,56 +340,121 @@ class DashboardService:
             station_where_clause = " AND p.station_id = :station_id"
             base_params["station_id"] = station_id
 
-        queries = {
-            "R": (
-                "SELECT COUNT(*) AS total "
-                "FROM alerts a "
-                "JOIN type_alerts ta ON a.type_alert_id = ta.id "
-                f"{station_join_clause} "
-                f"WHERE ta.status = 'R' AND a.is_read = false{station_where_clause}"
-            ),
-            "Y": (
-                "SELECT COUNT(*) AS total "
-                "FROM alerts a "
-                "JOIN type_alerts ta ON a.type_alert_id = ta.id "
-                f"{station_join_clause} "
-                f"WHERE ta.status = 'Y' AND a.is_read = false{station_where_clause}"
-            ),
-            "G": (
-                "SELECT COUNT(*) AS total "
-                "FROM alerts a "
-                "JOIN type_alerts ta ON a.type_alert_id = ta.id "
-                f"{station_join_clause} "
-                f"WHERE ta.status = 'G' AND a.is_read = false{station_where_clause}"
-            ),
-        }
-        counts = {}
-        for key, query in queries.items():
-            result = await self._session.execute(text(query), base_params)
-            counts[key] = int(result.scalar() or 0)
-        return counts
+        query = text(
+            "SELECT "
+            "COALESCE(SUM(c.unread) FILTER (WHERE ta.status = 'R'), 0) AS \"R\", "
+            "COALESCE(SUM(c.unread) FILTER (WHERE ta.status = 'Y'), 0) AS \"Y\", "
+            "COALESCE(SUM(c.unread) FILTER (WHERE ta.status = 'G'), 0) AS \"G\" "
+            "FROM alert_counters c "
+            "JOIN type_alerts ta ON c.type_alert_id = ta.id "
+            f"{station_join_clause} "
+            f"WHERE 1=1{station_where_clause}"
+        )
+        result = await self._session.execute(query, base_params)
+        row = result.one()
+        return {key: int(value or 0) for key, value in row._asdict().items()}
 
     async def get_station_status(self) -> dict[str, int]:
-        total_query = "SELECT COUNT(*) AS total FROM weather_stations;"
-        active_query = "SELECT COUNT(*) AS total FROM weather_stations WHERE is_active = true;"
+        query = text("""
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE is_active = true) AS active
+            FROM weather_stations
+        """)
+        result = await self._session.execute(query)
+        row = result.one()
+        return {"total": int(row.total or 0), "active": int(row.active or 0)}
 
-        total_result = await self._session.execute(text(total_query))
-        active_result = await self._session.execute(text(active_query))
+    async def get_summary(self, station_id: int | None = None) -> dict[str, Any]:
+        # Todos os widgets da página inicial em uma única ida ao banco.
+        params: dict[str, Any] = {}
+        station_join_clause = ""
+        station_where_clause = ""
+        if station_id is not None:
+            station_join_clause = "JOIN parameters p ON ta.parameter_id = p.id"
+            station_where_clause = "AND p.station_id = :station_id"
+            params["station_id"] = station_id
 
+        query = text(f"""
+            WITH alert_counts AS (
+                SELECT
+                    COALESCE(SUM(c.unread) FILTER (WHERE ta.status = 'R'), 0)::BIGINT AS r,
+                    COALESCE(SUM(c.unread) FILTER (WHERE ta.status = 'Y'), 0)::BIGINT AS y,
+                    COALESCE(SUM(c.unread) FILTER (WHERE ta.status = 'G'), 0)::BIGINT AS g
+                FROM alert_counters c
+                JOIN type_alerts ta ON c.type_alert_id = ta.id
+                {station_join_clause}
+                WHERE 1=1 {station_where_clause}
+            ),
+            alert_types AS (
+                SELECT
+                    COALESCE(
+                        JSONB_AGG(
+                            JSONB_BUILD_OBJECT('name', d.name, 'total', d.total)
+                            ORDER BY d.total DESC
+                        ),
+                        '[]'::JSONB
+                    ) AS items
+                FROM (
+                    SELECT ta.name, COALESCE(SUM(c.unread), 0)::BIGINT AS total
+                    FROM type_alerts ta
+                    JOIN parameters p ON ta.parameter_id = p.id
+                    LEFT JOIN alert_counters c ON c.type_alert_id = ta.id
+                    WHERE ta.is_active = true {station_where_clause}
+                    GROUP BY ta.name
+                ) d
+            ),
+            station_status AS (
+                SELECT
+                    COUNT(*) AS total,
+                    COUNT(*) FILTER (WHERE is_active = true) AS active
+                FROM weather_stations
+            ),
+            measures_status AS (
+                SELECT
+                    COALESCE(
+                        JSONB_AGG(JSONB_BUILD_OBJECT('label', s.label, 'number', s.number)),
+                        '[]'::JSONB
+                    ) AS items
+                FROM (
+                    SELECT pt.name AS label, SUM(c.total)::BIGINT AS number
+                    FROM measure_counters c
+                    JOIN parameter_types pt ON c.parameter_type_id = pt.id
+                    GROUP BY pt.name
+                    HAVING SUM(c.total) > 0
+                ) s
+            )
+            SELECT
+                ac.r,
+                ac.y,
+                ac.g,
+                at.items AS alert_types,
+                ss.total AS stations_total,
+                ss.active AS stations_active,
+                ms.items AS measures_status
+            FROM alert_counts ac
+            CROSS JOIN alert_types at
+            CROSS JOIN station_status ss
+            CROSS JOIN measures_status ms
+        """)
+        result = await self._session.execute(query, params)
+        row = result.one()
         return {
-            "total": int(total_result.scalar() or 0),
-            "active": int(active_result.scalar() or 0),
+            "alert_counts": {"R": row.r, "Y": row.y, "G": row.g},
+            "alert_types": row.alert_types,
+            "station_status": {"total": row.stations_total, "active": row.stations_active},
+            "measures_status": row.measures_status,
         }
 
     async def get_measures_status(self) -> Sequence[Row[Any]]:
         query = text("""
             SELECT
                 pt.name AS label,
-                COUNT(m.id) AS number
-            FROM measures m
-            JOIN parameters p ON m.parameter_id = p.id
-            JOIN parameter_types pt ON p.parameter_type_id = pt.id
+                SUM(c.total)::BIGINT AS number
+            FROM measure_counters c
+            JOIN parameter_types pt ON c.parameter_type_id = pt.id
             GROUP BY pt.name
+            HAVING SUM(c.total) > 0
         """)
         result = await self._session.execute(query)
         return result.fetchall()
@@ -163,20 +463,14 @@ class DashboardService:
         query = text("""
             SELECT
                 pt.name AS title,
-                m.value AS value,
+                lm.value AS value,
                 pt.measure_unit AS measure_unit,
                 pt.detect_type AS type,
-                m.measure_date AS measure_date
-            FROM measures m
-            JOIN parameters p ON m.parameter_id = p.id
+                lm.measure_date AS measure_date
+            FROM parameters p
+            JOIN latest_measures lm ON lm.parameter_id = p.id
             JOIN parameter_types pt ON p.parameter_type_id = pt.id
-            WHERE
-                p.station_id = :station_id
-                AND m.measure_date = (
-                    SELECT MAX(m2.measure_date)
-                    FROM measures m2
-                    WHERE m2.parameter_id = p.id
-                )
+            WHERE p.station_id = :station_id
         """)
         result = await self._session.execute(query, {"station_id": station_id})
         return list(result.fetchall())
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+import json
+import math
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from app.config.settings import settings
+from app.schemas.measure import IngestBatchReport, IngestError, IngestReport
+from app.service.alert_engine import ALERT_COLUMNS, AlertEngine, ThresholdIndex
+from app.service.catalog import ReferenceCatalog
+from app.service.stateful_rules import StatefulRuleEngine
+
+MEASURE_COLUMNS = ("id", "parameter_id", "measure_date", "value")
+MAX_ERRORS_PER_BATCH = 100
+MIN_TIMESTAMP = int(datetime.min.replace(tzinfo=timezone.utc).timestamp())
+MAX_TIMESTAMP = int(datetime.max.replace(tzinfo=timezone.utc).timestamp())
+
+# (uid da estação, id ou nome do tipo de parâmetro) -> id em `parameters`
+ParameterIndex = dict[tuple[str, int | str], int]
+
+
+def _is_parameter_type(value: Any) -> bool:
+    return isinstance(value, (int, str)) and not isinstance(value, bool)
+
+
+class ReadingParser:
+    """Converte uma linha NDJSON em um registro pronto para o COPY.
+
+    Formato: {"uid": "...", "parameter_type": 3 | "Temperatura",
+    "timestamp": 1712553600 | "2024-04-08T06:00:00+00:00", "value": 25.5}
+    """
+
+    def __init__(self, parameters: ParameterIndex) -> None:
+        self._parameters = parameters
+
+    def parse(self, line: bytes) -> tuple[int, int, float]:
+        try:
+            reading = json.loads(line)
+            uid = reading["uid"]
+            parameter_type = reading["parameter_type"]
+            # Listas e objetos não servem de chave do índice (TypeError no `get`).
+            if not isinstance(uid, str) or not _is_parameter_type(parameter_type):
+                raise ValueError("uid deve ser texto e parameter_type, id ou nome")
+            timestamp = reading["timestamp"]
+            value = float(reading["value"])
+            if not math.isfinite(value):
+                raise ValueError(f"valor não finito: {reading['value']!r}")
+        except (ValueError, TypeError, OverflowError) as e:
+            raise ValueError(f"Leitura inválida: {e}")
+        except KeyError as e:
+            raise ValueError(f"Campo obrigatório ausente: {e}")
+
+        parameter_id = self._parameters.get((uid, parameter_type))
+        if parameter_id is None:
+            raise ValueError(f"Parâmetro {parameter_type!r} não encontrado na estação {uid!r}")
+        return parameter_id, self._parse_timestamp(timestamp), value
+
+    @staticmethod
+    def _parse_timestamp(timestamp: Any) -> int:
+        if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            # Fora do intervalo do `datetime` (e de NaN/infinito) não é uma data.
+            if MIN_TIMESTAMP <= timestamp <= MAX_TIMESTAMP:
+                return int(timestamp)
+        elif isinstance(timestamp, str):
+            try:
+                parsed = datetime.fromisoformat(timestamp)
+            except ValueError:
+                pass
+            else:
+                # Sem fuso explícito vale UTC, não o fuso local do servidor.
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                return int(parsed.timestamp())
+        raise ValueError(f"Timestamp inválido: {timestamp!r}")
+
+
+class MeasureIngestService:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._alert_engine = AlertEngine(session)
+
+    async def ingest(self, body: AsyncIterator[bytes]) -> IngestReport:
+        """Lê o corpo NDJSON em streaming e grava as leituras em lotes via COPY.
+
+        Cada lote é gravado (e confirmado) de forma independente; linhas
+        inválidas são recusadas e relatadas sem interromper o lote.
+        """
+        parser = ReadingParser(await self._load_parameter_index())
+        thresholds = await self._alert_engine.load_index()
+        batch_size = settings.INGEST_BATCH_SIZE
+        batches: list[IngestBatchReport] = []
+        records: list[tuple[int, int, float]] = []
+        errors: list[IngestError] = []
+        rejected = 0
+        line_number = 0
+
+        max_length = settings.INGEST_MAX_LINE_BYTES
+        async for line in _iter_lines(body, max_length):
+            line_number += 1
+            if line is not None and not line.strip():
+                continue
+            try:
+                if line is None:
+                    raise ValueError(f"Linha maior que {max_length} bytes")
+                records.append(parser.parse(line))
+            except ValueError as e:
+                rejected += 1
+                if len(errors) < MAX_ERRORS_PER_BATCH:
+                    errors.append(IngestError(line=line_number, error=str(e)))
+            if len(records) + rejected >= batch_size:
+                batches.append(
+                    await self._write_batch(
+                        len(batches) + 1, records, rejected, errors, thresholds
+                    )
+                )
+                records, errors, rejected = [], [], 0
+
+        if records or rejected:
+            batches.append(
+                await self._write_batch(
+                    len(batches) + 1, records, rejected, errors, thresholds
+                )
+            )
+
+        return IngestReport(
+            accepted=sum(batch.accepted for batch in batches),
+            rejected=sum(batch.rejected for batch in batches),
+            alerts=sum(batch.alerts for batch in batches),
+            batches=batches,
+        )
+
+    async def _write_batch(
+        self,
+        number: int,
+        records: list[tuple[int, int, float]],
+        rejected: int,
+        errors: list[IngestError],
+        thresholds: ThresholdIndex,
+    ) -> IngestBatchReport:
+        if not records:
+            return IngestBatchReport(
+                batch=number, accepted=0, rejected=rejected, errors=errors
+            )
+        try:
+            # Os ids são reservados antes do COPY (que não tem RETURNING) para que
+            # os alertas do lote possam referenciar as medidas. A consulta pela
+            # sessão abre a transação do lote; o COPY roda na mesma conexão e tudo
+            # é confirmado pelo commit da sessão.
+            result = await self._session.execute(
+                text("""
+                    SELECT nextval(pg_get_serial_sequence('measures', 'id'))
+                    FROM generate_series(1, :count)
+                """),
+                {"count": len(records)},
+            )
+            measures = [
+                (measure_id, *record)
+                for measure_id, record in zip(result.scalars().all(), records, strict=True)
+            ]
+            connection = await self._session.connection()
+            raw = await connection.get_raw_connection()
+            driver: Any = raw.driver_connection
+            await driver.copy_records_to_table(
+                "measures", records=measures, columns=MEASURE_COLUMNS
+            )
+            alerts = AlertEngine.evaluate(thresholds, measures)
+            alerts += await StatefulRuleEngine().evaluate(driver, measures)
+            if alerts:
+                await driver.copy_records_to_table(
+                    "alerts", records=alerts, columns=ALERT_COLUMNS
+                )
+            await self._session.commit()
+        except Exception as e:
+            # O lote é uma transação: uma falha recusa o lote inteiro e o estado
+            # das regras em memória é descartado junto.
+            await self._session.rollback()
+            StatefulRuleEngine().clear()
+            errors.append(IngestError(line=0, error=f"Falha ao gravar o lote: {e}"))
+            return IngestBatchReport(
+                batch=number, accepted=0, rejected=rejected + len(records), errors=errors
+            )
+        return IngestBatchReport(
+            batch=number,
+            accepted=len(records),
+            rejected=rejected,
+            alerts=len(alerts),
+            errors=errors,
+        )
+
+    async def _load_parameter_index(self) -> ParameterIndex:
+        catalog = ReferenceCatalog().snapshot
+        if catalog is not None:
+            rows = [
+                (
+                    station["uid"],
+                    parameter["parameter_id"],
+                    parameter["parameter_type_id"],
+                    parameter["name_parameter"],
+                )
+                for station in catalog.stations.values()
+                for parameter in station["parameters"]
+            ]
+        else:
+            result = await self._session.execute(
+                text("""
+                    SELECT ws.uid, p.id, p.parameter_type_id, pt.name
+                    FROM parameters p
+                    JOIN weather_stations ws ON ws.id = p.station_id
+                    JOIN parameter_types pt ON pt.id = p.parameter_type_id
+                    WHERE p.is_active = true
+                """)
+            )
+            rows = [tuple(row) for row in result.fetchall()]
+            await self._session.commit()
+
+        index: ParameterIndex = {}
+        for uid, parameter_id, parameter_type_id, type_name in rows:
+            index[(uid, parameter_type_id)] = parameter_id
+            index[(uid, type_name)] = parameter_id
+        return index
+
+
+async def _iter_lines(
+    body: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[bytes | None]:
+    """Separa o corpo em linhas sem acumular mais que `max_length` bytes.
+
+    Uma linha maior que o limite é descartada enquanto chega e produz `None`.
+    """
+    pending = bytearray()
+    oversized = False
+    async for chunk in body:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if oversized or len(pending) + end - start > max_length:
+                yield None
+            elif pending:
+                pending += chunk[start:end]
+                yield bytes(pending)
+            else:
+                yield chunk[start:end]
+            pending.clear()
+            oversized = False
+            start = end + 1
+        if not oversized and len(pending) + len(chunk) - start > max_length:
+            pending.clear()
+            oversized = True
+        elif not oversized:
+            pending += chunk[start:]
+    if oversized:
+        yield None
+    elif pending:
+        yield bytes(pending)
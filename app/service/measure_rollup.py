@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from app.config.settings import settings
+from app.dependency.database import Database
+
+ROLLUP_BUCKETS = {
+    "measures_rollup_hourly": 60 * 60,
+    "measures_rollup_daily": 24 * 60 * 60,
+}
+
+# Parciais por hora das medidas inseridas, gravadas em `measures_rollup_pending`
+# pelo gatilho `trg_measures_rollup_insert` (migração em alembic/service); o
+# rollup diário é derivado delas.
+PENDING_COLUMNS = """
+    parameter_id, bucket, sample_count, min_value, max_value, sum_value, last_value, last_date
+"""
+
+
+def _merge_cte(name: str, table: str, width: int) -> str:
+    return f"""
+    {name} AS (
+        INSERT INTO {table} AS r ({PENDING_COLUMNS})
+        SELECT
+            b.parameter_id,
+            (b.bucket / {width}) * {width},
+            SUM(b.sample_count),
+            MIN(b.min_value),
+            MAX(b.max_value),
+            SUM(b.sum_value),
+            (ARRAY_AGG(b.last_value ORDER BY b.last_date DESC, b.id DESC))[1],
+            MAX(b.last_date)
+        FROM batch b
+        GROUP BY b.parameter_id, (b.bucket / {width}) * {width}
+        ON CONFLICT (parameter_id, bucket) DO UPDATE SET
+            sample_count = r.sample_count + EXCLUDED.sample_count,
+            min_value = LEAST(r.min_value, EXCLUDED.min_value),
+            max_value = GREATEST(r.max_value, EXCLUDED.max_value),
+            sum_value = r.sum_value + EXCLUDED.sum_value,
+            last_value = CASE
+                WHEN EXCLUDED.last_date >= r.last_date THEN EXCLUDED.last_value
+                ELSE r.last_value
+            END,
+            last_date = GREATEST(r.last_date, EXCLUDED.last_date)
+    )
+    """
+
+
+ROLLUP_MERGES = ",".join(
+    _merge_cte(f"merge_{table}", table, width) for table, width in ROLLUP_BUCKETS.items()
+)
+
+# Retira um lote da fila e soma nas tabelas de rollup em uma única instrução.
+REFRESH_ROLLUPS = f"""
+    WITH batch AS (
+        DELETE FROM measures_rollup_pending
+        WHERE id IN (
+            SELECT id FROM measures_rollup_pending
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        RETURNING id, {PENDING_COLUMNS}
+    ),
+    {ROLLUP_MERGES}
+    SELECT COUNT(*) FROM batch
+"""
+
+
+ROLLUP_COLUMNS_FROM_MEASURES = """
+    COUNT(*), MIN(m.value), MAX(m.value), SUM(m.value),
+    (ARRAY_AGG(m.value ORDER BY m.measure_date DESC, m.id DESC))[1],
+    MAX(m.measure_date)
+"""
+
+REPLACE_ROLLUP = """
+    ON CONFLICT (parameter_id, bucket) DO UPDATE SET
+        sample_count = EXCLUDED.sample_count,
+        min_value = EXCLUDED.min_value,
+        max_value = EXCLUDED.max_value,
+        sum_value = EXCLUDED.sum_value,
+        last_value = EXCLUDED.last_value,
+        last_date = EXCLUDED.last_date
+"""
+
+# Horas marcadas por alterações/exclusões em `measures` são recalculadas do zero.
+# As parciais pendentes dessas horas já confirmadas são descartadas na mesma
+# instrução (mesmo snapshot das medidas lidas), então nada é contado duas vezes;
+# as confirmadas depois entram normalmente pela fila. Retorna os dias afetados.
+RECOMPUTE_STALE_HOURS = f"""
+    WITH stale AS (
+        DELETE FROM measures_rollup_stale
+        WHERE id IN (
+            SELECT id FROM measures_rollup_stale
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        RETURNING parameter_id, bucket
+    ),
+    hours AS (
+        SELECT DISTINCT parameter_id, bucket FROM stale
+    ),
+    dropped AS (
+        DELETE FROM measures_rollup_pending p
+        USING hours h
+        WHERE p.parameter_id = h.parameter_id AND p.bucket = h.bucket
+    ),
+    recomputed AS (
+        INSERT INTO measures_rollup_hourly AS r ({PENDING_COLUMNS})
+        SELECT h.parameter_id, h.bucket, {ROLLUP_COLUMNS_FROM_MEASURES}
+        FROM hours h
+        JOIN measures m
+            ON m.parameter_id = h.parameter_id
+            AND m.measure_date >= h.bucket
+            AND m.measure_date < h.bucket + 3600
+            AND m.value IS NOT NULL
+        GROUP BY h.parameter_id, h.bucket
+        {REPLACE_ROLLUP}
+    ),
+    emptied AS (
+        DELETE FROM measures_rollup_hourly r
+        USING hours h
+        WHERE r.parameter_id = h.parameter_id AND r.bucket = h.bucket
+        AND NOT EXISTS (
+            SELECT 1 FROM measures m
+            WHERE m.parameter_id = h.parameter_id
+            AND m.measure_date >= h.bucket
+            AND m.measure_date < h.bucket + 3600
+            AND m.value IS NOT NULL
+        )
+    )
+    SELECT DISTINCT parameter_id, (bucket / 86400) * 86400 AS bucket FROM hours
+"""
+
+# O dia afetado é refeito a partir das horas já recalculadas.
+RECOMPUTE_STALE_DAYS = f"""
+    WITH days AS (
+        SELECT *
+        FROM unnest(CAST(:parameter_ids AS BIGINT[]), CAST(:buckets AS BIGINT[]))
+            AS d(parameter_id, bucket)
+    ),
+    emptied AS (
+        DELETE FROM measures_rollup_daily r
+        USING days d
+        WHERE r.parameter_id = d.parameter_id AND r.bucket = d.bucket
+        AND NOT EXISTS (
+            SELECT 1 FROM measures_rollup_hourly h
+            WHERE h.parameter_id = d.parameter_id
+            AND h.bucket >= d.bucket
+            AND h.bucket < d.bucket + 86400
+        )
+    )
+    INSERT INTO measures_rollup_daily AS r ({PENDING_COLUMNS})
+    SELECT
+        d.parameter_id,
+        d.bucket,
+        SUM(h.sample_count),
+        MIN(h.min_value),
+        MAX(h.max_value),
+        SUM(h.sum_value),
+        (ARRAY_AGG(h.last_value ORDER BY h.last_date DESC))[1],
+        MAX(h.last_date)
+    FROM days d
+    JOIN measures_rollup_hourly h
+        ON h.parameter_id = d.parameter_id
+        AND h.bucket >= d.bucket
+        AND h.bucket < d.bucket + 86400
+    GROUP BY d.parameter_id, d.bucket
+    {REPLACE_ROLLUP}
+"""
+
+
+class MeasureRollupService:
+    LOCK_KEY = 7_240_001
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def refresh(self, batch_size: int) -> int:
+        """Consome até `batch_size` parciais pendentes e as soma nas tabelas de rollup.
+
+        Antes, recalcula as horas (e os dias) marcados por alterações e exclusões
+        em `measures`. Retorna quantas parciais e dias foram processados. Medidas
+        atrasadas (measure_date antiga) também são incorporadas, e a fila só contém
+        linhas já confirmadas, então a ordem de commit dos ids não importa.
+        """
+        locked = await self._session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": self.LOCK_KEY}
+        )
+        if not locked.scalar():
+            await self._session.rollback()
+            return 0
+
+        consumed = await self._recompute_stale(batch_size)
+        result = await self._session.execute(text(REFRESH_ROLLUPS), {"batch_size": batch_size})
+        consumed += int(result.scalar() or 0)
+        if not consumed:
+            await self._session.rollback()
+            return 0
+        await self._session.commit()
+        return consumed
+
+    async def _recompute_stale(self, batch_size: int) -> int:
+        result = await self._session.execute(
+            text(RECOMPUTE_STALE_HOURS), {"batch_size": batch_size}
+        )
+        days = result.fetchall()
+        if days:
+            await self._session.execute(
+                text(RECOMPUTE_STALE_DAYS),
+                {
+                    "parameter_ids": [row.parameter_id for row in days],
+                    "buckets": [row.bucket for row in days],
+                },
+            )
+        return len(days)
+
+
+async def refresh_measure_rollups() -> None:
+    async with Database().session as session:
+        while await MeasureRollupService(session).refresh(settings.ROLLUP_BATCH_SIZE):
+            pass
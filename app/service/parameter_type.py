@@ -5,12 +5,33 @@ from sqlalchemy import select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.models.db_model import ParameterType
+from app.modules.cache import cached, query_cache
+from app.modules.statements import statements
 from app.schemas.parameter_type import (
     CreateParameterType,
     FilterParameterType,
     ParameterTypeResponse,
     UpdateParameterType,
 )
+from app.service.catalog import ReferenceCatalog
+
+LIST_PARAMETER_TYPES = statements.register(
+    "parameter_type.list",
+    """
+    select
+    pt.id,
+    pt."name",
+    pt.detect_type,
+    pt.factor,
+    pt."offset",
+    pt.measure_unit,
+    pt.qnt_decimals,
+    pt.is_active
+    from parameter_types pt
+    where (CAST(:name AS TEXT) IS NULL OR pt.name like :name)
+    and (CAST(:is_active AS BOOLEAN) IS NULL OR pt.is_active = :is_active)
+    """,
+)
 
 
 class ParameterTypeService:
@@ -34,37 +55,26 @@ class ParameterTypeService:
         self._session.add(parameter_type)
         await self._session.flush()
         await self._session.commit()
+        await query_cache.invalidate("parameter_types")
+        ReferenceCatalog().invalidate()
 
     async def list_parameter_types(
         self, filters: FilterParameterType | None = None
     ) -> list[ParameterTypeResponse]:
-        query = text(
-            f"""
-            select
-            pt.id,
-            pt."name",
-            pt.detect_type,
-            pt.factor,
-            pt."offset",
-            pt.measure_unit,
-            pt.qnt_decimals,
-            pt.is_active
-            from parameter_types pt
-            where 1=1
-            {"and pt.name like :name" if filters and filters.name else ""}
-            {
-                "and pt.is_active = :is_active"
-                if filters and filters.is_active is not None
-                else ""
-            }
-    """
-        )
-        if filters and filters.name:
-            query = query.bindparams(name=f"%{filters.name}%")
-        if filters and filters.is_active is not None:
-            query = query.bindparams(is_active=filters.is_active)
+        catalog = ReferenceCatalog().snapshot
+        if catalog is not None:
+            return catalog.get_parameter_types(filters)
+        return await self._query_parameter_types(filters)
 
-        result = await self._session.execute(query)
+    @cached("parameter_types")
+    async def _query_parameter_types(
+        self, filters: FilterParameterType | None = None
+    ) -> list[ParameterTypeResponse]:
+        params = {
+            "name": f"%{filters.name}%" if filters and filters.name else None,
+            "is_active": filters.is_active if filters else None,
+        }
+        result = await self._session.execute(LIST_PARAMETER_TYPES.clause, params)
         parameter_types = result.fetchall()
         return [ParameterTypeResponse(**pt._asdict()) for pt in parameter_types]
 
@@ -76,7 +86,10 @@ class ParameterTypeService:
             .values(is_active=False, last_update=datetime.datetime.now())
         )
         await self._session.commit()
+        await query_cache.invalidate("parameter_types")
+        ReferenceCatalog().invalidate()
 
+    @cached("parameter_types")
     async def get_parameter_type(self, parameter_type_id: int) -> ParameterTypeResponse:
         parameter_type = await self._session.get(ParameterType, parameter_type_id)
         if parameter_type is None:
@@ -107,6 +120,8 @@ class ParameterTypeService:
             .values(**data_update)
         )
         await self._session.commit()
+        await query_cache.invalidate("parameter_types")
+        ReferenceCatalog().invalidate()
 
     async def _search_parameter_type_id(self, parameter_type_id: int) -> ParameterType:
         query = text("SELECT * FROM parameter_types WHERE id = :parameter_type_id").bindparams(
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import time
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from app.config.settings import settings
+from app.modules.security import TokenManager
+
+
+class RefreshTokenService:
+    """Refresh tokens opacos guardados apenas como HMAC.
+
+    Cada uso troca o token por outro da mesma família (rotação). Reapresentar um
+    token já trocado indica vazamento e revoga a família inteira.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._token_manager = TokenManager()
+
+    async def issue(self, user_id: int, family_id: str | None = None) -> str:
+        token = self._token_manager.create_refresh_token()
+        now = int(time.time())
+        await self._session.execute(
+            text("""
+                INSERT INTO refresh_tokens (
+                    user_id, family_id, token_hash, expires_at, create_date
+                )
+                VALUES (:user_id, :family_id, :token_hash, :expires_at, :now)
+            """),
+            {
+                "user_id": user_id,
+                "family_id": family_id or str(uuid.uuid4()),
+                "token_hash": self._token_manager.hash_refresh_token(token),
+                "expires_at": now + settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+                "now": now,
+            },
+        )
+        await self._session.commit()
+        return token
+
+    async def rotate(self, token: str) -> tuple[int, str]:
+        """Revoga `token` e emite o próximo da família; retorna (user_id, novo token)."""
+        now = int(time.time())
+        result = await self._session.execute(
+            text("""
+                SELECT id, user_id, family_id, expires_at, revoked_at
+                FROM refresh_tokens
+                WHERE token_hash = :token_hash
+                FOR UPDATE
+            """),
+            {"token_hash": self._token_manager.hash_refresh_token(token)},
+        )
+        row = result.fetchone()
+        if row is None or row.expires_at <= now:
+            await self._session.rollback()
+            raise self._invalid()
+        if row.revoked_at is not None:
+            await self._revoke_family(str(row.family_id), now)
+            raise self._invalid()
+
+        await self._session.execute(
+            text("UPDATE refresh_tokens SET revoked_at = :now WHERE id = :id"),
+            {"now": now, "id": row.id},
+        )
+        return row.user_id, await self.issue(row.user_id, str(row.family_id))
+
+    async def revoke(self, token: str) -> None:
+        result = await self._session.execute(
+            text("SELECT family_id FROM refresh_tokens WHERE token_hash = :token_hash"),
+            {"token_hash": self._token_manager.hash_refresh_token(token)},
+        )
+        family_id = result.scalar()
+        if family_id is None:
+            raise self._invalid()
+        await self._revoke_family(str(family_id), int(time.time()))
+
+    async def _revoke_family(self, family_id: str, now: int) -> None:
+        await self._session.execute(
+            text("""
+                UPDATE refresh_tokens SET revoked_at = :now
+                WHERE family_id = :family_id AND revoked_at IS NULL
+            """),
+            {"now": now, "family_id": family_id},
+        )
+        await self._session.commit()
+
+    @staticmethod
+    def _invalid() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido ou expirado",
+        )
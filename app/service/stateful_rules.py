@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+import math
+import operator
+import time
+from typing import Any, Callable, Sequence
+
+from app.config.settings import settings
+from app.dependency.database import Database
+from app.modules.common import Singleton
+
+RULE_KINDS = ("rate_of_change", "sustained", "zscore")
+
+STATE_COLUMNS = ("last_date", "last_value", "since", "fired", "sample_count", "mean", "m2")
+
+RULES_QUERY = f"""
+    SELECT
+        ta.id, ta.parameter_id, COALESCE(sr.threshold, ta.value) AS value, ta.math_signal,
+        sr.kind, sr.window_seconds,
+        COALESCE(st.version, 0) AS version, {", ".join(f"st.{c}" for c in STATE_COLUMNS)}
+    FROM alert_stateful_rules sr
+    JOIN type_alerts ta ON ta.id = sr.type_alert_id
+    LEFT JOIN alert_rule_state st ON st.type_alert_id = sr.type_alert_id
+    WHERE ta.is_active = true AND ta.parameter_id IS NOT NULL
+"""
+
+# Trava as regras dos parâmetros do lote: dois workers gravando o mesmo
+# parâmetro avançam o estado um de cada vez.
+LOCK_RULES_QUERY = f"""
+    {RULES_QUERY}
+    AND ta.parameter_id = ANY($1::BIGINT[])
+    ORDER BY ta.id
+    FOR UPDATE OF sr
+"""
+
+SAVE_STATE_QUERY = f"""
+    INSERT INTO alert_rule_state (type_alert_id, version, {", ".join(STATE_COLUMNS)})
+    VALUES ($1, 1, $2, $3, $4, $5, $6, $7, $8)
+    ON CONFLICT (type_alert_id) DO UPDATE SET
+        version = alert_rule_state.version + 1,
+        {", ".join(f"{c} = EXCLUDED.{c}" for c in STATE_COLUMNS)}
+"""
+
+# Leitura de referência do rate_of_change: a última medida do parâmetro em ou
+# antes de `measure_date - window` (inclui as do lote, já gravadas pelo COPY),
+# buscada pelo índice (parameter_id, measure_date, id).
+RATE_REFERENCE_QUERY = """
+    SELECT r.parameter_id, r.at, m.value
+    FROM unnest($1::BIGINT[], $2::BIGINT[]) AS r(parameter_id, at)
+    CROSS JOIN LATERAL (
+        SELECT m.value
+        FROM measures m
+        WHERE m.parameter_id = r.parameter_id AND m.measure_date <= r.at
+        ORDER BY m.measure_date DESC, m.id DESC
+        LIMIT 1
+    ) m
+"""
+
+COMPARE: dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<>": operator.ne,
+}
+
+
+class StatefulRule:
+    """Regra com estado de tamanho fixo, avaliada em O(1) por leitura.
+
+    - rate_of_change: variação da leitura em relação à última leitura de pelo
+      menos `window` segundos atrás (a referência, buscada pelo motor), comparada
+      ao limite; sem leitura tão antiga, não dispara;
+    - sustained: a condição `valor <sinal> limite` vale há pelo menos `window`
+      segundos (dispara uma vez por episódio);
+    - zscore: desvio da leitura em relação à média e variância acumuladas
+      (algoritmo de Welford), comparado ao limite.
+
+    Leituras mais antigas que a última vista não alteram as regras temporais.
+    """
+
+    __slots__ = (
+        "type_alert_id",
+        "parameter_id",
+        "threshold",
+        "math_signal",
+        "kind",
+        "window",
+        "version",
+        *STATE_COLUMNS,
+    )
+
+    def __init__(self, row: Any) -> None:
+        self.type_alert_id: int = row["id"]
+        self.parameter_id: int = row["parameter_id"]
+        self.threshold = float(row["value"])
+        self.math_signal: str = row["math_signal"]
+        self.kind: str = row["kind"]
+        self.window: int = row["window_seconds"]
+        self.version: int | None = row["version"]
+        self.last_date: int | None = row["last_date"]
+        self.last_value: float | None = row["last_value"]
+        self.since: int | None = row["since"]
+        self.fired = bool(row["fired"])
+        self.sample_count = int(row["sample_count"] or 0)
+        self.mean = float(row["mean"] or 0.0)
+        self.m2 = float(row["m2"] or 0.0)
+
+    def matches(self, row: Any) -> bool:
+        """Indica se o estado em memória ainda é o gravado em `row`."""
+        return (
+            self.version == row["version"]
+            and self.parameter_id == row["parameter_id"]
+            and self.threshold == float(row["value"])
+            and self.math_signal == row["math_signal"]
+            and self.kind == row["kind"]
+            and self.window == row["window_seconds"]
+        )
+
+    def state(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, column) for column in STATE_COLUMNS)
+
+    def observe(self, measure_date: int, value: float, reference: float | None = None) -> bool:
+        compare = COMPARE.get(self.math_signal)
+        if compare is None:
+            return False
+        if self.kind == "zscore":
+            return self._observe_zscore(value, compare)
+        if self.last_date is not None and measure_date < self.last_date:
+            return False
+        if self.kind == "rate_of_change":
+            self.last_date, self.last_value = measure_date, value
+            return reference is not None and compare(value - reference, self.threshold)
+        return self._observe_sustained(measure_date, value, compare)
+
+    def _observe_sustained(
+        self, measure_date: int, value: float, compare: Callable[[float, float], bool]
+    ) -> bool:
+        self.last_date, self.last_value = measure_date, value
+        if not compare(value, self.threshold):
+            self.since, self.fired = None, False
+            return False
+        if self.since is None:
+            self.since = measure_date
+        if self.fired or measure_date - self.since < self.window:
+            return False
+        self.fired = True
+        return True
+
+    def _observe_zscore(self, value: float, compare: Callable[[float, float], bool]) -> bool:
+        hit = False
+        if self.sample_count >= max(settings.ALERT_ZSCORE_MIN_SAMPLES, 2) and self.m2 > 0:
+            deviation = math.sqrt(self.m2 / (self.sample_count - 1))
+            hit = compare((value - self.mean) / deviation, self.threshold)
+        self.sample_count += 1
+        delta = value - self.mean
+        self.mean += delta / self.sample_count
+        self.m2 += delta * (value - self.mean)
+        return hit
+
+
+class StatefulRuleEngine(metaclass=Singleton):
+    """Mantém em memória o estado das regras com estado de cada parâmetro.
+
+    O estado é gravado em `alert_rule_state` na mesma transação do lote de
+    medidas, com um número de versão. A cada lote as regras dos parâmetros
+    envolvidos são travadas e o estado em memória só é reaproveitado se a
+    versão bater; senão (outro worker, lote desfeito) é recarregado da linha.
+    """
+
+    def __init__(self) -> None:
+        self._rules: dict[int, StatefulRule] = {}
+
+    async def load(self) -> None:
+        async with Database().session as session:
+            connection = await session.connection()
+            raw = await connection.get_raw_connection()
+            rows = await raw.driver_connection.fetch(RULES_QUERY)  # type: ignore[union-attr]
+        self._rules = {row["id"]: StatefulRule(row) for row in rows}
+
+    def clear(self) -> None:
+        self._rules.clear()
+
+    async def evaluate(
+        self, driver: Any, measures: Sequence[tuple[int, int, int, float]]
+    ) -> list[tuple[int, int, int, bool]]:
+        """Avança as regras com as medidas do lote e retorna os alertas gerados.
+
+        Deve ser chamado dentro da transação que grava `measures`.
+        """
+        if not measures:
+            return []
+        parameter_ids = sorted({measure[1] for measure in measures})
+        rows = await driver.fetch(LOCK_RULES_QUERY, parameter_ids)
+        if not rows:
+            return []
+
+        by_parameter: dict[int, list[StatefulRule]] = {}
+        for row in rows:
+            rule = self._rules.get(row["id"])
+            if rule is None or not rule.matches(row):
+                rule = self._rules[row["id"]] = StatefulRule(row)
+            by_parameter.setdefault(rule.parameter_id, []).append(rule)
+
+        touched = [rule for rules in by_parameter.values() for rule in rules]
+        versions = [rule.version for rule in touched]
+        # Até a gravação confirmar, o estado em memória não corresponde a
+        # nenhuma versão do banco.
+        for rule in touched:
+            rule.version = None
+
+        now = int(time.time())
+        alerts = []
+        readings = sorted(
+            (measure for measure in measures if measure[1] in by_parameter),
+            key=lambda measure: (measure[2], measure[0]),
+        )
+        references = await self._rate_references(driver, readings, by_parameter)
+        for measure_id, parameter_id, measure_date, value in readings:
+            for rule in by_parameter[parameter_id]:
+                reference = references.get((parameter_id, measure_date - rule.window))
+                if rule.observe(measure_date, value, reference):
+                    alerts.append((rule.type_alert_id, measure_id, now, False))
+
+        await driver.executemany(
+            SAVE_STATE_QUERY, [(rule.type_alert_id, *rule.state()) for rule in touched]
+        )
+        for rule, version in zip(touched, versions, strict=True):
+            rule.version = (version or 0) + 1
+        return alerts
+
+    @staticmethod
+    async def _rate_references(
+        driver: Any,
+        readings: Sequence[tuple[int, int, int, float]],
+        by_parameter: dict[int, list[StatefulRule]],
+    ) -> dict[tuple[int, int], float]:
+        targets = sorted({
+            (parameter_id, measure_date - rule.window)
+            for _, parameter_id, measure_date, _ in readings
+            for rule in by_parameter[parameter_id]
+            if rule.kind == "rate_of_change"
+        })
+        if not targets:
+            return {}
+        parameter_ids, dates = zip(*targets, strict=True)
+        rows = await driver.fetch(RATE_REFERENCE_QUERY, list(parameter_ids), list(dates))
+        return {(row["parameter_id"], row["at"]): row["value"] for row in rows}
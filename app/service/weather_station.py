@@ -7,6 +7,9 @@ from sqlalchemy import select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.models.db_model import Parameter, WeatherStation
+from ..modules.cache import cached, query_cache
+from ..modules.fast_query import fetch_records, records_to_models
+from ..modules.statements import statements
 from ..schemas.weather_station import (
     FilterWeatherStation,
     PameterByStation,
@@ -15,6 +18,41 @@ from ..schemas.weather_station import (
     WeatherStationResponseList,
     WeatherStationUpdate,
 )
+from .catalog import ReferenceCatalog
+
+LIST_STATIONS = statements.register(
+    "weather_station.list",
+    """
+    SELECT
+        ws.id,
+        ws."name" AS name_station,
+        ws.uid,
+        ws.address,
+        ws.latitude,
+        ws.longitude,
+        ws.create_date,
+        ws.is_active,
+        COALESCE(
+        (SELECT JSONB_AGG(
+            JSONB_BUILD_OBJECT(
+                'parameter_id', p.id,
+                'parameter_type_id', p.parameter_type_id,
+                'name_parameter', pt.name
+            )
+        )
+        FROM parameters p
+        join parameter_types pt
+        on pt.id = p.parameter_type_id
+        WHERE p.station_id::BIGINT = ws.id
+        AND p.is_active = true),
+        '[]'::JSONB
+    ) AS parameters
+    FROM weather_stations ws
+    WHERE (CAST(:uid AS TEXT) IS NULL OR ws.uid = :uid)
+    AND (CAST(:is_active AS BOOLEAN) IS NULL OR ws.is_active = :is_active)
+    AND (CAST(:name_station AS TEXT) IS NULL OR ws."name" LIKE :name_station)
+    """,
+)
 
 
 class WeatherStationService:
@@ -67,6 +105,8 @@ class WeatherStationService:
 
         await self._session.flush()
         await self._session.commit()
+        await query_cache.invalidate("parameters")
+        ReferenceCatalog().invalidate()
 
     async def create_station(self, data: WeatherStationCreate) -> None:
         station_data = data.model_dump()
@@ -79,6 +119,8 @@ class WeatherStationService:
         self._session.add(new_station)
         await self._session.flush()
         await self._session.commit()
+        await query_cache.invalidate("weather_stations")
+        ReferenceCatalog().invalidate()
         if parameter_types and len(parameter_types) > 0:
             await self._create_parameter(parameter_types, new_station.id)
 
@@ -106,6 +148,8 @@ class WeatherStationService:
             )
 
         await self._session.commit()
+        await query_cache.invalidate("weather_stations")
+        ReferenceCatalog().invalidate()
 
     async def disable_station(self, station_id: int) -> None:
         station = await self._get_station_by_id(station_id)
@@ -113,55 +157,40 @@ class WeatherStationService:
         station.last_update = datetime.now()  # type: ignore
         station.is_active = not station.is_active
         await self._session.commit()
+        await query_cache.invalidate("weather_stations")
+        ReferenceCatalog().invalidate()
 
     async def get_stations(
         self, filters: FilterWeatherStation
     ) -> list[WeatherStationResponse]:
-        query = text(
-            f"""
-            SELECT
-                ws.id,
-                ws."name" AS name_station,
-                ws.uid,
-                ws.address,
-                ws.latitude,
-                ws.longitude,
-                ws.create_date,
-                ws.is_active,
-                COALESCE(
-                (SELECT JSONB_AGG(
-                    JSONB_BUILD_OBJECT(
-                        'parameter_id', p.id,
-                        'parameter_type_id', p.parameter_type_id,
-                        'name_parameter', pt.name
-                    )
-                )
-                FROM parameters p
-                join parameter_types pt
-                on pt.id = p.parameter_type_id
-                WHERE p.station_id::BIGINT = ws.id
-                AND p.is_active = true),
-                '[]'::JSONB
-            ) AS parameters
-            FROM weather_stations ws
-            where 1 = 1
-            {"and ws.uid = :uid " if filters.uid is not None else ""}
-            {"and ws.is_active = :is_active" if filters.is_active is not None else ""}
-            {'and ws."name" like :name_station ' if filters.name is not None else ""}
-            """
-        )
-        if filters.uid:
-            query = query.bindparams(uid=filters.uid)
-        if filters.is_active is not None:
-            query = query.bindparams(is_active=filters.is_active)
-        if filters.name:
-            query = query.bindparams(name_station=f"%{filters.name}%")
+        catalog = ReferenceCatalog().snapshot
+        if catalog is not None:
+            return catalog.get_stations(filters)
+        return await self._query_stations(filters)
 
-        result = await self._session.execute(query)
-        stations = result.fetchall()
-        return [WeatherStationResponse(**station._asdict()) for station in stations]
+    @cached("weather_stations", "parameters", "parameter_types")
+    async def _query_stations(
+        self, filters: FilterWeatherStation
+    ) -> list[WeatherStationResponse]:
+        params = {
+            "uid": filters.uid,
+            "is_active": filters.is_active,
+            "name_station": f"%{filters.name}%" if filters.name is not None else None,
+        }
+        stations = await fetch_records(self._session, LIST_STATIONS, params)
+        return records_to_models(WeatherStationResponse, stations)
 
     async def get_station_by_id(self, station_id: int) -> WeatherStationResponseList:
+        catalog = ReferenceCatalog().snapshot
+        if catalog is not None:
+            station = catalog.get_station(station_id)
+            if not station:
+                raise HTTPException(status_code=404, detail="Estação não encontrada")
+            return station
+        return await self._query_station_by_id(station_id)
+
+    @cached("weather_stations", "parameters", "parameter_types")
+    async def _query_station_by_id(self, station_id: int) -> WeatherStationResponseList:
         query = text(
             """
             SELECT
@@ -208,6 +237,7 @@ class WeatherStationService:
             weatherstation.pop("_sa_instance_state", None)
         return WeatherStationResponseList(**weatherstation) if weatherstation else None
 
+    @cached("weather_stations", "parameters", "parameter_types")
     async def get_station_by_parameter(self, parmater_type_id: int) -> list[PameterByStation]:
         query = text(
             """
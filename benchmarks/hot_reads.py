@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Custo por linha das leituras quentes: caminho SQLAlchemy x asyncpg direto.
+
+Uso (com o banco configurado no .env):
+
+    python -m benchmarks.hot_reads --station-id 1 --repeat 20
+
+Cada instrução registrada roda `--repeat` vezes pelos dois caminhos na mesma
+sessão e o resultado é o tempo médio por linha, incluindo a montagem dos modelos
+de resposta. O histórico da estação é montado pelo `DashboardService` e só tem
+o caminho asyncpg, que é o usado pela API.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependency.database import Database
+from app.modules.fast_query import fetch_records, records_to_models
+from app.modules.statements import Statement
+from app.schemas.alert import AlertResponse
+from app.schemas.dashboard import StationHistoryFilter, StationHistoryItem
+from app.schemas.parameter_type import ParameterTypeResponse
+from app.schemas.weather_station import WeatherStationResponse
+from app.service.alert import LIST_UNREAD_ALERTS
+from app.service.dashboard import DashboardService
+from app.service.parameter_type import LIST_PARAMETER_TYPES
+from app.service.weather_station import LIST_STATIONS
+
+# Mesmas instruções e parâmetros (sem filtros) usados pelos serviços.
+QUERIES: dict[str, tuple[Statement, type[Any], dict[str, Any]]] = {
+    "alerts": (
+        LIST_UNREAD_ALERTS,
+        AlertResponse,
+        {"type_alert_name": None, "station_name": None},
+    ),
+    "stations": (
+        LIST_STATIONS,
+        WeatherStationResponse,
+        {"uid": None, "is_active": None, "name_station": None},
+    ),
+    "parameter_types": (
+        LIST_PARAMETER_TYPES,
+        ParameterTypeResponse,
+        {"name": None, "is_active": None},
+    ),
+}
+
+
+async def sqlalchemy_path(
+    session: AsyncSession, statement: Statement, model: type[Any], params: dict[str, Any]
+) -> int:
+    result = await session.execute(statement.clause, params)
+    return len([model(**row._asdict()) for row in result.fetchall()])
+
+
+async def asyncpg_path(
+    session: AsyncSession, statement: Statement, model: type[Any], params: dict[str, Any]
+) -> int:
+    records = await fetch_records(session, statement, params)
+    return len(records_to_models(model, records))
+
+
+async def station_history_path(session: AsyncSession, station_id: int, limit: int) -> int:
+    filters = StationHistoryFilter(resolution="raw", limit=limit)
+    records, _ = await DashboardService(session).get_station_history(station_id, filters)
+    return len(records_to_models(StationHistoryItem, records))
+
+
+async def measure(
+    path: Callable[..., Awaitable[int]], repeat: int, *args: Any
+) -> tuple[int, float]:
+    await path(*args)  # aquece o cache de instruções preparadas
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows += await path(*args)
+    return rows, time.perf_counter() - started
+
+
+def report(name: str, rows: int, repeat: int, slow: float | None, fast: float) -> None:
+    per_row = max(rows, 1)
+    slow_column = f"{slow / per_row * 1e6:.2f}" if slow is not None else "-"
+    print(f"{name:<16} {rows // repeat:>8} {slow_column:>20} {fast / per_row * 1e6:>18.2f}")
+
+
+async def main(station_id: int, limit: int, repeat: int) -> None:
+    async with Database().session as session:
+        header = ("consulta", "linhas", "sqlalchemy µs/linha", "asyncpg µs/linha")
+        print(f"{header[0]:<16} {header[1]:>8} {header[2]:>20} {header[3]:>18}")
+        for name, (statement, model, params) in QUERIES.items():
+            rows, slow = await measure(
+                sqlalchemy_path, repeat, session, statement, model, params
+            )
+            _, fast = await measure(asyncpg_path, repeat, session, statement, model, params)
+            report(name, rows, repeat, slow, fast)
+        rows, fast = await measure(station_history_path, repeat, session, station_id, limit)
+        report("station_history", rows, repeat, None, fast)
+    await Database().close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--station-id", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.station_id, args.limit, args.repeat))
@@ -4,6 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config.lifespan import lifespan
+from app.dependency.database import read_your_writes
+from app.modules.query_budget import query_budget_middleware
 from app.routers.define_routes import define_routes
 
 
@@ -19,6 +21,8 @@ def get_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app_.middleware("http")(read_your_writes)
+    app_.middleware("http")(query_budget_middleware)
 
     return app_
 
@@ -1,6 +1,7 @@
 # -- coding: utf-8 --
 
 
+import asyncio
 from typing import AsyncGenerator
 
 import pytest_asyncio
@@ -8,11 +9,13 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.config.schema import upgrade_service_schema
 from app.config.settings import settings
 from app.core.models.db_model import (
     User,
 )
 from app.dependency.database import Database
+from app.modules.cache import query_cache
 from app.modules.security import PasswordManager, TokenManager
 from main import app
 from tests.fixtures.fixture_insert import (
@@ -24,6 +27,20 @@ from tests.fixtures.fixture_insert import (
     weather_stations_fixture,  # noqa: F401
 )
 
+# As fixtures gravam direto no banco, sem passar pelos serviços que invalidam o cache.
+query_cache.configure(None)
+# Nos testes, estourar o orçamento de consultas (ou um N+1) falha a requisição.
+settings.QUERY_BUDGET_MODE = "raise"
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def service_schema() -> AsyncGenerator[None, None]:
+    # As tabelas auxiliares e os gatilhos (latest_measures, contadores, rollups...)
+    # vêm das migrações do serviço; o env.py do alembic usa o próprio loop.
+    settings.DATABASE_URL = settings.DATABASE_URL_TEST
+    await asyncio.to_thread(upgrade_service_schema)
+    yield
+
 
 @pytest_asyncio.fixture
 async def fake_user(db_session: AsyncSession) -> AsyncGenerator[User, None]:
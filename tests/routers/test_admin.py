@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+
+class TestsAdmin:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_get_metrics(authenticated_client: AsyncClient) -> None:
+        response = await authenticated_client.get("/admin/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["database"]["checked_out"] >= 0
+        assert data["database"]["pool_size"] > 0
+        assert data["password_hash"]["queued"] == 0
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_get_alert_backfills(authenticated_client: AsyncClient) -> None:
+        response = await authenticated_client.get("/admin/alert-backfills?limit=5")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.json()["data"], list)
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi import status
 from httpx import ASGITransport, AsyncClient
@@ -396,3 +398,150 @@ class TestAlertType:
         # Verificar se foi reativado
         get_response = await authenticated_client.get(f"/alert_type/{alert_type_id}")
         assert get_response.json()["data"]["is_active"] is True
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_simulate_alert_type(
+        authenticated_client: AsyncClient,
+        parameters_fixture,
+        measures_fixture,
+    ) -> None:
+        response = await authenticated_client.get(
+            "/alert_type/simulate",
+            params={
+                "parameter_id": parameters_fixture[0].id,
+                "value": 20,
+                "math_signal": ">",
+                "months": 1,
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["alerts"] >= 1
+        assert data["readings"] >= data["alerts"]
+        assert len(data["samples"]) >= 1
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_simulate_alert_type_with_invalid_signal(
+        authenticated_client: AsyncClient,
+        parameters_fixture,
+    ) -> None:
+        response = await authenticated_client.get(
+            "/alert_type/simulate",
+            params={"parameter_id": parameters_fixture[0].id, "value": 20, "math_signal": "~"},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_create_sustained_alert_type_requires_window(
+        authenticated_client: AsyncClient,
+        parameters_fixture,
+    ) -> None:
+        payload = {
+            "parameter_id": parameters_fixture[0].id,
+            "name": "Alerta Sustentado",
+            "value": 30,
+            "math_signal": ">",
+            "kind": "sustained",
+        }
+        response = await authenticated_client.post("/alert_type/", json=payload)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_create_threshold_alert_type_rejects_fractional_value(
+        authenticated_client: AsyncClient,
+        parameters_fixture,
+    ) -> None:
+        payload = {
+            "parameter_id": parameters_fixture[0].id,
+            "name": "Alerta Fracionário",
+            "value": 2.5,
+            "math_signal": ">",
+        }
+        response = await authenticated_client.post("/alert_type/", json=payload)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_alert_type_round_trip_create_ingest_alert(
+        authenticated_client: AsyncClient,
+        db_session,
+        parameters_fixture,
+    ) -> None:
+        """Cria uma regra de limite e uma de taxa (limite fracionário), ingere
+        leituras e confere os alertas gerados por cada uma."""
+        parameter = parameters_fixture[0]
+        rules = [
+            {"name": "Ida e Volta Limite", "value": 24, "math_signal": ">"},
+            {
+                "name": "Ida e Volta Taxa",
+                "value": 2.5,
+                "math_signal": ">",
+                "kind": "rate_of_change",
+                "window_seconds": 60,
+            },
+        ]
+        # Variações de 2.2 e 2.8 por minuto: só a segunda passa de 2.5.
+        readings = [(1_800_000_000, 20.0), (1_800_000_060, 22.2), (1_800_000_120, 25.0)]
+        body = "\n".join(
+            json.dumps({
+                "uid": "station-0001",
+                "parameter_type": parameter.parameter_type_id,
+                "timestamp": timestamp,
+                "value": value,
+            })
+            for timestamp, value in readings
+        )
+        try:
+            for rule in rules:
+                response = await authenticated_client.post(
+                    "/alert_type/", json={"parameter_id": parameter.id, **rule}
+                )
+                assert response.status_code == status.HTTP_200_OK
+
+            response = await authenticated_client.get("/alert_type/")
+            created = {
+                alert_type["name"]: alert_type
+                for alert_type in response.json()["data"]
+                if alert_type["name"].startswith("Ida e Volta")
+            }
+            assert created["Ida e Volta Limite"]["kind"] == "threshold"
+            assert created["Ida e Volta Limite"]["window_seconds"] is None
+            assert created["Ida e Volta Taxa"]["kind"] == "rate_of_change"
+            assert created["Ida e Volta Taxa"]["value"] == 2.5
+            assert created["Ida e Volta Taxa"]["window_seconds"] == 60
+
+            response = await authenticated_client.post(
+                "/measures/ingest",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["data"]["accepted"] == 3
+
+            for name in ("Ida e Volta Limite", "Ida e Volta Taxa"):
+                response = await authenticated_client.get(
+                    "/alert/all", params={"type_alert_name": name}
+                )
+                assert [alert["measure_value"] for alert in response.json()["data"]] == [
+                    25.0
+                ]
+        finally:
+            await db_session.execute(
+                text("""
+                    DELETE FROM alerts WHERE type_alert_id IN (
+                        SELECT id FROM type_alerts WHERE name LIKE 'Ida e Volta%'
+                    )
+                """)
+            )
+            await db_session.execute(
+                text("DELETE FROM type_alerts WHERE name LIKE 'Ida e Volta%'")
+            )
+            await db_session.execute(
+                text("DELETE FROM measures WHERE parameter_id = :id AND measure_date >= :d"),
+                {"id": parameter.id, "d": readings[0][0]},
+            )
+            await db_session.commit()
@@ -2,8 +2,11 @@
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.models.db_model import User
+from app.modules.security import TokenManager
 
 
 class TestsAuth:
@@ -38,3 +41,88 @@ class TestsAuth:
         response_data = response.json()
         assert isinstance(response_data["access_token"], str)
         assert response_data["token_type"] == "bearer"
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_refresh_rotates_token(
+        authenticated_client: AsyncClient, fake_user: User
+    ) -> None:
+        login_data = {"username": "test_user@example.com", "password": "123"}
+        login = (await authenticated_client.post("/auth/login", data=login_data)).json()
+
+        response = await authenticated_client.post(
+            "/auth/refresh", json={"refresh_token": login["refresh_token"]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        refreshed = response.json()
+        assert refreshed["access_token"]
+        assert refreshed["refresh_token"] != login["refresh_token"]
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_refresh_reuse_revokes_family(
+        authenticated_client: AsyncClient, fake_user: User
+    ) -> None:
+        login_data = {"username": "test_user@example.com", "password": "123"}
+        login = (await authenticated_client.post("/auth/login", data=login_data)).json()
+        first = login["refresh_token"]
+        second = (
+            await authenticated_client.post("/auth/refresh", json={"refresh_token": first})
+        ).json()["refresh_token"]
+
+        reused = await authenticated_client.post("/auth/refresh", json={"refresh_token": first})
+        assert reused.status_code == status.HTTP_401_UNAUTHORIZED
+
+        revoked = await authenticated_client.post(
+            "/auth/refresh", json={"refresh_token": second}
+        )
+        assert revoked.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_refresh_of_inactive_user_revokes_family(
+        authenticated_client: AsyncClient, fake_user: User, db_session: AsyncSession
+    ) -> None:
+        login_data = {"username": "test_user@example.com", "password": "123"}
+        login = (await authenticated_client.post("/auth/login", data=login_data)).json()
+        await db_session.execute(
+            text("UPDATE users SET is_active = false WHERE id = :id"), {"id": fake_user.id}
+        )
+        await db_session.commit()
+        try:
+            response = await authenticated_client.post(
+                "/auth/refresh", json={"refresh_token": login["refresh_token"]}
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+            result = await db_session.execute(
+                text("""
+                    SELECT count(*) FROM refresh_tokens
+                    WHERE revoked_at IS NULL AND family_id = (
+                        SELECT family_id FROM refresh_tokens WHERE token_hash = :token_hash
+                    )
+                """),
+                {"token_hash": TokenManager().hash_refresh_token(login["refresh_token"])},
+            )
+            assert result.scalar_one() == 0
+        finally:
+            await db_session.execute(
+                text("UPDATE users SET is_active = true WHERE id = :id"), {"id": fake_user.id}
+            )
+            await db_session.commit()
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_logout_revokes_refresh_token(
+        authenticated_client: AsyncClient, fake_user: User
+    ) -> None:
+        login_data = {"username": "test_user@example.com", "password": "123"}
+        login = (await authenticated_client.post("/auth/login", data=login_data)).json()
+        payload = {"refresh_token": login["refresh_token"]}
+
+        response = await authenticated_client.post("/auth/logout", json=payload)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await authenticated_client.post("/auth/refresh", json=payload)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
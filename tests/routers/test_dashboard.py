@@ -180,3 +180,155 @@ async def test_dashboard_public_access(
         response = await simple_client.get(endpoint)
         assert response.status_code == status.HTTP_200_OK
         assert "data" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_get_station_history_downsampled(
+    authenticated_client: AsyncClient,
+    weather_stations_fixture: list[WeatherStation],
+    parameters_fixture: list[Parameter],
+    measures_fixture: list[Measures],
+):
+    """Teste para obter o histórico agregado em no máximo N pontos por parâmetro."""
+    station_id = weather_stations_fixture[0].id
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}?maxPoints=10"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()["data"]
+    titles = {item["title"] for item in data}
+    for title in titles:
+        assert len([item for item in data if item["title"] == title]) <= 10
+    for item in data:
+        assert item["min_value"] <= item["value"] <= item["max_value"]
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}?maxPoints=0"
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_get_station_history_paginated(
+    authenticated_client: AsyncClient,
+    weather_stations_fixture: list[WeatherStation],
+    parameters_fixture: list[Parameter],
+    measures_fixture: list[Measures],
+):
+    """Teste para paginar o histórico de uma estação por cursor."""
+    station_id = weather_stations_fixture[0].id
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}?resolution=raw&limit=5000"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    expected = response.json()["data"]
+    assert len(expected) >= len(measures_fixture)
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}?resolution=raw&limit=1"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert len(body["data"]) == 1
+    assert "next_cursor" in body
+
+    seen = [body["data"]]
+    while body["next_cursor"]:
+        response = await authenticated_client.get(
+            f"/dashboard/station-history/{station_id}",
+            params={"resolution": "raw", "limit": 1, "cursor": body["next_cursor"]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert len(body["data"]) <= 1
+        seen.append(body["data"])
+    items = [item for page in seen for item in page]
+    # As páginas juntas são a listagem completa, na mesma ordem e sem repetições.
+    assert items == expected
+    dates = [item["measure_date"] for item in items]
+    assert dates == sorted(dates, reverse=True)
+    keys = [(item["measure_date"], item["title"]) for item in items]
+    assert len(set(keys)) == len(keys)
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}?cursor=invalido"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_export_station_history(
+    authenticated_client: AsyncClient,
+    weather_stations_fixture: list[WeatherStation],
+    parameters_fixture: list[Parameter],
+    measures_fixture: list[Measures],
+):
+    """Teste para exportar o histórico de uma estação em NDJSON e CSV."""
+    station_id = weather_stations_fixture[0].id
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}/export"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [line for line in response.text.splitlines() if line]
+    assert len(lines) >= 1
+
+    response = await authenticated_client.get(
+        f"/dashboard/station-history/{station_id}/export?format=csv"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("measure_date,title,value")
+
+
+@pytest.mark.asyncio
+async def test_station_history_arrow_format(
+    authenticated_client: AsyncClient,
+    weather_stations_fixture: list[WeatherStation],
+    parameters_fixture: list[Parameter],
+    measures_fixture: list[Measures],
+):
+    """Teste para obter histórico e últimas medidas no formato Arrow IPC."""
+    import pyarrow as pa
+
+    station_id = weather_stations_fixture[0].id
+    headers = {"Accept": "application/vnd.apache.arrow.stream"}
+
+    for endpoint in [
+        f"/dashboard/station-history/{station_id}",
+        f"/dashboard/last-measures/{station_id}",
+    ]:
+        response = await authenticated_client.get(endpoint, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert "measure_date" in table.column_names
+
+
+@pytest.mark.asyncio
+async def test_get_summary(
+    authenticated_client: AsyncClient,
+    weather_stations_fixture: list[WeatherStation],
+    alerts_fixture: list[Alert],
+):
+    """Teste para obter todos os widgets do dashboard em uma única chamada."""
+    response = await authenticated_client.get("/dashboard/summary")
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()["data"]
+    assert set(data["alert_counts"]) == {"R", "Y", "G"}
+    assert isinstance(data["alert_types"], list)
+    assert data["station_status"]["total"] >= data["station_status"]["active"]
+    assert isinstance(data["measures_status"], list)
+
+    counts = await authenticated_client.get("/dashboard/alert-counts")
+    assert data["alert_counts"] == counts.json()["data"]
+
+    response = await authenticated_client.get("/dashboard/summary?station_id=999999")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["alert_counts"] == {"G": 0, "Y": 0, "R": 0}
+    assert response.json()["data"]["alert_types"] == []
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.db_model import Parameter, ParameterType, WeatherStation
+
+
+class TestsMeasure:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_ingest_measures(
+        authenticated_client: AsyncClient,
+        db_session: AsyncSession,
+        weather_stations_fixture: list[WeatherStation],
+        parameter_types_fixture: list[ParameterType],
+        parameters_fixture: list[Parameter],
+    ) -> None:
+        readings = [
+            {
+                "uid": "station-0001",
+                "parameter_type": "Temperatura",
+                "timestamp": 946684800,
+                "value": 21.5,
+            },
+            {
+                "uid": "station-0001",
+                "parameter_type": parameter_types_fixture[0].id,
+                "timestamp": "2000-01-01T00:01:00+00:00",
+                "value": 21.7,
+            },
+            {"uid": "station-0001", "parameter_type": "Inexistente", "timestamp": 1, "value": 1},
+        ]
+        body = "\n".join(json.dumps(reading) for reading in readings) + "\nnot json\n"
+
+        try:
+            response = await authenticated_client.post(
+                "/measures/ingest",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            report = response.json()["data"]
+            assert report["accepted"] == 2
+            assert report["rejected"] == 2
+            assert [error["line"] for error in report["batches"][0]["errors"]] == [3, 4]
+        finally:
+            await db_session.execute(
+                text("DELETE FROM measures WHERE parameter_id = :id AND measure_date < :d"),
+                {"id": parameters_fixture[0].id, "d": 946684800 + 3600},
+            )
+            await db_session.commit()
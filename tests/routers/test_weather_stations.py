@@ -91,6 +91,23 @@ class TestWeatherStations:
         )
         assert response.status_code == status.HTTP_200_OK
 
+    @pytest.mark.asyncio
+    async def test_deactivated_station_is_not_served_from_cache(  # noqa: PLR6301
+        self,
+        authenticated_client: AsyncClient,
+        weather_stations_fixture,
+    ) -> None:
+        station = weather_stations_fixture[0]
+        response = await authenticated_client.get(f"/stations/{station.id}")
+        is_active = response.json()["data"]["is_active"]
+
+        response = await authenticated_client.patch(f"/stations/disable/{station.id}")
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await authenticated_client.get(f"/stations/{station.id}")
+        assert response.json()["data"]["is_active"] is not is_active
+        await authenticated_client.patch(f"/stations/disable/{station.id}")
+
     @pytest.mark.asyncio
     async def test_get_nonexistent_weather_station(  # noqa: PLR6301
         self,
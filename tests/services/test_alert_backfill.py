@@ -0,0 +1,90 @@
+import time
+from typing import Any, AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.service.alert_backfill import AlertBackfillService
+
+
+async def insert_alert(
+    db_session: AsyncSession, type_alert_id: int, parameter_id: int, is_read: bool
+) -> int:
+    result = await db_session.execute(
+        text("""
+            WITH measure AS (
+                INSERT INTO measures (parameter_id, measure_date, value)
+                VALUES (:parameter_id, :now, 50)
+                RETURNING id
+            )
+            INSERT INTO alerts (type_alert_id, measure_id, create_date, is_read)
+            SELECT :type_alert_id, id, :now, :is_read FROM measure
+            RETURNING id
+        """),
+        {
+            "parameter_id": parameter_id,
+            "type_alert_id": type_alert_id,
+            "now": int(time.time()),
+            "is_read": is_read,
+        },
+    )
+    return result.scalar_one()
+
+
+@pytest_asyncio.fixture
+async def cleanup(
+    db_session: AsyncSession, parameters_fixture: Any, type_alerts_fixture: Any
+) -> AsyncGenerator[None, None]:
+    yield
+    await db_session.rollback()
+    await db_session.execute(
+        text("DELETE FROM alert_backfill_jobs WHERE type_alert_id = ANY(:ids)"),
+        {"ids": [type_alert.id for type_alert in type_alerts_fixture]},
+    )
+    await db_session.execute(
+        text("DELETE FROM alerts WHERE type_alert_id = ANY(:ids)"),
+        {"ids": [type_alert.id for type_alert in type_alerts_fixture]},
+    )
+    await db_session.execute(
+        text("DELETE FROM measures WHERE parameter_id = ANY(:ids)"),
+        {"ids": [parameter.id for parameter in parameters_fixture]},
+    )
+    await db_session.commit()
+
+
+class TestsAlertBackfill:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_parameter_change_removes_unread_alerts_of_old_parameter(
+        db_session: AsyncSession,
+        parameters_fixture: Any,
+        type_alerts_fixture: Any,
+        cleanup: None,
+    ) -> None:
+        type_alert_id = type_alerts_fixture[0].id
+        old_parameter, new_parameter = parameters_fixture[0].id, parameters_fixture[1].id
+        await insert_alert(db_session, type_alert_id, old_parameter, False)
+        read = await insert_alert(db_session, type_alert_id, old_parameter, True)
+        await db_session.commit()
+
+        await db_session.execute(
+            text("UPDATE type_alerts SET parameter_id = :parameter_id WHERE id = :id"),
+            {"parameter_id": new_parameter, "id": type_alert_id},
+        )
+        await AlertBackfillService(db_session).enqueue(type_alert_id)
+        await db_session.commit()
+
+        result = await db_session.execute(
+            text("SELECT id FROM alerts WHERE type_alert_id = :id"), {"id": type_alert_id}
+        )
+        assert [row.id for row in result] == [read]
+        result = await db_session.execute(
+            text("""
+                SELECT removed FROM alert_backfill_jobs
+                WHERE type_alert_id = :id AND status = 'pending'
+            """),
+            {"id": type_alert_id},
+        )
+        assert result.scalar_one() == 1
@@ -0,0 +1,142 @@
+from typing import Any, AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def execute(db_session: AsyncSession, sql: str, **params: Any) -> Any:
+    result = await db_session.execute(text(sql), params)
+    await db_session.commit()
+    return result
+
+
+async def assert_measure_counters(db_session: AsyncSession, type_ids: list[int]) -> None:
+    result = await db_session.execute(
+        text("""
+            SELECT
+                t.id,
+                COALESCE((
+                    SELECT total FROM measure_counters WHERE parameter_type_id = t.id
+                ), 0),
+                (
+                    SELECT COUNT(*) FROM measures m
+                    JOIN parameters p ON p.id = m.parameter_id
+                    WHERE p.parameter_type_id = t.id
+                )
+            FROM unnest(CAST(:type_ids AS BIGINT[])) AS t(id)
+        """),
+        {"type_ids": type_ids},
+    )
+    for type_id, counter, expected in result.fetchall():
+        assert counter == expected, f"tipo de parâmetro {type_id}"
+
+
+async def assert_alert_counters(db_session: AsyncSession, type_alert_ids: list[int]) -> None:
+    result = await db_session.execute(
+        text("""
+            SELECT
+                t.id,
+                COALESCE((SELECT unread FROM alert_counters WHERE type_alert_id = t.id), 0),
+                (
+                    SELECT COUNT(*) FROM alerts a
+                    WHERE a.type_alert_id = t.id AND a.is_read = false
+                )
+            FROM unnest(CAST(:type_alert_ids AS BIGINT[])) AS t(id)
+        """),
+        {"type_alert_ids": type_alert_ids},
+    )
+    for type_alert_id, counter, expected in result.fetchall():
+        assert counter == expected, f"tipo de alerta {type_alert_id}"
+
+
+@pytest_asyncio.fixture
+async def measure_ids(
+    db_session: AsyncSession, parameters_fixture: Any, type_alerts_fixture: Any
+) -> AsyncGenerator[list[int], None]:
+    parameter_ids = [parameter.id for parameter in parameters_fixture]
+    result = await execute(
+        db_session,
+        """
+        INSERT INTO measures (parameter_id, measure_date, value)
+        SELECT parameter_id, 1000 + n, n
+        FROM unnest(CAST(:parameter_ids AS BIGINT[])) AS parameter_id,
+            generate_series(1, 3) AS n
+        RETURNING id
+        """,
+        parameter_ids=parameter_ids,
+    )
+    ids = [row[0] for row in result.fetchall()]
+    yield ids
+    await execute(db_session, "DELETE FROM alerts WHERE measure_id = ANY(:ids)", ids=ids)
+    await execute(db_session, "DELETE FROM measures WHERE id = ANY(:ids)", ids=ids)
+
+
+class TestsCounters:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_measure_counters_follow_insert_update_delete(
+        db_session: AsyncSession, parameters_fixture: Any, measure_ids: list[int]
+    ) -> None:
+        type_ids = [parameter.parameter_type_id for parameter in parameters_fixture]
+        await assert_measure_counters(db_session, type_ids)
+
+        # Mover uma medida de parâmetro troca o tipo contado.
+        await execute(
+            db_session,
+            "UPDATE measures SET parameter_id = :parameter_id WHERE id = :id",
+            parameter_id=parameters_fixture[1].id,
+            id=measure_ids[0],
+        )
+        await assert_measure_counters(db_session, type_ids)
+
+        await execute(
+            db_session, "DELETE FROM measures WHERE id = ANY(:ids)", ids=measure_ids[:2]
+        )
+        await assert_measure_counters(db_session, type_ids)
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_alert_counters_follow_insert_read_delete(
+        db_session: AsyncSession, type_alerts_fixture: Any, measure_ids: list[int]
+    ) -> None:
+        type_alert_ids = [type_alert.id for type_alert in type_alerts_fixture]
+        result = await execute(
+            db_session,
+            """
+            INSERT INTO alerts (type_alert_id, measure_id, create_date, is_read)
+            SELECT CAST(:type_alert_id AS BIGINT), id, 0, false
+            FROM unnest(CAST(:ids AS BIGINT[])) AS id
+            RETURNING id
+            """,
+            type_alert_id=type_alert_ids[0],
+            ids=measure_ids,
+        )
+        alert_ids = [row[0] for row in result.fetchall()]
+        await assert_alert_counters(db_session, type_alert_ids)
+
+        await execute(
+            db_session,
+            "UPDATE alerts SET is_read = true WHERE id = ANY(:ids)",
+            ids=alert_ids[:2],
+        )
+        await assert_alert_counters(db_session, type_alert_ids)
+
+        await execute(
+            db_session,
+            "UPDATE alerts SET is_read = false WHERE id = :id",
+            id=alert_ids[0],
+        )
+        await execute(
+            db_session,
+            "UPDATE alerts SET type_alert_id = :type_alert_id WHERE id = :id",
+            type_alert_id=type_alert_ids[1],
+            id=alert_ids[3],
+        )
+        await assert_alert_counters(db_session, type_alert_ids)
+
+        await execute(
+            db_session, "DELETE FROM alerts WHERE id = ANY(:ids)", ids=alert_ids[:4]
+        )
+        await assert_alert_counters(db_session, type_alert_ids)
@@ -0,0 +1,102 @@
+from typing import Any, AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def insert_measures(
+    db_session: AsyncSession, rows: list[tuple[int, int, float]]
+) -> list[int]:
+    ids = []
+    for parameter_id, measure_date, value in rows:
+        result = await db_session.execute(
+            text("""
+                INSERT INTO measures (parameter_id, measure_date, value)
+                VALUES (:parameter_id, :measure_date, :value)
+                RETURNING id
+            """),
+            {"parameter_id": parameter_id, "measure_date": measure_date, "value": value},
+        )
+        ids.append(result.scalar_one())
+    await db_session.commit()
+    return ids
+
+
+async def latest(db_session: AsyncSession, parameter_id: int) -> Any:
+    result = await db_session.execute(
+        text("""
+            SELECT measure_id, value, measure_date
+            FROM latest_measures
+            WHERE parameter_id = :parameter_id
+        """),
+        {"parameter_id": parameter_id},
+    )
+    return result.fetchone()
+
+
+@pytest_asyncio.fixture
+async def parameter_id(
+    db_session: AsyncSession, parameters_fixture: Any
+) -> AsyncGenerator[int, None]:
+    parameter_id = parameters_fixture[0].id
+    yield parameter_id
+    await db_session.execute(
+        text("DELETE FROM measures WHERE parameter_id = :id"), {"id": parameter_id}
+    )
+    await db_session.commit()
+
+
+class TestsLatestMeasures:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_insert_keeps_newest_measure(
+        db_session: AsyncSession, parameter_id: int
+    ) -> None:
+        _, newer = await insert_measures(
+            db_session, [(parameter_id, 1_000, 1.0), (parameter_id, 2_000, 2.0)]
+        )
+        assert tuple(await latest(db_session, parameter_id)) == (newer, 2.0, 2_000)
+
+        # Medida atrasada não substitui a mais recente.
+        await insert_measures(db_session, [(parameter_id, 1_500, 9.0)])
+        assert (await latest(db_session, parameter_id)).measure_id == newer
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_update_recomputes_latest_measure(
+        db_session: AsyncSession, parameter_id: int
+    ) -> None:
+        older, newer = await insert_measures(
+            db_session, [(parameter_id, 1_000, 1.0), (parameter_id, 2_000, 2.0)]
+        )
+
+        await db_session.execute(
+            text("UPDATE measures SET value = 5.0 WHERE id = :id"), {"id": newer}
+        )
+        await db_session.commit()
+        assert tuple(await latest(db_session, parameter_id)) == (newer, 5.0, 2_000)
+
+        await db_session.execute(
+            text("UPDATE measures SET measure_date = 500 WHERE id = :id"), {"id": newer}
+        )
+        await db_session.commit()
+        assert tuple(await latest(db_session, parameter_id)) == (older, 1.0, 1_000)
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_delete_falls_back_to_previous_measure(
+        db_session: AsyncSession, parameter_id: int
+    ) -> None:
+        older, newer = await insert_measures(
+            db_session, [(parameter_id, 1_000, 1.0), (parameter_id, 2_000, 2.0)]
+        )
+
+        await db_session.execute(text("DELETE FROM measures WHERE id = :id"), {"id": newer})
+        await db_session.commit()
+        assert (await latest(db_session, parameter_id)).measure_id == older
+
+        await db_session.execute(text("DELETE FROM measures WHERE id = :id"), {"id": older})
+        await db_session.commit()
+        assert await latest(db_session, parameter_id) is None
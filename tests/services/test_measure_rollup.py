@@ -0,0 +1,173 @@
+from typing import Any, AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependency.database import Database
+from app.service.measure_rollup import MeasureRollupService
+
+BUCKET = 4_000_000_000 // 3600 * 3600
+
+INSERT_MEASURES = """
+    INSERT INTO measures (parameter_id, measure_date, value)
+    SELECT CAST(:parameter_id AS BIGINT), CAST(:bucket AS BIGINT) + n, n
+    FROM generate_series(1, :count) AS n
+"""
+
+
+async def refresh_all(db_session: AsyncSession) -> None:
+    while await MeasureRollupService(db_session).refresh(1000):
+        pass
+
+
+@pytest_asyncio.fixture
+async def parameter_ids(
+    db_session: AsyncSession, parameters_fixture: Any
+) -> AsyncGenerator[list[int], None]:
+    ids = [parameter.id for parameter in parameters_fixture]
+    yield ids
+    await refresh_all(db_session)
+    for table in ("measures", "measures_rollup_hourly", "measures_rollup_daily"):
+        await db_session.execute(
+            text(f"DELETE FROM {table} WHERE parameter_id = ANY(:ids)"), {"ids": ids}
+        )
+    await db_session.commit()
+
+
+class TestsMeasureRollup:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_batch_committed_after_refresh_with_lower_ids(
+        db_session: AsyncSession, parameter_ids: list[int]
+    ) -> None:
+        await refresh_all(db_session)
+        async with Database().session as slow, Database().session as fast:
+            # O lote lento reserva ids menores, mas só confirma depois do rollup.
+            await slow.execute(
+                text(INSERT_MEASURES),
+                {"parameter_id": parameter_ids[0], "bucket": BUCKET, "count": 3},
+            )
+            await fast.execute(
+                text(INSERT_MEASURES),
+                {"parameter_id": parameter_ids[1], "bucket": BUCKET, "count": 2},
+            )
+            await fast.commit()
+            await refresh_all(db_session)
+            await slow.commit()
+        await refresh_all(db_session)
+
+        result = await db_session.execute(
+            text("""
+                SELECT parameter_id, sample_count, min_value, max_value, sum_value, last_value
+                FROM measures_rollup_hourly
+                WHERE parameter_id = ANY(:ids) AND bucket = :bucket
+                ORDER BY parameter_id
+            """),
+            {"ids": parameter_ids, "bucket": BUCKET},
+        )
+        assert [tuple(row) for row in result.fetchall()] == [
+            (parameter_ids[0], 3, 1.0, 3.0, 6.0, 3.0),
+            (parameter_ids[1], 2, 1.0, 2.0, 3.0, 2.0),
+        ]
+        result = await db_session.execute(
+            text("""
+                SELECT SUM(sample_count) FROM measures_rollup_daily
+                WHERE parameter_id = ANY(:ids)
+            """),
+            {"ids": parameter_ids},
+        )
+        assert result.scalar() == 5
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_update_and_delete_recompute_affected_buckets(
+        db_session: AsyncSession, parameter_ids: list[int]
+    ) -> None:
+        await db_session.execute(
+            text(INSERT_MEASURES),
+            {"parameter_id": parameter_ids[0], "bucket": BUCKET, "count": 4},
+        )
+        await db_session.execute(
+            text(INSERT_MEASURES),
+            {"parameter_id": parameter_ids[0], "bucket": BUCKET + 3600, "count": 2},
+        )
+        await db_session.commit()
+        await refresh_all(db_session)
+
+        # Remove o máximo da primeira hora, move uma medida para a segunda e apaga
+        # a segunda hora inteira antes de uma nova inserção nela.
+        await db_session.execute(
+            text("DELETE FROM measures WHERE parameter_id = :id AND measure_date = :date"),
+            {"id": parameter_ids[0], "date": BUCKET + 4},
+        )
+        await db_session.execute(
+            text("DELETE FROM measures WHERE parameter_id = :id AND measure_date > :date"),
+            {"id": parameter_ids[0], "date": BUCKET + 3600},
+        )
+        await db_session.execute(
+            text("""
+                UPDATE measures SET measure_date = :new_date, value = 10
+                WHERE parameter_id = :id AND measure_date = :date
+            """),
+            {"id": parameter_ids[0], "date": BUCKET + 1, "new_date": BUCKET + 3700},
+        )
+        await db_session.commit()
+        await refresh_all(db_session)
+
+        result = await db_session.execute(
+            text("""
+                SELECT bucket, sample_count, min_value, max_value, sum_value, last_value
+                FROM measures_rollup_hourly
+                WHERE parameter_id = :id
+                ORDER BY bucket
+            """),
+            {"id": parameter_ids[0]},
+        )
+        assert [tuple(row) for row in result.fetchall()] == [
+            (BUCKET, 2, 2.0, 3.0, 5.0, 3.0),
+            (BUCKET + 3600, 1, 10.0, 10.0, 10.0, 10.0),
+        ]
+        result = await db_session.execute(
+            text("""
+                SELECT SUM(sample_count), SUM(sum_value), MAX(max_value)
+                FROM measures_rollup_daily
+                WHERE parameter_id = :id
+            """),
+            {"id": parameter_ids[0]},
+        )
+        assert tuple(result.one()) == (3, 15.0, 10.0)
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_measures_without_value_are_left_out(
+        db_session: AsyncSession, parameter_ids: list[int]
+    ) -> None:
+        await db_session.execute(
+            text(INSERT_MEASURES),
+            {"parameter_id": parameter_ids[0], "bucket": BUCKET, "count": 2},
+        )
+        await db_session.execute(
+            text("""
+                INSERT INTO measures (parameter_id, measure_date, value)
+                VALUES (:id, :date, NULL)
+            """),
+            {"id": parameter_ids[0], "date": BUCKET + 10},
+        )
+        await db_session.commit()
+        await db_session.execute(
+            text("DELETE FROM measures WHERE parameter_id = :id AND measure_date = :date"),
+            {"id": parameter_ids[0], "date": BUCKET + 1},
+        )
+        await db_session.commit()
+        await refresh_all(db_session)
+
+        result = await db_session.execute(
+            text("""
+                SELECT sample_count, sum_value FROM measures_rollup_hourly
+                WHERE parameter_id = :id AND bucket = :bucket
+            """),
+            {"id": parameter_ids[0], "bucket": BUCKET},
+        )
+        assert tuple(result.one()) == (1, 2.0)
@@ -0,0 +1,48 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.db_model import User
+from app.dependency.auth import AuthManager, principal_cache
+from app.modules.security import TokenManager
+from app.service.catalog import ReferenceCatalog
+
+
+@pytest_asyncio.fixture
+async def catalog(db_session: AsyncSession) -> AsyncGenerator[ReferenceCatalog, None]:
+    # A conexão LISTEN do catálogo é quem recebe os avisos de usuários alterados.
+    catalog = ReferenceCatalog()
+    await catalog.start()
+    yield catalog
+    await catalog.stop()
+
+
+class TestsPrincipalCache:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_deleted_user_is_rejected_immediately(
+        db_session: AsyncSession, catalog: ReferenceCatalog
+    ) -> None:
+        user = User(name="disabled_user", email="disabled_user@example.com", password="hash")
+        db_session.add(user)
+        await db_session.commit()
+        user_id = user.id
+        token = TokenManager().create_access_token(user)  # type: ignore[arg-type]
+
+        assert (await AuthManager.has_authorization(token)).id == user_id
+        assert principal_cache.get(user_id) is not None
+
+        await db_session.delete(user)
+        await db_session.commit()
+        for _ in range(50):
+            if principal_cache.get(user_id) is None:
+                break
+            await asyncio.sleep(0.05)
+
+        with pytest.raises(HTTPException) as error:
+            await AuthManager.has_authorization(token)
+        assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,120 @@
+from typing import Any, AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.schemas.dashboard import StationHistoryFilter
+from app.service.dashboard import DashboardService
+
+
+@pytest_asyncio.fixture
+async def station_id(
+    db_session: AsyncSession, parameters_fixture: Any
+) -> AsyncGenerator[int, None]:
+    parameter_ids = [parameter.id for parameter in parameters_fixture[:2]]
+    # Datas intercaladas e repetidas entre os parâmetros para exercitar o desempate.
+    for index in range(12):
+        await db_session.execute(
+            text("""
+                INSERT INTO measures (parameter_id, measure_date, value)
+                VALUES (:parameter_id, :measure_date, :value)
+            """),
+            {
+                "parameter_id": parameter_ids[index % 2],
+                "measure_date": 1_000 + (index // 3) * 60,
+                "value": float(index),
+            },
+        )
+    await db_session.commit()
+    result = await db_session.execute(
+        text("SELECT station_id FROM parameters WHERE id = :id"), {"id": parameter_ids[0]}
+    )
+    yield result.scalar_one()
+    await db_session.execute(
+        text("DELETE FROM measures WHERE parameter_id = ANY(:ids)"), {"ids": parameter_ids}
+    )
+    await db_session.commit()
+
+
+class TestsStationHistory:
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_default_page_size_paginates_whole_range(
+        db_session: AsyncSession, station_id: int, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "HISTORY_PAGE_SIZE", 5)
+        service = DashboardService(db_session)
+
+        pages = []
+        cursor = None
+        while True:
+            rows, cursor = await service.get_station_history(
+                station_id, StationHistoryFilter(resolution="raw", cursor=cursor)
+            )
+            pages.append(rows)
+            if cursor is None:
+                break
+
+        assert [len(rows) for rows in pages] == [5, 5, 2]
+        keys = [(row["measure_date"], row["row_key"]) for rows in pages for row in rows]
+        assert keys == sorted(keys, reverse=True)
+        assert len(set(keys)) == 12
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_explicit_limit_overrides_default(
+        db_session: AsyncSession, station_id: int
+    ) -> None:
+        rows, cursor = await DashboardService(db_session).get_station_history(
+            station_id, StationHistoryFilter(resolution="raw", limit=12)
+        )
+        assert len(rows) == 12
+        assert cursor is None
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_auto_resolution_is_kept_by_the_cursor(
+        db_session: AsyncSession, station_id: int, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        service = DashboardService(db_session)
+        filters = {"resolution": "auto", "start_date": "900", "limit": 5}
+        monkeypatch.setattr(DashboardService, "HOURLY_MIN_RANGE", 10**12)
+        monkeypatch.setattr(DashboardService, "DAILY_MIN_RANGE", 10**12)
+        rows, cursor = await service.get_station_history(
+            station_id, StationHistoryFilter(**filters)
+        )
+        assert cursor is not None
+
+        # O fim da janela é "agora": entre uma página e outra a escolha automática
+        # pode mudar para os rollups, mas a paginação continua nos dados brutos.
+        monkeypatch.setattr(DashboardService, "DAILY_MIN_RANGE", 0)
+        pages = [rows]
+        while cursor is not None:
+            rows, cursor = await service.get_station_history(
+                station_id, StationHistoryFilter(**filters, cursor=cursor)
+            )
+            pages.append(rows)
+
+        keys = [(row["measure_date"], row["row_key"]) for rows in pages for row in rows]
+        assert len(keys) == len(set(keys)) == 12
+        assert keys == sorted(keys, reverse=True)
+
+    @pytest.mark.asyncio
+    @staticmethod
+    async def test_cursor_from_other_resolution_is_rejected(
+        db_session: AsyncSession, station_id: int
+    ) -> None:
+        service = DashboardService(db_session)
+        _, cursor = await service.get_station_history(
+            station_id, StationHistoryFilter(resolution="raw", limit=5)
+        )
+
+        with pytest.raises(HTTPException) as error:
+            await service.get_station_history(
+                station_id, StationHistoryFilter(resolution="day", cursor=cursor)
+            )
+        assert error.value.status_code == status.HTTP_400_BAD_REQUEST
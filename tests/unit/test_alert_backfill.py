@@ -0,0 +1,138 @@
+import re
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
+
+from app.service.alert_backfill import VIOLATES, AlertBackfillService, is_lock_timeout
+from app.service.alert_engine import OPERATORS
+
+
+def test_sql_condition_covers_engine_operators() -> None:
+    assert set(re.findall(r"WHEN '([^']+)'", VIOLATES)) == set(OPERATORS)
+
+
+class FakeResult:
+    def __init__(self, row: Any) -> None:
+        self._row = row
+
+    def fetchone(self) -> Any:
+        return self._row
+
+    def one(self) -> Any:
+        return self._row
+
+
+class FakeSession:
+    def __init__(self, *rows: Any) -> None:
+        self._rows = list(rows)
+        self.statements: list[tuple[str, dict[str, Any]]] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement: Any, params: dict[str, Any] | None = None) -> FakeResult:
+        self.statements.append((str(statement), params or {}))
+        return FakeResult(self._rows.pop(0) if self._rows else None)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def job(**overrides: Any) -> SimpleNamespace:
+    values = {
+        "id": 7,
+        "type_alert_id": 3,
+        "window_start": 1000,
+        "last_measure_date": None,
+        "last_measure_id": None,
+        "parameter_id": 10,
+        "is_active": True,
+        "kind": None,
+    }
+    return SimpleNamespace(**{**values, **overrides})
+
+
+class Progress(SimpleNamespace):
+    def _asdict(self) -> dict[str, Any]:
+        return dict(vars(self))
+
+
+async def test_run_chunk_without_jobs() -> None:
+    session = FakeSession(None, None)
+
+    assert await AlertBackfillService(session).run_chunk(100) is False
+    assert session.rollbacks == 1
+    assert session.commits == 0
+
+
+async def test_run_chunk_advances_checkpoint() -> None:
+    progress = Progress(processed=100, created=4, removed=1, last_date=2000, last_id=55)
+    session = FakeSession(None, job(last_measure_date=1500, last_measure_id=40), progress)
+    service = AlertBackfillService(session)
+
+    assert await service.run_chunk(100) is True
+
+    _, chunk_params = session.statements[2]
+    assert chunk_params["last_date"] == 1500
+    assert chunk_params["last_id"] == 40
+    assert chunk_params["chunk_size"] == 100
+    checkpoint_sql, checkpoint_params = session.statements[3]
+    assert "last_measure_id = :last_id" in checkpoint_sql
+    assert checkpoint_params["id"] == 7
+    assert checkpoint_params["last_id"] == 55
+    assert session.commits == 1
+    assert service.job_id == 7
+
+
+async def test_run_chunk_finishes_exhausted_job() -> None:
+    progress = Progress(processed=0, created=0, removed=0, last_date=None, last_id=None)
+    session = FakeSession(None, job(), progress)
+
+    assert await AlertBackfillService(session).run_chunk(100) is True
+
+    finish_sql, finish_params = session.statements[3]
+    assert "status = :status" in finish_sql
+    assert finish_params["status"] == "done"
+    assert session.commits == 1
+
+
+async def test_run_chunk_skips_inactive_rule() -> None:
+    session = FakeSession(None, job(is_active=False))
+
+    assert await AlertBackfillService(session).run_chunk(100) is True
+
+    assert len(session.statements) == 3
+    assert session.statements[2][1]["status"] == "done"
+
+
+async def test_run_chunk_error_before_job_selection_is_not_blamed_on_previous_job() -> None:
+    progress = Progress(processed=100, created=0, removed=0, last_date=2000, last_id=55)
+    session = FakeSession(None, job(), progress)
+    service = AlertBackfillService(session)
+    assert await service.run_chunk(100) is True
+    assert service.job_id == 7
+
+    async def broken_execute(statement: Any, params: dict[str, Any] | None = None) -> Any:
+        raise RuntimeError("conexão perdida")
+
+    session.execute = broken_execute  # type: ignore[method-assign]
+    try:
+        await service.run_chunk(100)
+    except RuntimeError:
+        pass
+
+    assert service.job_id is None
+
+
+def test_lock_timeout_is_detected_by_sqlstate() -> None:
+    def db_error(sqlstate: str) -> DBAPIError:
+        orig = Exception("canceling statement due to lock timeout")
+        orig.sqlstate = sqlstate  # type: ignore[attr-defined]
+        return DBAPIError("UPDATE alerts", {}, orig)
+
+    assert is_lock_timeout(db_error("55P03"))
+    assert not is_lock_timeout(db_error("57014"))
+    assert not is_lock_timeout(RuntimeError("lock timeout"))
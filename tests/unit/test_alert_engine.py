@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+
+from app.service.alert_engine import OPERATORS, AlertEngine, ThresholdIndex, threshold_mask
+
+
+def test_threshold_index_matches_every_operator() -> None:
+    index = ThresholdIndex([
+        (1, 10, 30.0, ">"),
+        (2, 10, 30.0, ">="),
+        (3, 10, 0.0, "<"),
+        (4, 20, 5.0, "<="),
+        (5, 20, 5.0, "="),
+        (6, 20, 5.0, "!="),
+        (7, 20, 5.0, "~"),
+    ])
+    parameter_ids = np.array([10, 20, 10, 30], dtype=np.int64)
+    values = np.array([30.0, 5.0, -1.0, 99.0])
+
+    reading_index, type_alert_ids = index.evaluate(parameter_ids, values)
+
+    assert sorted(zip(reading_index.tolist(), type_alert_ids.tolist())) == [
+        (0, 2),
+        (1, 4),
+        (1, 5),
+        (2, 3),
+    ]
+
+
+def test_threshold_index_agrees_with_threshold_mask() -> None:
+    rng = np.random.default_rng(7)
+    signals = list(OPERATORS)
+    rules = [
+        (rule_id, 10, float(rule_id % 5), signals[rule_id % len(signals)])
+        for rule_id in range(40)
+    ]
+    values = rng.integers(0, 6, size=200).astype(np.float64)
+    parameter_ids = np.full(len(values), 10, dtype=np.int64)
+
+    reading_index, type_alert_ids = ThresholdIndex(rules).evaluate(parameter_ids, values)
+
+    expected = sorted(
+        (int(reading), rule_id)
+        for rule_id, _, threshold, signal in rules
+        for reading in np.flatnonzero(threshold_mask(values, threshold, signal))
+    )
+    assert sorted(zip(reading_index.tolist(), type_alert_ids.tolist())) == expected
+
+
+def test_evaluate_builds_alert_rows_for_measures() -> None:
+    index = ThresholdIndex([(7, 10, 25.0, ">")])
+    measures = [(100, 10, 1712553600, 24.0), (101, 10, 1712553660, 26.0)]
+
+    alerts = AlertEngine.evaluate(index, measures)
+
+    assert [(alert[0], alert[1], alert[3]) for alert in alerts] == [(7, 101, False)]
+
+
+def test_large_batch_evaluates_quickly() -> None:
+    rng = np.random.default_rng(0)
+    rules = [
+        (rule_id, rule_id % 2000, float(rng.uniform(0, 100)), ">")
+        for rule_id in range(5000)
+    ]
+    index = ThresholdIndex(rules)
+    parameter_ids = rng.integers(0, 2000, 100_000)
+    values = rng.uniform(0, 100, 100_000)
+
+    started = time.perf_counter()
+    reading_index, _ = index.evaluate(parameter_ids, values)
+    elapsed = time.perf_counter() - started
+
+    assert len(reading_index) > 0
+    assert elapsed < 0.5
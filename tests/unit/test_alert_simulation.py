@@ -0,0 +1,57 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from app.service.alert_engine import OPERATORS, threshold_mask
+from app.service.alert_simulation import DAY, SimulationAccumulator
+
+START = 20_000 * DAY
+END = START + 3 * DAY
+
+
+def test_threshold_mask_matches_every_operator() -> None:
+    values = np.array([1.0, 2.0, 3.0])
+    expected = {
+        ">": [False, False, True],
+        ">=": [False, True, True],
+        "<": [True, False, False],
+        "<=": [True, True, False],
+        "=": [False, True, False],
+        "!=": [True, False, True],
+    }
+    for signal in OPERATORS:
+        normalized = {"==": "=", "<>": "!="}.get(signal, signal)
+        assert threshold_mask(values, 2, signal).tolist() == expected[normalized]
+
+
+def test_accumulator_counts_fires_per_day_across_chunks() -> None:
+    accumulator = SimulationAccumulator(START, END, 10, ">", sample_size=2)
+
+    accumulator.add([(START + 10, 11.0), (START + 20, 5.0)])
+    accumulator.add([(START + DAY * 2 + 1, 12.0), (START + DAY * 2 + 2, 13.0)])
+    accumulator.add([])
+    result = accumulator.result()
+
+    assert result.readings == 4
+    assert result.alerts == 3
+    first_day = datetime.fromtimestamp(START, timezone.utc).date()
+    assert [(day.day, day.alerts) for day in result.days] == [
+        (first_day, 1),
+        (date.fromordinal(first_day.toordinal() + 2), 2),
+    ]
+    assert [int(sample.timestamp()) for sample in result.samples] == [
+        START + DAY * 2 + 2,
+        START + DAY * 2 + 1,
+    ]
+
+
+def test_accumulator_without_fires() -> None:
+    accumulator = SimulationAccumulator(START, END, 100, ">=", sample_size=5)
+
+    accumulator.add([(START, 1.0)])
+    result = accumulator.result()
+
+    assert result.readings == 1
+    assert result.alerts == 0
+    assert result.days == []
+    assert result.samples == []
@@ -0,0 +1,37 @@
+from collections import namedtuple
+from decimal import Decimal
+
+import pyarrow as pa
+
+from app.modules.arrow import STATION_HISTORY_SCHEMA, arrow_response, rows_to_record_batch
+
+HistoryRow = namedtuple("HistoryRow", "title value measure_unit type measure_date")
+
+
+def test_rows_to_record_batch_fills_missing_columns() -> None:
+    rows = [
+        HistoryRow("Temperatura", Decimal("25.5"), "°C", "climate", 1712553600),
+        HistoryRow("Umidade", Decimal("60.0"), "%", "climate", 1712553660),
+    ]
+
+    batch = rows_to_record_batch(rows, STATION_HISTORY_SCHEMA)  # type: ignore[arg-type]
+
+    assert batch.schema == STATION_HISTORY_SCHEMA
+    assert batch.column("value").to_pylist() == [25.5, 60.0]
+    assert batch.column("min_value").null_count == 2
+
+
+def test_arrow_response_is_readable_stream() -> None:
+    rows = [HistoryRow("Temperatura", 25.5, "°C", "climate", 1712553600)]
+
+    response = arrow_response(rows, STATION_HISTORY_SCHEMA)  # type: ignore[arg-type]
+    table = pa.ipc.open_stream(response.body).read_all()
+
+    assert response.media_type == "application/vnd.apache.arrow.stream"
+    assert table.num_rows == 1
+    assert table.column("title").to_pylist() == ["Temperatura"]
+
+
+def test_empty_rows_produce_empty_batch() -> None:
+    batch = rows_to_record_batch([], STATION_HISTORY_SCHEMA)
+    assert batch.num_rows == 0
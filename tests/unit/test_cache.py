@@ -0,0 +1,165 @@
+import asyncio
+
+from app.modules.cache import (
+    MemoryCacheBackend,
+    QueryCache,
+    RedisCacheBackend,
+    cached,
+    query_cache,
+)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes | int] = {}
+
+    async def mget(self, keys: list[str]) -> list[bytes | int | None]:
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.data[key] = value
+
+    def pipeline(self, transaction: bool = True) -> "FakeRedis":
+        return self
+
+    async def __aenter__(self) -> "FakeRedis":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    def incr(self, key: str) -> None:
+        self.data[key] = int(self.data.get(key, 0)) + 1
+
+    async def execute(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class StationService:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @cached("weather_stations")
+    async def get_station(self, station_id: int) -> dict[str, list[int]]:
+        self.calls += 1
+        return {"id": [station_id]}
+
+
+def listening_backend(max_entries: int) -> MemoryCacheBackend:
+    backend = MemoryCacheBackend(max_entries)
+    backend.set_listening(True)
+    return backend
+
+
+async def test_memory_backend_lru_eviction() -> None:
+    backend = listening_backend(max_entries=2)
+    for key in ("a", "b"):
+        _, versions = await backend.get(key, [])
+        await backend.set(key, key.encode(), [], versions, ttl=60)
+    await backend.get("a", [])
+    _, versions = await backend.get("c", [])
+    await backend.set("c", b"c", [], versions, ttl=60)
+
+    assert (await backend.get("a", []))[0] == b"a"
+    assert (await backend.get("b", []))[0] is None
+    assert (await backend.get("c", []))[0] == b"c"
+
+
+async def test_memory_backend_ttl_expiry() -> None:
+    backend = listening_backend(max_entries=10)
+    _, versions = await backend.get("a", [])
+    await backend.set("a", b"1", [], versions, ttl=0)
+    await asyncio.sleep(0.01)
+
+    assert (await backend.get("a", []))[0] is None
+
+
+async def test_memory_backend_is_unused_without_listen() -> None:
+    backend = listening_backend(max_entries=10)
+    _, versions = await backend.get("a", ["parameters"])
+
+    # Queda do LISTEN com a consulta em andamento: ela não grava nada.
+    backend.set_listening(False)
+    await backend.set("a", b"1", ["parameters"], versions, ttl=60)
+    backend.set_listening(True)
+    assert (await backend.get("a", ["parameters"]))[0] is None
+
+    _, versions = await backend.get("a", ["parameters"])
+    await backend.set("a", b"1", ["parameters"], versions, ttl=60)
+    backend.set_listening(False)
+    assert (await backend.get("a", ["parameters"]))[0] is None
+
+
+async def test_tag_invalidation_with_redis_backend() -> None:
+    backend = RedisCacheBackend(FakeRedis())
+    value, versions = await backend.get("k", ["parameters"])
+    assert value is None
+    await backend.set("k", b"[1,2]", ["parameters"], versions, ttl=60)
+
+    assert (await backend.get("k", ["parameters"]))[0] == b"[1,2]"
+
+    await backend.invalidate(["parameters"])
+    assert (await backend.get("k", ["parameters"]))[0] is None
+
+
+async def test_cached_decorator_and_invalidation() -> None:
+    query_cache.configure(listening_backend(max_entries=10))
+    try:
+        service = StationService()
+        assert await service.get_station(1) == {"id": [1]}
+        assert await service.get_station(1) == {"id": [1]}
+        await service.get_station(2)
+        assert service.calls == 2
+
+        await query_cache.invalidate("weather_stations")
+        await service.get_station(1)
+        assert service.calls == 3
+    finally:
+        await query_cache.close()
+
+
+async def test_cached_decorator_returns_copies() -> None:
+    query_cache.configure(listening_backend(max_entries=10))
+    try:
+        service = StationService()
+        first = await service.get_station(1)
+        first["id"].append(2)
+
+        assert await service.get_station(1) == {"id": [1]}
+        assert await service.get_station(1) is not await service.get_station(1)
+        assert service.calls == 1
+    finally:
+        await query_cache.close()
+
+
+async def test_notification_from_other_worker_invalidates_memory_cache() -> None:
+    query_cache.configure(listening_backend(max_entries=10))
+    try:
+        service = StationService()
+        await service.get_station(1)
+
+        # Aviso do canal do catálogo, disparado pela escrita de outro worker.
+        query_cache.on_notify("weather_stations")
+        await service.get_station(1)
+        assert service.calls == 2
+    finally:
+        await query_cache.close()
+
+
+async def test_cached_decorator_disabled() -> None:
+    query_cache.configure(None)
+    try:
+        service = StationService()
+        await service.get_station(1)
+        await service.get_station(1)
+        assert service.calls == 2
+    finally:
+        await query_cache.close()
+
+
+def test_make_key_depends_on_arguments() -> None:
+    assert QueryCache.make_key("f", (1,), {}) != QueryCache.make_key("f", (2,), {})
+    assert QueryCache.make_key("f", (), {"a": 1}) == QueryCache.make_key("f", (), {"a": 1})
@@ -0,0 +1,200 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Callable
+
+import pytest
+
+from app.dependency.auth import PRINCIPAL_CHANNEL
+from app.modules.cache import MemoryCacheBackend, query_cache
+from app.schemas.parameter_type import FilterParameterType
+from app.schemas.weather_station import FilterWeatherStation
+from app.service import catalog as catalog_module
+from app.service.catalog import CATALOG_CHANNEL, CatalogSnapshot, ReferenceCatalog
+
+ADDRESS = {"city": "São Paulo", "state": "SP", "country": "Brasil"}
+
+
+def build_snapshot() -> CatalogSnapshot:
+    stations = [
+        {
+            "id": 1,
+            "name": "Estação Central",
+            "uid": "station-0001",
+            "address": ADDRESS,
+            "latitude": -23.55,
+            "longitude": -46.63,
+            "create_date": 1712553600,
+            "is_active": True,
+        },
+        {
+            "id": 2,
+            "name": "Estação Sul",
+            "uid": "station-0002",
+            "address": ADDRESS,
+            "latitude": -19.91,
+            "longitude": -43.93,
+            "create_date": 1712553600,
+            "is_active": False,
+        },
+    ]
+    parameters = [
+        {"id": 10, "parameter_type_id": 100, "station_id": 1, "is_active": True},
+        {"id": 11, "parameter_type_id": 101, "station_id": 1, "is_active": False},
+    ]
+    parameter_types = [
+        {
+            "id": 100,
+            "name": "Temperatura",
+            "detect_type": "climate",
+            "measure_unit": "°C",
+            "qnt_decimals": 2,
+            "factor": 1.0,
+            "offset": 0.0,
+            "is_active": True,
+        },
+        {
+            "id": 101,
+            "name": "Pressão",
+            "detect_type": "climate",
+            "measure_unit": "hPa",
+            "qnt_decimals": 0,
+            "factor": 1.0,
+            "offset": 0.0,
+            "is_active": False,
+        },
+    ]
+    alert_types = [
+        {
+            "id": 5,
+            "parameter_id": 10,
+            "name": "Alerta de Temperatura",
+            "value": 30,
+            "math_signal": ">",
+            "status": "R",
+            "is_active": True,
+            "create_date": 1712553600,
+            "last_update": datetime(2024, 4, 8),
+        }
+    ]
+    return CatalogSnapshot(1, stations, parameters, parameter_types, alert_types)
+
+
+def test_station_filters() -> None:
+    snapshot = build_snapshot()
+
+    assert len(snapshot.get_stations(FilterWeatherStation())) == 2
+    active = snapshot.get_stations(FilterWeatherStation(is_active=True))
+    assert [station.id for station in active] == [1]
+    assert active[0].name_station == "Estação Central"
+    assert active[0].parameters == [
+        {"parameter_id": 10, "parameter_type_id": 100, "name_parameter": "Temperatura"}
+    ]
+    assert snapshot.get_stations(FilterWeatherStation(name="Sul"))[0].uid == "station-0002"
+
+
+def test_station_by_id() -> None:
+    snapshot = build_snapshot()
+
+    station = snapshot.get_station(1)
+    assert station is not None
+    assert station.name == "Estação Central"
+    assert snapshot.get_station(99) is None
+
+
+def test_parameter_and_alert_types() -> None:
+    snapshot = build_snapshot()
+
+    assert [pt.id for pt in snapshot.get_parameter_types(FilterParameterType())] == [100]
+    assert len(snapshot.get_parameter_types(FilterParameterType(is_active=None))) == 2
+    assert [a.id for a in snapshot.get_alert_types(True)] == [5]
+    assert snapshot.get_alert_types(False) == []
+
+
+def test_catalog_is_unused_until_loaded() -> None:
+    catalog = ReferenceCatalog()
+    catalog.invalidate()
+
+    assert catalog.snapshot is None
+
+
+class FakeListener:
+    def __init__(self) -> None:
+        self.channels: list[str] = []
+        self.on_terminate: Callable[[Any], None] | None = None
+        self.closed = False
+
+    def add_termination_listener(self, callback: Callable[[Any], None]) -> None:
+        self.on_terminate = callback
+
+    async def add_listener(self, channel: str, callback: Any) -> None:
+        self.channels.append(channel)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def test_catalog_reconnects_after_listener_terminates(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    listeners: list[FakeListener] = []
+    attempts = 0
+
+    async def connect(dsn: str) -> FakeListener:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 2:  # noqa: PLR2004
+            raise OSError("conexão recusada")
+        listeners.append(FakeListener())
+        return listeners[-1]
+
+    async def reload(self: ReferenceCatalog) -> None:
+        self._dirty.clear()  # noqa: SLF001
+        self._snapshot = build_snapshot()  # noqa: SLF001
+        self._stale = self._dirty.is_set()  # noqa: SLF001
+
+    real_sleep = asyncio.sleep
+    delays: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(catalog_module.asyncpg, "connect", connect)
+    monkeypatch.setattr(catalog_module.asyncio, "sleep", sleep)
+    monkeypatch.setattr(ReferenceCatalog, "_reload", reload)
+
+    catalog = ReferenceCatalog()
+    await catalog.start()
+    try:
+        assert catalog.snapshot is not None
+        assert listeners[0].on_terminate is not None
+
+        listeners[0].on_terminate(listeners[0])
+        assert catalog.snapshot is None
+
+        for _ in range(100):
+            if catalog.snapshot is not None:
+                break
+            await real_sleep(0)
+
+        assert catalog.snapshot is not None
+        assert delays == [1.0]
+        assert len(listeners) == 2  # noqa: PLR2004
+        assert listeners[1].channels == [CATALOG_CHANNEL, PRINCIPAL_CHANNEL]
+    finally:
+        await catalog.stop()
+    assert listeners[1].closed
+
+
+async def test_catalog_notification_invalidates_query_cache() -> None:
+    backend = MemoryCacheBackend(max_entries=10)
+    query_cache.configure(backend)
+    query_cache.set_listening(True)
+    try:
+        _, versions = await backend.get("k", ["type_alerts"])
+        await backend.set("k", b"[]", ["type_alerts"], versions, ttl=60)
+
+        ReferenceCatalog()._on_notify(None, 0, CATALOG_CHANNEL, "alert_stateful_rules")  # noqa: SLF001
+        assert (await backend.get("k", ["type_alerts"]))[0] is None
+    finally:
+        await query_cache.close()
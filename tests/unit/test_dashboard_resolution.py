@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from app.service.dashboard import DashboardService
+
+
+def test_pick_resolution_by_window() -> None:
+    service = DashboardService(None)  # type: ignore[arg-type]
+    day = 24 * 60 * 60
+
+    assert service._pick_resolution(None, None) == "raw"
+    assert service._pick_resolution(0, day) == "raw"
+    assert service._pick_resolution(0, 7 * day) == "hour"
+    assert service._pick_resolution(0, 365 * day) == "day"
+
+
+def test_pick_resolution_open_end_uses_now() -> None:
+    service = DashboardService(None)  # type: ignore[arg-type]
+    now = int(datetime.now(timezone.utc).timestamp())
+
+    assert service._pick_resolution(now - 60, None) == "raw"
+    assert service._pick_resolution(now - 400 * 24 * 60 * 60, None) == "day"
+
+
+def test_parse_history_range_includes_whole_end_day() -> None:
+    service = DashboardService(None)  # type: ignore[arg-type]
+
+    start, end = service._parse_history_range("2025-01-01", "2025-01-01")
+
+    assert start == 1735689600
+    assert end == 1735689600 + 24 * 60 * 60 - 1
@@ -0,0 +1,66 @@
+import json
+from decimal import Decimal
+from typing import Any, AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.export import csv_header, export_error, rows_to_csv, rows_to_ndjson
+from app.routers.controller.dashboard import DashboardExportController
+from app.schemas.dashboard import StationExportFilter
+from app.service.dashboard import DashboardService
+
+COLUMNS = ("measure_date", "title", "value")
+
+
+def test_rows_to_csv() -> None:
+    rows = [(1712553600, "Temperatura", 25.5), (1712553660, "Umidade", 60.0)]
+
+    output = csv_header(COLUMNS) + rows_to_csv(rows)  # type: ignore[arg-type]
+
+    assert output.splitlines() == [
+        "measure_date,title,value",
+        "1712553600,Temperatura,25.5",
+        "1712553660,Umidade,60.0",
+    ]
+
+
+def test_rows_to_ndjson() -> None:
+    rows = [(1712553600, "Pressão", Decimal("1013.2"))]
+
+    lines = rows_to_ndjson(rows, COLUMNS).splitlines()  # type: ignore[arg-type]
+
+    assert json.loads(lines[0]) == {
+        "measure_date": 1712553600,
+        "title": "Pressão",
+        "value": 1013.2,
+    }
+
+
+def test_export_error_marks_truncated_file() -> None:
+    assert export_error("csv", "Exportação interrompida") == "#error,Exportação interrompida\r\n"
+    assert json.loads(export_error("ndjson", "Exportação interrompida")) == {
+        "error": "Exportação interrompida"
+    }
+
+
+async def test_export_failure_after_header_ends_with_error_marker(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def failing_stream(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        yield [(1712553600, "Temperatura", 25.5, None, None, "°C", "temp")]
+        raise RuntimeError("conexão perdida")
+
+    monkeypatch.setattr(DashboardService, "stream_station_history", failing_stream)
+    controller = DashboardExportController(AsyncSession())
+
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in controller._stream(  # noqa: SLF001
+            1, StationExportFilter(format="csv")
+        ):
+            chunks.append(chunk)
+
+    assert chunks[0].startswith("measure_date,")
+    assert chunks[1].startswith("1712553600,Temperatura")
+    assert chunks[-1] == export_error("csv", "Exportação interrompida")
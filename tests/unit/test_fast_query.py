@@ -0,0 +1,28 @@
+from app.modules.fast_query import records_to_models, to_positional
+from app.schemas.dashboard import StationHistoryItem
+
+
+def test_to_positional_numbers_named_params_once() -> None:
+    sql, names = to_positional(
+        "SELECT '[]'::JSONB FROM t WHERE a = :a AND b BETWEEN :b AND :a LIMIT :limit"
+    )
+
+    assert sql == "SELECT '[]'::JSONB FROM t WHERE a = $1 AND b BETWEEN $2 AND $1 LIMIT $3"
+    assert names == ("a", "b", "limit")
+
+
+def test_records_to_models_validates_mappings() -> None:
+    rows = [
+        {
+            "title": "Temperatura",
+            "value": 25,
+            "measure_unit": "°C",
+            "measure_date": 1712553600,
+            "type": "climate",
+        }
+    ]
+
+    items = records_to_models(StationHistoryItem, rows)
+
+    assert items == [StationHistoryItem(**rows[0])]
+    assert isinstance(items[0].value, float)
@@ -0,0 +1,166 @@
+from itertools import count
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import pytest
+
+from app.config.settings import settings
+from app.service.alert_engine import ThresholdIndex
+from app.service.measure_ingest import MeasureIngestService, ReadingParser, _iter_lines
+
+INDEX = {("station-0001", 1): 10, ("station-0001", "Temperatura"): 10}
+
+
+def test_parser_resolves_by_type_id_or_name() -> None:
+    parser = ReadingParser(INDEX)
+
+    assert parser.parse(
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 100, "value": "2.5"}'
+    ) == (10, 100, 2.5)
+    assert parser.parse(
+        b'{"uid": "station-0001", "parameter_type": "Temperatura",'
+        b' "timestamp": "1970-01-01T00:01:40+00:00", "value": 3}'
+    ) == (10, 100, 3.0)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"not json",
+        b'{"uid": "station-0001", "parameter_type": 1, "value": 1}',
+        b'{"uid": "station-0002", "parameter_type": 1, "timestamp": 1, "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": "ontem", "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1, "value": "x"}',
+        b'{"uid": ["station-0001"], "parameter_type": 1, "timestamp": 1, "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": {"id": 1}, "timestamp": 1, "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": true, "timestamp": 1, "value": 1}',
+        b"[1, 2]",
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1e400, "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": NaN, "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1e20, "value": 1}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1, "value": "nan"}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1, "value": "inf"}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1, "value": Infinity}',
+        b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1, "value": 1e400}',
+    ],
+)
+def test_parser_rejects_invalid_readings(line: bytes) -> None:
+    with pytest.raises(ValueError):
+        ReadingParser(INDEX).parse(line)
+
+
+def test_parser_reads_naive_iso_timestamp_as_utc() -> None:
+    parser = ReadingParser(INDEX)
+
+    assert parser.parse(
+        b'{"uid": "station-0001", "parameter_type": 1,'
+        b' "timestamp": "1970-01-01T00:01:40", "value": 1}'
+    ) == (10, 100, 1.0)
+
+
+async def chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def test_iter_lines_joins_split_chunks() -> None:
+    lines = [
+        line async for line in _iter_lines(chunks(b'{"a"', b": 1}\n{", b'"b": 2}'), 1024)
+    ]
+
+    assert lines == [b'{"a": 1}', b'{"b": 2}']
+
+
+async def test_iter_lines_rejects_oversized_line_without_buffering() -> None:
+    body = chunks(b"12345", b"6789\nok\n", b"abcdefgh", b"ijk\n", b"0123456789")
+
+    lines = [line async for line in _iter_lines(body, 5)]
+
+    assert lines == [None, b"ok", None, None]
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.copied: dict[str, list[list[Any]]] = {"measures": [], "alerts": []}
+
+    async def fetch(self, sql: str, arg: Any) -> list[Any]:
+        assert "alert_stateful_rules" in sql
+        return []
+
+    async def copy_records_to_table(self, table: str, records: list[Any], **kwargs: Any) -> None:
+        self.copied[table].append(list(records))
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.driver = FakeDriver()
+        self.commits = 0
+        self._ids = count(1)
+
+    async def execute(self, statement: Any, params: dict[str, Any]) -> Any:
+        ids = [next(self._ids) for _ in range(params["count"])]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: ids))
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        pass
+
+    async def connection(self) -> Any:
+        async def get_raw_connection() -> Any:
+            return SimpleNamespace(driver_connection=self.driver)
+
+        return SimpleNamespace(get_raw_connection=get_raw_connection)
+
+
+async def test_ingest_writes_batches_and_reports_rejections(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "INGEST_BATCH_SIZE", 2)
+    session = FakeSession()
+    service = MeasureIngestService(session)  # type: ignore[arg-type]
+
+    async def load_index() -> dict[Any, int]:
+        return INDEX
+
+    async def load_thresholds() -> ThresholdIndex:
+        return ThresholdIndex([(7, 10, 1.5, ">")])
+
+    monkeypatch.setattr(service, "_load_parameter_index", load_index)
+    monkeypatch.setattr(service._alert_engine, "load_index", load_thresholds)  # noqa: SLF001
+    reading = b'{"uid": "station-0001", "parameter_type": 1, "timestamp": %d, "value": %d}\n'
+
+    report = await service.ingest(
+        chunks(reading % (1, 1), b"broken\n", reading % (2, 2), reading % (3, 3))
+    )
+
+    assert (report.accepted, report.rejected, report.alerts) == (3, 1, 2)
+    assert [len(batch) for batch in session.driver.copied["measures"]] == [1, 2]
+    assert [alert[:2] for alert in session.driver.copied["alerts"][0]] == [(7, 2), (7, 3)]
+    assert report.batches[0].errors[0].line == 2
+    assert session.commits == 2
+
+
+async def test_ingest_reports_oversized_line_as_rejected(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "INGEST_MAX_LINE_BYTES", 100)
+    session = FakeSession()
+    service = MeasureIngestService(session)  # type: ignore[arg-type]
+
+    async def load_index() -> dict[Any, int]:
+        return INDEX
+
+    async def load_thresholds() -> ThresholdIndex:
+        return ThresholdIndex([])
+
+    monkeypatch.setattr(service, "_load_parameter_index", load_index)
+    monkeypatch.setattr(service._alert_engine, "load_index", load_thresholds)  # noqa: SLF001
+    reading = b'{"uid": "station-0001", "parameter_type": 1, "timestamp": 1, "value": 1}\n'
+
+    report = await service.ingest(chunks(b'{"uid": "' + b"x" * 200, b'"}\n', reading))
+
+    assert (report.accepted, report.rejected) == (1, 1)
+    assert report.batches[0].errors[0].line == 1
+    assert "100 bytes" in report.batches[0].errors[0].error
@@ -0,0 +1,14 @@
+import pytest
+
+from app.modules.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor(1712553600, 42)
+    assert decode_cursor(cursor) == (1712553600, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "@@@", encode_cursor(1), encode_cursor(1, 2, 3)])
+def test_decode_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
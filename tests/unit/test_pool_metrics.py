@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.modules.pool_metrics import InstrumentedQueuePool, PoolMetrics
+
+
+def make_pool(pool_size: int = 2) -> tuple[InstrumentedQueuePool, PoolMetrics]:
+    pool = InstrumentedQueuePool(creator=MagicMock, pool_size=pool_size, max_overflow=0)
+    metrics = PoolMetrics()
+    pool.metrics = metrics
+    metrics.attach(pool)
+    return pool, metrics
+
+
+def test_pool_metrics_track_checkout_and_checkin() -> None:
+    pool, metrics = make_pool()
+
+    first = pool.connect()
+    second = pool.connect()
+    stats = metrics.snapshot(pool)
+    assert stats["checked_out"] == 2
+    assert stats["connects"] == 2
+    assert stats["wait_count"] == 2
+
+    first.close()
+    stats = metrics.snapshot(pool)
+    assert stats["checked_out"] == 1
+    assert stats["idle"] == 1
+    second.close()
+
+
+def test_pool_metrics_survive_recreate() -> None:
+    pool, metrics = make_pool()
+    recreated = pool.recreate()
+
+    recreated.connect().close()
+
+    assert recreated.metrics is metrics
+    assert metrics.checkouts == 1
+
+
+def test_record_wait_counts_timeouts() -> None:
+    metrics = PoolMetrics()
+    metrics.record_wait(0.002)
+    metrics.record_wait(0.010, timed_out=True)
+
+    stats = metrics.snapshot(MagicMock())
+    assert stats["timeouts"] == 1
+    assert stats["wait_max_ms"] == 10.0
+    assert stats["wait_avg_ms"] == 6.0
+
+
+async def test_checkout_timeout_and_connect_error_are_counted_apart() -> None:
+    pool = InstrumentedQueuePool(creator=MagicMock, pool_size=1, max_overflow=0, timeout=0.01)
+    metrics = PoolMetrics()
+    pool.metrics = metrics
+    held = pool.connect()
+
+    # A espera do pool assíncrono só bloqueia dentro do greenlet do SQLAlchemy.
+    with pytest.raises(PoolTimeoutError):
+        await greenlet_spawn(pool.connect)
+    held.close()
+
+    def refuse() -> None:
+        raise ConnectionRefusedError("conexão recusada")
+
+    broken = InstrumentedQueuePool(creator=refuse, pool_size=1, max_overflow=0)
+    broken.metrics = metrics
+    with pytest.raises(ConnectionRefusedError):
+        broken.connect()
+
+    stats = metrics.snapshot(MagicMock())
+    assert stats["timeouts"] == 1
+    assert stats["connect_errors"] == 1
@@ -0,0 +1,54 @@
+import time
+from datetime import datetime
+
+from app.dependency.auth import PrincipalCache
+from app.schemas.user import UserResponse
+
+
+def make_user(user_id: int) -> UserResponse:
+    return UserResponse(
+        id=user_id,
+        name="test_user",
+        password="hash",
+        email="test_user@example.com",
+        last_update=datetime.now(),
+    )
+
+
+def test_principal_cache_hit_and_invalidate() -> None:
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    cache.set(1, make_user(1), token_exp=time.time() + 60)
+
+    assert cache.get(1) is not None
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+
+def test_principal_cache_bounded_by_token_expiry() -> None:
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    cache.set(1, make_user(1), token_exp=time.time() - 1)
+
+    assert cache.get(1) is None
+
+
+def test_principal_cache_evicts_least_recently_used() -> None:
+    cache = PrincipalCache(max_entries=2, ttl=60)
+    cache.set(1, make_user(1), None)
+    cache.set(2, make_user(2), None)
+    cache.get(1)
+    cache.set(3, make_user(3), None)
+
+    assert cache.get(1) is not None
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+
+
+def test_principal_cache_invalidated_by_notification() -> None:
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    cache.set(1, make_user(1), None)
+    cache.set(2, make_user(2), None)
+
+    cache.on_notify(None, 0, "principal_cache", "1")
+
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.config.settings import settings
+from app.modules import query_budget as qb
+from app.modules.slow_queries import SlowQueryRecorder
+
+
+def make_app(queries: int) -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(qb.query_budget_middleware)
+
+    @app.get("/item")
+    @qb.query_budget(2)
+    async def get_item() -> dict[str, int]:
+        for number in range(queries):
+            qb.record_query(f"SELECT {number}", 0.001)
+        return {"queries": queries}
+
+    @app.get("/loop")
+    async def get_loop() -> dict[str, int]:
+        for _ in range(settings.QUERY_REPEAT_LIMIT + 1):
+            qb.record_query("SELECT * FROM parameters WHERE id = $1", 0.001)
+        return {}
+
+    return app
+
+
+def test_server_timing_reports_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "raise")
+
+    response = TestClient(make_app(2)).get("/item")
+
+    assert response.headers["Server-Timing"] == 'db;dur=2.0;desc="2 queries"'
+
+
+def test_budget_exceeded_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "raise")
+
+    with pytest.raises(qb.QueryBudgetExceeded, match="3 consultas"):
+        TestClient(make_app(3)).get("/item")
+
+
+def test_repeated_statement_is_flagged(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "log")
+
+    response = TestClient(make_app(0)).get("/loop")
+
+    assert response.status_code == 200
+    assert "N+1" in capsys.readouterr().out
+
+
+def test_instrumented_engine_records_statements() -> None:
+    engine = create_engine("sqlite://")
+    qb.instrument_engine(engine)
+    stats = qb.QueryStats()
+    token = qb._current_stats.set(stats)  # noqa: SLF001
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 1"))
+    finally:
+        qb._current_stats.reset(token)  # noqa: SLF001
+
+    assert stats.count == 2
+    assert stats.statements["SELECT 1"] == 2
+
+
+def test_instrumented_engine_passes_params_to_slow_queries(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorder = SlowQueryRecorder(threshold_ms=0, capacity=10, cooldown=60)
+    monkeypatch.setattr(qb, "slow_query_recorder", recorder)
+    engine = create_engine("sqlite://")
+    qb.instrument_engine(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT :station_id, :name"), {"station_id": 7, "name": "x"})
+
+    assert recorder.entries()[0]["params"] == ["7", "'x'"]
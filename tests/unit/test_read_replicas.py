@@ -0,0 +1,59 @@
+import time
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.dependency.database import PRIMARY_READS_COOKIE, Database, read_your_writes
+
+
+def make_replica(healthy: bool) -> MagicMock:
+    replica = MagicMock()
+    replica.healthy = healthy
+    return replica
+
+
+def test_read_session_round_robins_healthy_replicas() -> None:
+    database = Database()
+    replicas = [make_replica(True), make_replica(False), make_replica(True)]
+    database._replicas = replicas  # noqa: SLF001
+    try:
+        sessions = [database.read_session for _ in range(4)]
+    finally:
+        database._replicas = []  # noqa: SLF001
+
+    assert sessions.count(replicas[0].session_maker.return_value) == 2
+    assert sessions.count(replicas[2].session_maker.return_value) == 2
+    replicas[1].session_maker.assert_not_called()
+
+
+def test_read_session_falls_back_to_primary() -> None:
+    database = Database()
+    lagging = make_replica(False)
+    database._replicas = [lagging]  # noqa: SLF001
+    try:
+        session = database.read_session
+    finally:
+        database._replicas = []  # noqa: SLF001
+
+    lagging.session_maker.assert_not_called()
+    assert session.bind is database._engine  # noqa: SLF001
+
+
+def test_writes_pin_reads_to_primary() -> None:
+    app = FastAPI()
+    app.middleware("http")(read_your_writes)
+
+    @app.get("/item")
+    async def read_item(request: Request) -> Response:
+        return Response()
+
+    @app.post("/item")
+    async def write_item() -> Response:
+        return Response()
+
+    client = TestClient(app)
+    assert PRIMARY_READS_COOKIE not in client.get("/item").cookies
+
+    cookie = client.post("/item").cookies[PRIMARY_READS_COOKIE]
+    assert int(cookie) > time.time()
@@ -1,4 +1,10 @@
-from app.modules.security import PasswordManager
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.security import PasswordHashExecutor, PasswordManager, TokenManager
 
 
 def test_password_hash_and_verify() -> None:
@@ -12,3 +18,36 @@ def test_password_hash_fail() -> None:
     manager = PasswordManager()
     hashed = manager.password_hash("password")
     assert not manager.verify_password("wrong", hashed)
+
+
+async def test_password_verify_runs_on_executor() -> None:
+    manager = PasswordManager()
+    hashed = await manager.password_hash_async("secure")
+    assert await manager.verify_password_async("secure", hashed)
+    assert not await manager.verify_password_async("wrong", hashed)
+
+
+async def test_password_executor_rejects_when_full() -> None:
+    executor = PasswordHashExecutor(max_workers=1, max_pending=0)
+    release = threading.Event()
+    first = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.01)
+
+    assert executor.stats()["running"] == 1
+    with pytest.raises(HTTPException) as exc:
+        await executor.run(lambda: None)
+    assert exc.value.status_code == 503
+
+    release.set()
+    await first
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_refresh_token_hash_is_stable_and_opaque() -> None:
+    manager = TokenManager()
+    token = manager.create_refresh_token()
+
+    assert manager.hash_refresh_token(token) == manager.hash_refresh_token(token)
+    assert manager.hash_refresh_token(token) != token
+    assert manager.create_refresh_token() != token
@@ -0,0 +1,50 @@
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_serializer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependency.database import SessionReleasingRoute
+
+
+class TrackingSession(AsyncSession):
+    closes = 0
+
+    async def close(self) -> None:
+        self.closes += 1
+        await super().close()
+
+
+tracked: list[TrackingSession] = []
+
+
+async def tracking_session() -> AsyncGenerator[AsyncSession, None]:
+    session = TrackingSession()
+    tracked.append(session)
+    async with session:
+        yield session
+
+
+class Payload(BaseModel):
+    closes_before_serialization: int = 0
+
+    @field_serializer("closes_before_serialization")
+    def serialize_closes(self, value: int) -> int:  # noqa: PLR6301
+        return tracked[-1].closes
+
+
+def test_session_is_closed_before_response_serialization() -> None:
+    router = APIRouter(route_class=SessionReleasingRoute)
+
+    @router.get("/item")
+    async def get_item(session: AsyncSession = Depends(tracking_session)) -> Payload:
+        return Payload()
+
+    app = FastAPI()
+    app.include_router(router)
+
+    response = TestClient(app).get("/item")
+
+    assert response.status_code == 200
+    assert response.json()["closes_before_serialization"] == 1
@@ -0,0 +1,69 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from app.modules.slow_queries import SlowQueryRecorder
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.fetched: list[tuple[str, tuple[Any, ...]]] = []
+
+    @asynccontextmanager
+    async def transaction(self, readonly: bool) -> AsyncIterator[None]:
+        assert readonly
+        yield
+
+    async def execute(self, sql: str) -> None:
+        pass
+
+    async def fetch(self, sql: str, *args: Any) -> list[tuple[str]]:
+        self.fetched.append((sql, args))
+        return [("Seq Scan on measures",), ("Execution Time: 812.0 ms",)]
+
+
+def make_session_factory(driver: FakeDriver) -> Any:
+    class FakeConnection:
+        async def get_raw_connection(self) -> Any:  # noqa: PLR6301
+            return SimpleNamespace(driver_connection=driver)
+
+    class FakeSession:
+        async def __aenter__(self) -> "FakeSession":
+            return self
+
+        async def __aexit__(self, *args: Any) -> None:
+            pass
+
+        async def connection(self) -> FakeConnection:  # noqa: PLR6301
+            return FakeConnection()
+
+    return FakeSession
+
+
+def test_fast_queries_are_ignored_and_buffer_is_bounded() -> None:
+    recorder = SlowQueryRecorder(threshold_ms=100, capacity=2, cooldown=60)
+    recorder.observe("SELECT 1", (), 0.01)
+    for number in range(3):
+        recorder.observe(f"SELECT {number}", (), 0.2)
+
+    assert [entry["statement"] for entry in recorder.entries()] == ["SELECT 2", "SELECT 1"]
+
+
+async def test_slow_select_is_explained_once_per_cooldown() -> None:
+    driver = FakeDriver()
+    recorder = SlowQueryRecorder(threshold_ms=100, capacity=10, cooldown=60)
+    recorder.start(make_session_factory(driver))
+
+    recorder.observe("SELECT * FROM measures WHERE id = $1", (7,), 0.8)
+    recorder.observe("SELECT * FROM measures WHERE id = $1", (8,), 0.9)
+    recorder.observe("UPDATE alerts SET is_read = true", (), 0.9)
+    await asyncio.sleep(0)
+    await recorder.stop()
+
+    assert driver.fetched == [
+        ("EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM measures WHERE id = $1", (7,))
+    ]
+    explained = recorder.entries()[-1]
+    assert explained["params"] == ["7"]
+    assert "Seq Scan" in explained["plan"]
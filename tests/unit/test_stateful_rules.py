@@ -0,0 +1,129 @@
+from typing import Any
+
+import pytest
+
+from app.config.settings import settings
+from app.service.stateful_rules import (
+    RATE_REFERENCE_QUERY,
+    STATE_COLUMNS,
+    StatefulRule,
+    StatefulRuleEngine,
+)
+
+
+def rule_row(kind: str, value: int, math_signal: str = ">", **overrides: Any) -> dict[str, Any]:
+    row = {
+        "id": 1,
+        "parameter_id": 10,
+        "value": value,
+        "math_signal": math_signal,
+        "kind": kind,
+        "window_seconds": 60,
+        "version": 0,
+        **dict.fromkeys(STATE_COLUMNS),
+    }
+    row.update(overrides)
+    return row
+
+
+def test_rate_of_change_compares_with_reference_reading() -> None:
+    rule = StatefulRule(rule_row("rate_of_change", 5))
+
+    assert rule.observe(0, 10.0) is False  # sem leitura de uma janela atrás
+    assert rule.observe(60, 14.0, reference=10.0) is False
+    assert rule.observe(90, 17.0, reference=10.0) is True
+    assert rule.observe(80, 100.0, reference=10.0) is False  # leitura atrasada é ignorada
+    assert (rule.last_date, rule.last_value) == (90, 17.0)
+
+
+def test_sustained_fires_once_per_episode() -> None:
+    rule = StatefulRule(rule_row("sustained", 30))
+
+    assert [rule.observe(t, 31.0) for t in (0, 30, 60, 90)] == [False, False, True, False]
+    assert rule.observe(100, 20.0) is False
+    assert rule.since is None
+    assert [rule.observe(t, 35.0) for t in (110, 170)] == [False, True]
+
+
+def test_zscore_uses_welford_statistics(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ALERT_ZSCORE_MIN_SAMPLES", 4)
+    rule = StatefulRule(rule_row("zscore", 3))
+
+    assert [rule.observe(t, v) for t, v in enumerate([10.0, 12.0, 10.0, 12.0])] == [False] * 4
+    assert rule.mean == pytest.approx(11.0)
+    assert rule.m2 / (rule.sample_count - 1) == pytest.approx(4 / 3)
+    assert rule.observe(5, 11.5) is False
+    assert rule.observe(6, 30.0) is True
+
+
+class FakeDriver:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.measures: list[tuple[int, int, int, float]] = []
+        self.saved: list[list[tuple[Any, ...]]] = []
+
+    async def fetch(self, sql: str, parameter_ids: list[int], *args: Any) -> list[Any]:
+        if sql == RATE_REFERENCE_QUERY:
+            return [
+                {"parameter_id": parameter_id, "at": at, "value": older[-1][3]}
+                for parameter_id, at in zip(parameter_ids, args[0], strict=True)
+                if (
+                    older := sorted(
+                        (m for m in self.measures if m[1] == parameter_id and m[2] <= at),
+                        key=lambda m: (m[2], m[0]),
+                    )
+                )
+            ]
+        return [row for row in self.rows if row["parameter_id"] in parameter_ids]
+
+    async def executemany(self, sql: str, args: list[tuple[Any, ...]]) -> None:
+        self.saved.append(args)
+
+
+async def test_engine_evaluates_in_time_order_and_persists_state() -> None:
+    engine = StatefulRuleEngine()
+    engine.clear()
+    driver = FakeDriver([rule_row("sustained", 30)])
+
+    alerts = await engine.evaluate(
+        driver, [(3, 10, 60, 32.0), (1, 10, 0, 31.0), (2, 20, 30, 50.0)]
+    )
+
+    assert [(alert[0], alert[1]) for alert in alerts] == [(1, 3)]
+    assert driver.saved == [[(1, 60, 32.0, 0, True, 0, 0.0, 0.0)]]
+    assert engine._rules[1].version == 1  # noqa: SLF001
+
+
+async def test_engine_reloads_state_when_version_differs() -> None:
+    engine = StatefulRuleEngine()
+    engine.clear()
+    driver = FakeDriver([rule_row("sustained", 30)])
+    await engine.evaluate(driver, [(1, 10, 0, 31.0)])
+
+    # Outro worker avançou o estado: a condição deixou de valer.
+    driver.rows = [rule_row("sustained", 30, version=5, last_date=20, since=None)]
+    alerts = await engine.evaluate(driver, [(2, 10, 60, 32.0)])
+
+    assert alerts == []
+    assert engine._rules[1].since == 60  # noqa: SLF001
+    assert engine._rules[1].version == 6  # noqa: SLF001
+
+
+async def test_engine_rate_of_change_uses_reading_one_window_back() -> None:
+    engine = StatefulRuleEngine()
+    engine.clear()
+    driver = FakeDriver([rule_row("rate_of_change", 5)])
+    # Subida lenta e contínua: leituras consecutivas variam pouco, mas a
+    # variação ao longo da janela de 60 s passa do limite.
+    driver.measures = [
+        (1, 10, 0, 10.0),
+        (2, 10, 20, 12.0),
+        (3, 10, 40, 14.0),
+        (4, 10, 60, 15.5),
+        (5, 10, 80, 16.0),
+    ]
+
+    alerts = await engine.evaluate(driver, driver.measures)
+
+    # Só em t=60 a variação desde a leitura de t=0 (5.5) passa de 5.
+    assert [alert[1] for alert in alerts] == [4]
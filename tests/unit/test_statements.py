@@ -0,0 +1,23 @@
+import pytest
+
+from app.modules.statements import StatementRegistry
+
+
+def test_register_compiles_both_forms_once() -> None:
+    registry = StatementRegistry()
+    statement = registry.register(
+        "station.by_uid", "SELECT * FROM t WHERE (CAST(:uid AS TEXT) IS NULL OR uid = :uid)"
+    )
+
+    assert registry["station.by_uid"] is statement
+    assert statement.positional == "SELECT * FROM t WHERE (CAST($1 AS TEXT) IS NULL OR uid = $1)"
+    assert statement.params == ("uid",)
+    assert str(statement.clause) == statement.sql
+
+
+def test_register_rejects_duplicate_names() -> None:
+    registry = StatementRegistry()
+    registry.register("alert.list", "SELECT 1")
+
+    with pytest.raises(ValueError):
+        registry.register("alert.list", "SELECT 2")